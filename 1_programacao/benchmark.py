@@ -0,0 +1,587 @@
+"""
+Benchmarks das funções de 1_programacao.
+
+Uso:
+    python benchmark.py executar --saida resultados.json [--casos cifra mover_tropas_grade] [--perfil perfis/]
+    python benchmark.py comparar antes.json depois.json
+    python benchmark.py especificos
+
+Métricas de cada caso (veja `medir_caso`): melhor tempo, pico de memória e blocos retidos,
+os dois últimos medidos com `tracemalloc`. O número total de alocações não é medido: o
+`tracemalloc` só enxerga os blocos ainda vivos, e não os que foram liberados durante a chamada.
+"""
+import argparse
+import cProfile
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, os benchmarks colunares e da matriz de distâncias são pulados
+    np = None
+
+from desafio import EstadoTabuleiro, MapaTerritorios, calcular_distancia, mover_tropas
+from distancias import MatrizDistancias
+from lote import EstatisticasLote, mover_tropas_em_lote
+from planejador import PlanejadorTropas
+from q1a import cifra
+from q1b import corrige_emails
+from q2a import organiza_listas, organiza_listas_colunar
+from q2b import conta_correcoes
+
+
+# Função para gerar um mapa em grade com tropas aleatórias
+def gerar_mapa_grade(lado, cores=("azul", "vermelho"), proporcao_jogador=0.9, semente=0):
+    """
+    Gera um mapa em grade (lado x lado), em que cada território é vizinho dos adjacentes.
+
+    :param lado: Número de territórios em cada lado da grade.
+    :param cores: Cores dos jogadores; o primeiro é o jogador avaliado.
+    :param proporcao_jogador: Fração dos territórios que pertence ao primeiro jogador.
+    :param semente: Semente do gerador aleatório, para resultados reproduzíveis.
+    :return: Tupla (vizinhos, tropas) no formato de `mover_tropas`.
+    """
+    aleatorio = random.Random(semente)
+    nome = lambda linha, coluna: f"T{linha:04d}_{coluna:04d}"
+
+    vizinhos = []
+    for linha in range(lado):
+        for coluna in range(lado):
+            if linha + 1 < lado:
+                vizinhos.append([nome(linha, coluna), nome(linha + 1, coluna)])
+            if coluna + 1 < lado:
+                vizinhos.append([nome(linha, coluna), nome(linha, coluna + 1)])
+
+    tropas = []
+    for linha in range(lado):
+        for coluna in range(lado):
+            dono = cores[0] if aleatorio.random() < proporcao_jogador else aleatorio.choice(cores[1:])
+            tropas.append((nome(linha, coluna), aleatorio.randint(1, 6), dono))
+
+    return vizinhos, tropas
+
+
+# Função para gerar um mapa planar aleatório com tropas aleatórias
+def gerar_mapa_planar(qtd_territorios, cores=("azul", "vermelho", "verde"), semente=0):
+    """
+    Gera um mapa planar aleatório: uma grade triangulada da qual algumas arestas são removidas.
+
+    Cada célula da grade ganha uma das duas diagonais (sorteada), o que mantém o grafo
+    planar, e cerca de 20% das arestas são descartadas para variar os graus.
+
+    :param qtd_territorios: Número aproximado de territórios (arredondado para um quadrado).
+    :param cores: Cores dos jogadores.
+    :param semente: Semente do gerador aleatório.
+    :return: Tupla (vizinhos, tropas) no formato de `mover_tropas`.
+    """
+    aleatorio = random.Random(semente)
+    lado = max(2, int(qtd_territorios ** 0.5))
+    nome = lambda linha, coluna: f"P{linha:04d}_{coluna:04d}"
+
+    arestas = []
+    for linha in range(lado):
+        for coluna in range(lado):
+            if linha + 1 < lado:
+                arestas.append([nome(linha, coluna), nome(linha + 1, coluna)])
+            if coluna + 1 < lado:
+                arestas.append([nome(linha, coluna), nome(linha, coluna + 1)])
+            if linha + 1 < lado and coluna + 1 < lado:
+                if aleatorio.random() < 0.5:
+                    arestas.append([nome(linha, coluna), nome(linha + 1, coluna + 1)])
+                else:
+                    arestas.append([nome(linha, coluna + 1), nome(linha + 1, coluna)])
+    vizinhos = [aresta for aresta in arestas if aleatorio.random() >= 0.2]
+
+    tropas = [(nome(linha, coluna), aleatorio.randint(1, 6), aleatorio.choice(cores))
+              for linha in range(lado) for coluna in range(lado)]
+    return vizinhos, tropas
+
+
+# Função para gerar uma tabela de transições aleatória com um episódio
+def gerar_transicoes(qtd_estados, tamanho_episodio=200, densidade=0.3, semente=0):
+    """
+    Gera uma tabela de transições aleatória e um episódio com lacunas.
+
+    :param qtd_estados: Número de estados.
+    :param tamanho_episodio: Número de estados do episódio.
+    :param densidade: Probabilidade de cada transição ser permitida.
+    :param semente: Semente do gerador aleatório.
+    :return: Tupla (transicoes, episodio) no formato de `conta_correcoes`.
+    """
+    aleatorio = random.Random(semente)
+    transicoes = {(de_estado, para_estado): 1
+                  for de_estado in range(1, qtd_estados + 1)
+                  for para_estado in range(1, qtd_estados + 1)
+                  if aleatorio.random() < densidade}
+    episodio = [aleatorio.randint(1, qtd_estados) for _ in range(tamanho_episodio)]
+    return transicoes, episodio
+
+
+# Função para gerar um registro de episódios em ordem cronológica
+def gerar_episodios(qtd_episodios, qtd_projetos=100, semente=0):
+    """
+    Gera episódios [id_projeto, indice, passos] em ordem cronológica dentro de cada projeto.
+
+    :param qtd_episodios: Número de episódios.
+    :param qtd_projetos: Número de projetos.
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de episódios no formato de `organiza_listas`.
+    """
+    aleatorio = random.Random(semente)
+    return [[aleatorio.randint(1, qtd_projetos), indice, aleatorio.randint(1, 100)]
+            for indice in range(qtd_episodios)]
+
+
+# Função para gerar um texto aleatório com letras, pontuação e acentos
+def gerar_texto(qtd_caracteres, semente=0):
+    """
+    Gera um texto aleatório, majoritariamente ASCII, com alguns caracteres acentuados.
+
+    :param qtd_caracteres: Tamanho do texto.
+    :param semente: Semente do gerador aleatório.
+    :return: Texto gerado.
+    """
+    aleatorio = random.Random(semente)
+    alfabeto = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ      .,;!?0123456789\nçãéí"
+    return "".join(aleatorio.choices(alfabeto, k=qtd_caracteres))
+
+
+# Função para gerar e-mails embaralhados
+def gerar_emails(qtd_emails, proporcao_invalidos=0.1, semente=0):
+    """
+    Gera e-mails embaralhados como em `q1b`: cada metade do e-mail correto é invertida.
+
+    :param qtd_emails: Número de e-mails.
+    :param proporcao_invalidos: Fração de e-mails com domínio diferente de "@usp.br".
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de e-mails embaralhados.
+    """
+    aleatorio = random.Random(semente)
+    emails = []
+    for _ in range(qtd_emails):
+        usuario = "".join(aleatorio.choices("abcdefghijklmnopqrstuvwxyz._0123456789", k=aleatorio.randint(3, 20)))
+        dominio = "@gmail.com" if aleatorio.random() < proporcao_invalidos else "@usp.br"
+        email = usuario + dominio
+        metade = len(email) // 2
+        emails.append(email[:metade][::-1] + email[metade:][::-1])
+    return emails
+
+
+# Função para medir o custo por turno do planejador incremental contra o recálculo completo
+def medir_planejador_incremental(lados=(50, 100, 200), alteracoes_por_turno=(1, 10, 100), turnos=20, semente=0):
+    """
+    Compara o custo por turno de `PlanejadorTropas.aplicar_alteracoes` com o de `mover_tropas`.
+
+    Em cada turno, `alteracoes_por_turno` territórios aleatórios mudam de dono e de tropas.
+    O planejador deve ficar aproximadamente constante quando só o mapa cresce, e crescer
+    com o número de alterações; `mover_tropas` cresce com o tamanho do mapa.
+
+    :param lados: Lados das grades avaliadas (o mapa tem lado² territórios).
+    :param alteracoes_por_turno: Quantidades de alterações por turno avaliadas.
+    :param turnos: Número de turnos medidos em cada combinação.
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de dicionários com os tempos médios por turno, em milissegundos.
+    """
+    resultados = []
+    cores = ("azul", "vermelho")
+
+    for lado in lados:
+        vizinhos, tropas = gerar_mapa_grade(lado, cores, semente=semente)
+        mapa = MapaTerritorios(vizinhos)
+
+        for qtd_alteracoes in alteracoes_por_turno:
+            aleatorio = random.Random(semente)
+            planejador = PlanejadorTropas(cores[0], mapa, tropas)
+            atual = {territorio: (territorio, qtd, dono) for territorio, qtd, dono in tropas}
+
+            tempo_incremental = 0.0
+            tempo_completo = 0.0
+            for _ in range(turnos):
+                alteracoes = [(territorio, aleatorio.randint(1, 6), aleatorio.choice(cores))
+                              for territorio in aleatorio.sample(mapa.nomes, qtd_alteracoes)]
+                for alteracao in alteracoes:
+                    atual[alteracao[0]] = alteracao
+
+                inicio = time.perf_counter()
+                planejador.aplicar_alteracoes(alteracoes)
+                tempo_incremental += time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                mover_tropas(cores[0], vizinhos, list(atual.values()))
+                tempo_completo += time.perf_counter() - inicio
+
+            resultados.append({
+                "territorios": lado * lado,
+                "alteracoes_por_turno": qtd_alteracoes,
+                "incremental_ms": 1000 * tempo_incremental / turnos,
+                "completo_ms": 1000 * tempo_completo / turnos,
+            })
+
+    return resultados
+
+
+# Função para medir a vazão da avaliação em lote
+def medir_lote(lado=40, posicoes=2000, workers=(1, 2, 4), tamanho_bloco=64, semente=0):
+    """
+    Mede a vazão de `mover_tropas_em_lote` em posições aleatórias sobre um mesmo mapa.
+
+    Os jobs levam o mesmo `MapaTerritorios`, então a chave da topologia é calculada uma
+    única vez e o processo principal não refaz o hash da lista de vizinhos a cada job.
+
+    :param lado: Lado da grade usada como mapa compartilhado.
+    :param posicoes: Número de posições (jobs) avaliadas.
+    :param workers: Quantidades de processos avaliadas.
+    :param tamanho_bloco: Número de jobs por bloco enviado ao pool.
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de dicionários com a vazão de cada configuração, em posições por segundo.
+    """
+    aleatorio = random.Random(semente)
+    cores = ("azul", "vermelho", "verde")
+    vizinhos, tropas = gerar_mapa_grade(lado, cores, proporcao_jogador=0.5, semente=semente)
+    mapa = MapaTerritorios(vizinhos)
+
+    jobs = []
+    for _ in range(posicoes):
+        tabuleiro = [(territorio, aleatorio.randint(1, 6), aleatorio.choice(cores)) for territorio, _, _ in tropas]
+        jobs.append((aleatorio.choice(cores), mapa, tabuleiro))
+
+    resultados = []
+    for qtd_workers in workers:
+        estatisticas = EstatisticasLote()
+        for _ in mover_tropas_em_lote(jobs, workers=qtd_workers, tamanho_bloco=tamanho_bloco,
+                                      estatisticas=estatisticas):
+            pass
+        resultados.append({"workers": qtd_workers, "posicoes_por_segundo": estatisticas.posicoes_por_segundo})
+
+    return resultados
+
+
+# Função para medir a matriz de distâncias pré-calculada contra a BFS
+def medir_matriz_distancias(lados=(20, 40, 70), consultas=1000, diretorio=None, semente=0):
+    """
+    Mede o cálculo, a abertura em disco e as consultas da `MatrizDistancias` em grades.
+
+    :param lados: Lados das grades avaliadas.
+    :param consultas: Número de pares (origem, destino) consultados em cada grade.
+    :param diretorio: Diretório do cache (None usa um diretório temporário novo).
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de dicionários com os tempos de cada grade, em segundos.
+    """
+    aleatorio = random.Random(semente)
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = diretorio or temporario
+        for lado in lados:
+            vizinhos, tropas = gerar_mapa_grade(lado, semente=semente)
+            nomes = [territorio for territorio, _, _ in tropas]
+            pares = [(aleatorio.choice(nomes), aleatorio.choice(nomes)) for _ in range(consultas)]
+
+            inicio = time.perf_counter()
+            MatrizDistancias.carregar(vizinhos, diretorio)  # Primeira vez: calcula e grava
+            calculo = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            matriz = MatrizDistancias.carregar(vizinhos, diretorio)  # Segunda vez: só abre o arquivo
+            abertura = time.perf_counter() - inicio
+
+            grafo = matriz.mapa.grafo
+            inicio = time.perf_counter()
+            for origem, destino in pares:
+                calcular_distancia(grafo, origem, destino)
+            bfs = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            for origem, destino in pares:
+                calcular_distancia(matriz.mapa, origem, destino)
+            consulta = time.perf_counter() - inicio
+
+            estado = EstadoTabuleiro(matriz.mapa, tropas)
+            inicio = time.perf_counter()
+            estado.distancias_para_inimigos("azul")
+            inimigos = time.perf_counter() - inicio
+
+            resultados.append({"territorios": lado * lado, "calculo_s": calculo, "abertura_s": abertura,
+                               "bfs_s": bfs, "consulta_s": consulta, "inimigos_s": inimigos})
+
+    return resultados
+
+
+# Função para gerar episódios cronologicamente válidos em formato colunar
+def gerar_episodios_colunares(qtd_episodios, qtd_projetos=1000, semente=0):
+    """
+    Gera episódios aleatórios já em ordem cronológica dentro de cada projeto.
+
+    :param qtd_episodios: Número de episódios.
+    :param qtd_projetos: Número de projetos.
+    :param semente: Semente do gerador aleatório.
+    :return: Array int64 de forma (qtd_episodios, 3) com colunas (id_projeto, indice, passos).
+    """
+    gerador = np.random.default_rng(semente)
+    id_projeto = gerador.integers(1, qtd_projetos + 1, size=qtd_episodios)
+    indice = np.arange(qtd_episodios)  # Crescente no total, logo crescente dentro de cada projeto
+    passos = gerador.integers(1, 100, size=qtd_episodios)
+    return np.column_stack((id_projeto, indice, passos))
+
+
+# Função para comparar o organiza_listas em Python puro com o backend colunar
+def medir_organiza_listas(tamanhos=(10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7), qtd_projetos=1000, semente=0):
+    """
+    Compara `organiza_listas` com listas de episódios e com o mesmo dado em formato colunar.
+
+    O tempo da versão em Python não inclui a conversão do array para listas.
+
+    :param tamanhos: Quantidades de episódios avaliadas.
+    :param qtd_projetos: Número de projetos.
+    :param semente: Semente do gerador aleatório.
+    :return: Lista de dicionários com os tempos, em segundos.
+    """
+    resultados = []
+    for qtd_episodios in tamanhos:
+        episodios = gerar_episodios_colunares(qtd_episodios, qtd_projetos, semente)
+        min_passos = 50 * qtd_episodios // qtd_projetos  # Em média, metade dos projetos é válida
+
+        inicio = time.perf_counter()
+        organiza_listas_colunar(qtd_projetos, episodios, min_passos)
+        tempo_colunar = time.perf_counter() - inicio
+
+        listas = episodios.tolist()
+        inicio = time.perf_counter()
+        organiza_listas(qtd_projetos, listas, min_passos)
+        tempo_python = time.perf_counter() - inicio
+        del listas
+
+        resultados.append({"episodios": qtd_episodios, "python_s": tempo_python, "colunar_s": tempo_colunar})
+
+    return resultados
+
+
+# Casos do harness: nome -> (função que monta os argumentos a partir de (tamanho, semente), função medida, tamanhos)
+CASOS = {
+    "cifra": (
+        lambda tamanho, semente: (gerar_texto(tamanho, semente), 3),
+        cifra,
+        (10 ** 4, 10 ** 5, 10 ** 6),
+    ),
+    "corrige_emails": (
+        lambda tamanho, semente: (gerar_emails(tamanho, semente=semente),),
+        corrige_emails,
+        (10 ** 3, 10 ** 4, 10 ** 5),
+    ),
+    "organiza_listas": (
+        lambda tamanho, semente: (100, gerar_episodios(tamanho, 100, semente), 50 * tamanho // 100),
+        organiza_listas,
+        (10 ** 3, 10 ** 4, 10 ** 5),
+    ),
+    "conta_correcoes": (
+        lambda tamanho, semente: (tamanho, *gerar_transicoes(tamanho, semente=semente), 6),
+        conta_correcoes,
+        (10, 50, 200),
+    ),
+    "mover_tropas_grade": (
+        lambda tamanho, semente: ("azul", *gerar_mapa_grade(int(tamanho ** 0.5), semente=semente)),
+        mover_tropas,
+        (10 ** 2, 10 ** 3, 10 ** 4),
+    ),
+    "mover_tropas_planar": (
+        lambda tamanho, semente: ("azul", *gerar_mapa_planar(tamanho, semente=semente)),
+        mover_tropas,
+        (10 ** 2, 10 ** 3, 10 ** 4),
+    ),
+}
+
+
+# Função para medir uma única chamada: tempo, pico de memória e blocos retidos
+def medir_caso(funcao, argumentos, repeticoes=3, arquivo_perfil=None):
+    """
+    Mede uma função com os argumentos dados.
+
+    O tempo é o melhor de `repeticoes` execuções sem rastreamento de memória. Em seguida,
+    uma execução extra com `tracemalloc` mede o pico de memória e o número de blocos de
+    memória que a chamada deixa vivos no final (incluindo o resultado). O total de
+    alocações não é medido: blocos alocados e liberados durante a chamada não entram
+    nessa contagem.
+
+    :param funcao: Função medida.
+    :param argumentos: Tupla de argumentos posicionais.
+    :param repeticoes: Número de execuções cronometradas.
+    :param arquivo_perfil: Se informado, grava nele o perfil do cProfile de uma execução.
+    :return: Dicionário com "segundos", "pico_memoria_bytes" e "blocos_retidos".
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        resultado = funcao(*argumentos)
+        _, pico = tracemalloc.get_traced_memory()
+        depois = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retidos = sum(max(diferenca.count_diff, 0) for diferenca in depois.compare_to(antes, "lineno"))
+    del resultado
+
+    if arquivo_perfil is not None:
+        perfil = cProfile.Profile()
+        perfil.runcall(funcao, *argumentos)
+        perfil.dump_stats(arquivo_perfil)
+
+    return {"segundos": min(tempos), "pico_memoria_bytes": pico - base, "blocos_retidos": retidos}
+
+
+# Função que executa os casos do harness para todos os tamanhos
+def executar_benchmarks(casos=None, semente=0, repeticoes=3, diretorio_perfil=None, tamanhos=None):
+    """
+    Executa os casos de `CASOS` para cada tamanho, com entradas sintéticas reproduzíveis.
+
+    :param casos: Nomes dos casos a executar (None executa todos).
+    :param semente: Semente dos geradores de entrada.
+    :param repeticoes: Número de execuções cronometradas por medição.
+    :param diretorio_perfil: Se informado, grava um arquivo .prof do cProfile por caso e tamanho.
+    :param tamanhos: Tamanhos usados no lugar dos padrões de cada caso.
+    :return: Dicionário pronto para JSON, com metadados e a lista de resultados.
+    """
+    if diretorio_perfil is not None:
+        os.makedirs(diretorio_perfil, exist_ok=True)
+
+    resultados = []
+    for nome in casos or CASOS:
+        gerador, funcao, tamanhos_padrao = CASOS[nome]
+        for tamanho in tamanhos or tamanhos_padrao:
+            argumentos = gerador(tamanho, semente)
+            arquivo_perfil = None
+            if diretorio_perfil is not None:
+                arquivo_perfil = os.path.join(diretorio_perfil, f"{nome}_{tamanho}.prof")
+
+            medicao = medir_caso(funcao, argumentos, repeticoes, arquivo_perfil)
+            resultados.append({"caso": nome, "tamanho": tamanho, **medicao})
+            print(f"{nome:>22} {tamanho:>9} {medicao['segundos']:>10.4f} s "
+                  f"{medicao['pico_memoria_bytes'] / 1e6:>9.2f} MB {medicao['blocos_retidos']:>9} retidos",
+                  file=sys.stderr)
+
+    return {
+        "metadados": {
+            "data": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "semente": semente,
+            "repeticoes": repeticoes,
+        },
+        "resultados": resultados,
+    }
+
+
+# Função para comparar dois arquivos de resultados
+def comparar_resultados(antes, depois):
+    """
+    Compara dois resultados de `executar_benchmarks` caso a caso.
+
+    :param antes: Dicionário (ou caminho do JSON) da execução de referência.
+    :param depois: Dicionário (ou caminho do JSON) da execução nova.
+    :return: Lista de dicionários com as métricas das duas execuções e a razão depois/antes.
+    """
+    if isinstance(antes, (str, os.PathLike)):
+        with open(antes, encoding="utf-8") as arquivo:
+            antes = json.load(arquivo)
+    if isinstance(depois, (str, os.PathLike)):
+        with open(depois, encoding="utf-8") as arquivo:
+            depois = json.load(arquivo)
+
+    referencia = {(r["caso"], r["tamanho"]): r for r in antes["resultados"]}
+    comparacao = []
+    for resultado in depois["resultados"]:
+        anterior = referencia.get((resultado["caso"], resultado["tamanho"]))
+        if anterior is None:
+            continue  # Caso ou tamanho que não existia na execução de referência
+        linha = {"caso": resultado["caso"], "tamanho": resultado["tamanho"]}
+        for metrica in ("segundos", "pico_memoria_bytes", "blocos_retidos"):
+            linha[f"{metrica}_antes"] = anterior[metrica]
+            linha[f"{metrica}_depois"] = resultado[metrica]
+            linha[f"{metrica}_razao"] = resultado[metrica] / anterior[metrica] if anterior[metrica] else None
+        comparacao.append(linha)
+    return comparacao
+
+
+def _executar_especificos():
+    """Executa os benchmarks específicos do planejador, do lote, do organiza_listas colunar e da matriz de distâncias."""
+    print(f"{'territórios':>12} {'alterações':>11} {'incremental (ms)':>17} {'completo (ms)':>14}")
+    for resultado in medir_planejador_incremental():
+        print(f"{resultado['territorios']:>12} {resultado['alteracoes_por_turno']:>11} "
+              f"{resultado['incremental_ms']:>17.3f} {resultado['completo_ms']:>14.3f}")
+
+    print()
+    print(f"{'workers':>8} {'posições/s':>11}")
+    for resultado in medir_lote():
+        print(f"{resultado['workers']:>8} {resultado['posicoes_por_segundo']:>11.1f}")
+
+    if np is None:
+        print()
+        print("NumPy não instalado: organiza_listas colunar e matriz de distâncias não foram medidos.")
+        return
+
+    print()
+    print(f"{'episódios':>10} {'python (s)':>11} {'colunar (s)':>12}")
+    for resultado in medir_organiza_listas():
+        print(f"{resultado['episodios']:>10} {resultado['python_s']:>11.3f} {resultado['colunar_s']:>12.3f}")
+
+    print()
+    print(f"{'territórios':>12} {'cálculo (s)':>12} {'abertura (s)':>13} {'BFS (s)':>9} {'matriz (s)':>11}")
+    for resultado in medir_matriz_distancias():
+        print(f"{resultado['territorios']:>12} {resultado['calculo_s']:>12.3f} {resultado['abertura_s']:>13.4f} "
+              f"{resultado['bfs_s']:>9.3f} {resultado['consulta_s']:>11.4f}")
+
+
+def main(argumentos=None):
+    """Ponto de entrada de linha de comando (veja o uso no topo do módulo)."""
+    parser = argparse.ArgumentParser(description="Benchmarks das funções de 1_programacao.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    executar = subcomandos.add_parser("executar", help="Executa os casos e grava em JSON o tempo, o pico de memória e os blocos retidos")
+    executar.add_argument("--saida", default="-", help="Arquivo JSON de saída ('-' para stdout)")
+    executar.add_argument("--casos", nargs="+", choices=sorted(CASOS), help="Casos a executar (padrão: todos)")
+    executar.add_argument("--tamanhos", nargs="+", type=int, help="Tamanhos no lugar dos padrões de cada caso")
+    executar.add_argument("--semente", type=int, default=0, help="Semente dos geradores de entrada")
+    executar.add_argument("--repeticoes", type=int, default=3, help="Execuções cronometradas por medição")
+    executar.add_argument("--perfil", help="Diretório para gravar um .prof do cProfile por caso")
+
+    comparar = subcomandos.add_parser("comparar", help="Compara dois arquivos de resultados")
+    comparar.add_argument("antes", help="JSON da execução de referência")
+    comparar.add_argument("depois", help="JSON da execução nova")
+
+    subcomandos.add_parser("especificos", help="Planejador incremental, lote, organiza_listas colunar e matriz de distâncias")
+
+    args = parser.parse_args(argumentos)
+
+    if args.comando == "executar":
+        resultados = executar_benchmarks(args.casos, args.semente, args.repeticoes, args.perfil, args.tamanhos)
+        texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+        if args.saida == "-":
+            print(texto)
+        else:
+            with open(args.saida, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto + "\n")
+    elif args.comando == "comparar":
+        print(f"{'caso':>22} {'tamanho':>9} {'tempo':>8} {'memória':>8} {'retidos':>8}")
+        for linha in comparar_resultados(args.antes, args.depois):
+            razoes = [linha[f"{metrica}_razao"] for metrica in ("segundos", "pico_memoria_bytes", "blocos_retidos")]
+            print(f"{linha['caso']:>22} {linha['tamanho']:>9} "
+                  + " ".join(f"{razao:>7.2f}x" if razao is not None else f"{'-':>8}" for razao in razoes))
+    else:
+        _executar_especificos()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
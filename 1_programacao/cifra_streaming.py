@@ -0,0 +1,245 @@
+import argparse
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from q1a import tabela_bytes
+
+TAMANHO_BLOCO_PADRAO = 1 << 22  # 4 MB por bloco
+
+
+class EstatisticasCifra:
+    """
+    Métricas de uma execução de `cifrar_arquivo`.
+    """
+
+    def __init__(self):
+        self.bytes = 0  # Bytes processados
+        self.segundos = 0.0  # Tempo total
+
+    @property
+    def mb_por_segundo(self):
+        """Vazão, em megabytes (10^6 bytes) por segundo."""
+        return self.bytes / 1e6 / self.segundos if self.segundos > 0 else 0.0
+
+    def __repr__(self):
+        return f"EstatisticasCifra(bytes={self.bytes}, segundos={self.segundos:.3f}, mb_por_segundo={self.mb_por_segundo:.1f})"
+
+
+def cifrar_fluxo(entrada, saida, deslocamento, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Aplica a cifra de `q1a.cifra` a um fluxo binário, bloco a bloco.
+
+    A cifra troca cada byte de forma independente, então os blocos podem cortar
+    caracteres UTF-8 ao meio sem alterar o resultado. A memória usada é de um bloco.
+
+    Parâmetros:
+    entrada (file): Arquivo binário aberto para leitura (ex.: sys.stdin.buffer).
+    saida (file): Arquivo binário aberto para escrita (ex.: sys.stdout.buffer).
+    deslocamento (int): O número de posições que cada letra será deslocada.
+    tamanho_bloco (int): Tamanho de cada leitura, em bytes.
+
+    Retorna:
+    int: Número de bytes processados.
+    """
+    tabela = tabela_bytes(deslocamento)
+    total = 0
+    while True:
+        bloco = entrada.read(tamanho_bloco)
+        if not bloco:
+            break
+        saida.write(bloco.translate(tabela))
+        total += len(bloco)
+    return total
+
+
+def _cifrar_mmap(caminho_entrada, saida, deslocamento, tamanho_bloco):
+    """
+    Aplica a cifra lendo o arquivo de entrada por `mmap`, bloco a bloco.
+
+    Retorna:
+    int: Número de bytes processados.
+    """
+    tabela = tabela_bytes(deslocamento)
+    with open(caminho_entrada, "rb") as entrada:
+        tamanho = os.fstat(entrada.fileno()).st_size
+        if tamanho == 0:
+            return 0  # mmap não aceita arquivos vazios
+        with mmap.mmap(entrada.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for inicio in range(0, tamanho, tamanho_bloco):
+                saida.write(mapa[inicio:inicio + tamanho_bloco].translate(tabela))
+    return tamanho
+
+
+def _cifrar_trecho(caminho_entrada, caminho_saida, deslocamento, inicio, tamanho, usar_mmap=False):
+    """
+    Cifra um trecho do arquivo de entrada e o grava na mesma posição do arquivo de saída.
+
+    Executada em cada processo do pool: lê e grava diretamente nos arquivos, então
+    nenhum dado passa pelo processo principal. Com `usar_mmap`, o trecho é lido por `mmap`.
+
+    Retorna:
+    int: Número de bytes processados.
+    """
+    with open(caminho_entrada, "rb") as entrada, open(caminho_saida, "r+b") as saida:
+        if usar_mmap:
+            with mmap.mmap(entrada.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                bloco = mapa[inicio:inicio + tamanho]
+        else:
+            entrada.seek(inicio)
+            bloco = entrada.read(tamanho)
+        saida.seek(inicio)
+        saida.write(bloco.translate(tabela_bytes(deslocamento)))
+    return len(bloco)
+
+
+def _cifrar_paralelo(caminho_entrada, caminho_saida, deslocamento, tamanho_bloco, workers, usar_mmap=False):
+    """
+    Cifra um arquivo em paralelo, com cada processo tratando trechos independentes.
+
+    A cifra não altera o tamanho dos dados, então o trecho que começa no byte i da
+    entrada vai para o byte i da saída. O arquivo de saída é criado com o tamanho final
+    e cada processo grava o seu trecho diretamente nele.
+
+    Retorna:
+    int: Número de bytes processados.
+    """
+    tamanho = os.path.getsize(caminho_entrada)
+    with open(caminho_saida, "wb") as saida:
+        saida.truncate(tamanho)
+
+    inicios = range(0, tamanho, tamanho_bloco)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        processados = pool.map(_cifrar_trecho,
+                               [caminho_entrada] * len(inicios), [caminho_saida] * len(inicios),
+                               [deslocamento] * len(inicios), inicios, [tamanho_bloco] * len(inicios),
+                               [usar_mmap] * len(inicios))
+        return sum(processados)
+
+
+def _mesmo_arquivo(entrada, saida):
+    """
+    Verifica se a entrada e a saída são o mesmo arquivo (caminhos ou arquivos abertos).
+
+    Abrir a saída para escrita apagaria a entrada antes da leitura, então essa
+    combinação é recusada por `cifrar_arquivo`.
+
+    Retorna:
+    bool: True se os dois apontarem para o mesmo arquivo em disco.
+    """
+    estados = []
+    for arquivo in (entrada, saida):
+        try:
+            if isinstance(arquivo, (str, os.PathLike)):
+                estados.append(os.stat(arquivo))
+            else:
+                estados.append(os.fstat(arquivo.fileno()))
+        except (OSError, AttributeError, ValueError):
+            return False  # Arquivo ainda inexistente ou fluxo sem descritor
+    return os.path.samestat(*estados)
+
+
+def cifrar_arquivo(entrada, saida, deslocamento, tamanho_bloco=TAMANHO_BLOCO_PADRAO, usar_mmap=False, workers=0):
+    """
+    Cifra (ou decifra, com deslocamento negativo) um arquivo inteiro sem carregá-lo na memória.
+
+    O resultado é o mesmo de `q1a.cifra` aplicada ao conteúdo do arquivo como texto UTF-8.
+
+    Modos:
+    - padrão: lê e grava em blocos de `tamanho_bloco`.
+    - usar_mmap=True: lê a entrada por `mmap` (apenas arquivos em disco).
+    - workers > 1: divide o arquivo em trechos processados em paralelo por um pool de
+      processos (apenas caminho de arquivo para caminho de arquivo). Combina com
+      `usar_mmap`: cada processo lê o seu trecho por `mmap`.
+
+    A entrada e a saída não podem ser o mesmo arquivo, e os modos mmap e paralelo precisam
+    de caminhos de arquivo: essas combinações geram ValueError antes de qualquer escrita.
+
+    Parâmetros:
+    entrada (str ou file): Caminho do arquivo de entrada ou arquivo binário aberto.
+    saida (str ou file): Caminho do arquivo de saída ou arquivo binário aberto.
+    deslocamento (int): O número de posições que cada letra será deslocada.
+    tamanho_bloco (int): Tamanho de cada bloco, em bytes.
+    usar_mmap (bool): Se True, lê a entrada por `mmap`.
+    workers (int): Número de processos; 0 ou 1 processa no próprio processo.
+
+    Retorna:
+    EstatisticasCifra: Bytes processados, tempo e vazão em MB/s.
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco deve ser pelo menos 1")
+    if _mesmo_arquivo(entrada, saida):
+        raise ValueError("A entrada e a saída não podem ser o mesmo arquivo")
+
+    entrada_eh_caminho = isinstance(entrada, (str, os.PathLike))
+    saida_eh_caminho = isinstance(saida, (str, os.PathLike))
+
+    # Combinações inválidas são recusadas antes de abrir (e esvaziar) o arquivo de saída
+    if workers > 1 and not (entrada_eh_caminho and saida_eh_caminho):
+        raise ValueError("O modo paralelo precisa de caminhos de arquivo na entrada e na saída")
+    if usar_mmap and not entrada_eh_caminho:
+        raise ValueError("O modo mmap precisa do caminho do arquivo de entrada")
+
+    estatisticas = EstatisticasCifra()
+    inicio = time.perf_counter()
+
+    if workers > 1:
+        estatisticas.bytes = _cifrar_paralelo(entrada, saida, deslocamento, tamanho_bloco, workers, usar_mmap)
+    else:
+        arquivo_saida = open(saida, "wb") if saida_eh_caminho else saida
+        try:
+            if usar_mmap:
+                estatisticas.bytes = _cifrar_mmap(entrada, arquivo_saida, deslocamento, tamanho_bloco)
+            elif entrada_eh_caminho:
+                with open(entrada, "rb") as arquivo_entrada:
+                    estatisticas.bytes = cifrar_fluxo(arquivo_entrada, arquivo_saida, deslocamento, tamanho_bloco)
+            else:
+                estatisticas.bytes = cifrar_fluxo(entrada, arquivo_saida, deslocamento, tamanho_bloco)
+        finally:
+            if saida_eh_caminho:
+                arquivo_saida.close()
+            else:
+                arquivo_saida.flush()
+
+    estatisticas.segundos = time.perf_counter() - inicio
+    return estatisticas
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando.
+
+    Exemplos:
+        python cifra_streaming.py 3 entrada.log saida.log
+        python cifra_streaming.py 3 saida.log - --decifrar
+        cat entrada.log | python cifra_streaming.py 3 > saida.log
+    """
+    parser = argparse.ArgumentParser(description="Aplica a Cifra de César a arquivos grandes, em streaming.")
+    parser.add_argument("deslocamento", type=int, help="Número de posições que cada letra será deslocada")
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo de entrada ('-' para stdin)")
+    parser.add_argument("saida", nargs="?", default="-", help="Arquivo de saída ('-' para stdout)")
+    parser.add_argument("--decifrar", action="store_true", help="Aplica o deslocamento inverso")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO_PADRAO, help="Tamanho do bloco, em bytes")
+    parser.add_argument("--mmap", action="store_true", help="Lê a entrada por mmap")
+    parser.add_argument("--workers", type=int, default=0, help="Processos para cifrar trechos em paralelo")
+    parser.add_argument("--silencioso", action="store_true", help="Não mostra a vazão no stderr")
+    args = parser.parse_args(argumentos)
+
+    deslocamento = -args.deslocamento if args.decifrar else args.deslocamento
+    entrada = sys.stdin.buffer if args.entrada == "-" else args.entrada
+    saida = sys.stdout.buffer if args.saida == "-" else args.saida
+
+    try:
+        estatisticas = cifrar_arquivo(entrada, saida, deslocamento, args.bloco, args.mmap, args.workers)
+    except ValueError as erro:
+        parser.error(str(erro))
+    if not args.silencioso:
+        print(f"{estatisticas.bytes} bytes em {estatisticas.segundos:.3f} s "
+              f"({estatisticas.mb_por_segundo:.1f} MB/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import argparse
+import os
+import sys
+import time
+from functools import lru_cache
+
+from q1b import corrigir_email_rapido
+
+TAMANHO_CACHE_PADRAO = 100_000  # Número máximo de e-mails distintos guardados no cache
+INTERVALO_ESTATISTICAS = 4096  # Linhas entre duas atualizações das contagens em `EstatisticasEmails`
+
+
+class EstatisticasEmails:
+    """
+    Métricas de uma execução de `corrigir_linhas`.
+
+    As contagens são atualizadas a cada `INTERVALO_ESTATISTICAS` linhas e no fim da
+    iteração, então podem ser consultadas durante ou depois dela. O tempo e as taxas só
+    são calculados quando lidos.
+    """
+
+    def __init__(self):
+        self.linhas = 0  # Linhas processadas
+        self.acertos_cache = 0  # Linhas respondidas pelo cache
+        self.erros = 0  # Linhas cujo resultado foi "ERRO"
+        self._inicio = None  # `time.perf_counter()` no início da iteração
+        self._fim = None  # `time.perf_counter()` no fim da iteração (None enquanto ela continua)
+
+    @property
+    def segundos(self):
+        """Tempo desde o início da iteração até o fim dela (ou até agora, se ainda não terminou)."""
+        if self._inicio is None:
+            return 0.0
+        fim = self._fim if self._fim is not None else time.perf_counter()
+        return fim - self._inicio
+
+    @property
+    def taxa_acerto_cache(self):
+        """Fração das linhas respondidas pelo cache."""
+        return self.acertos_cache / self.linhas if self.linhas else 0.0
+
+    @property
+    def proporcao_erro(self):
+        """Fração das linhas cujo resultado foi "ERRO"."""
+        return self.erros / self.linhas if self.linhas else 0.0
+
+    @property
+    def linhas_por_segundo(self):
+        """Vazão, em linhas por segundo."""
+        segundos = self.segundos
+        return self.linhas / segundos if segundos > 0 else 0.0
+
+    def __repr__(self):
+        return (f"EstatisticasEmails(linhas={self.linhas}, taxa_acerto_cache={self.taxa_acerto_cache:.3f}, "
+                f"proporcao_erro={self.proporcao_erro:.3f}, linhas_por_segundo={self.linhas_por_segundo:.1f})")
+
+
+# Função que confere o tamanho do cache antes de qualquer leitura ou escrita
+def _validar_tamanho_cache(tamanho_cache):
+    # `lru_cache(maxsize=None)` não tem limite, e a memória cresceria com a entrada
+    if isinstance(tamanho_cache, bool) or not isinstance(tamanho_cache, int) or tamanho_cache < 0:
+        raise ValueError(f"tamanho_cache deve ser um inteiro maior ou igual a 0, não {tamanho_cache!r}")
+
+
+def corrigir_linhas(linhas, tamanho_cache=TAMANHO_CACHE_PADRAO, estatisticas=None):
+    """
+    Corrige e-mails embaralhados linha a linha, na ordem de entrada.
+
+    Cada linha (sem a quebra de linha final) passa pela mesma correção de
+    `q1b.corrigir_email`. Um cache LRU limitado a `tamanho_cache` entradas evita refazer
+    a correção de e-mails repetidos, então a memória não cresce com o tamanho da entrada.
+
+    As contagens ficam em variáveis locais e são copiadas para `estatisticas` a cada
+    `INTERVALO_ESTATISTICAS` linhas, para não pesar no laço de cada linha.
+
+    :param linhas: Iterável de linhas (por exemplo, um arquivo de texto aberto).
+    :param tamanho_cache: Número máximo de e-mails distintos no cache (0 desliga o cache).
+    :param estatisticas: `EstatisticasEmails` opcional, preenchido durante a iteração.
+    :return: Gerador com o e-mail corrigido ou "ERRO" para cada linha.
+    :raises ValueError: Se `tamanho_cache` não for um inteiro maior ou igual a 0.
+    """
+    _validar_tamanho_cache(tamanho_cache)
+    if estatisticas is None:
+        estatisticas = EstatisticasEmails()
+
+    corrigir = lru_cache(maxsize=tamanho_cache)(corrigir_email_rapido)
+    processadas = 0
+    erros = 0
+    estatisticas._inicio = time.perf_counter()
+    estatisticas._fim = None
+
+    try:
+        for linha in linhas:
+            resultado = corrigir(linha.rstrip("\r\n"))
+            processadas += 1
+            if resultado == "ERRO":
+                erros += 1
+            if processadas % INTERVALO_ESTATISTICAS == 0:
+                estatisticas.linhas, estatisticas.erros = processadas, erros
+                estatisticas.acertos_cache = corrigir.cache_info().hits
+            yield resultado
+    finally:
+        estatisticas.linhas, estatisticas.erros = processadas, erros
+        estatisticas.acertos_cache = corrigir.cache_info().hits
+        estatisticas._fim = time.perf_counter()
+
+
+def corrigir_arquivo(entrada, saida, tamanho_cache=TAMANHO_CACHE_PADRAO):
+    """
+    Corrige um arquivo de e-mails (um por linha) e grava o resultado, também um por linha.
+
+    :param entrada: Caminho do arquivo de entrada ou arquivo de texto aberto.
+    :param saida: Caminho do arquivo de saída ou arquivo de texto aberto.
+    :param tamanho_cache: Número máximo de e-mails distintos no cache.
+    :return: `EstatisticasEmails` da execução.
+    :raises ValueError: Se `tamanho_cache` não for um inteiro maior ou igual a 0.
+    """
+    _validar_tamanho_cache(tamanho_cache)  # Antes de abrir (e esvaziar) o arquivo de saída
+    estatisticas = EstatisticasEmails()
+    entrada_eh_caminho = isinstance(entrada, (str, os.PathLike))
+    saida_eh_caminho = isinstance(saida, (str, os.PathLike))
+
+    arquivo_entrada = open(entrada, encoding="utf-8", newline="") if entrada_eh_caminho else entrada
+    arquivo_saida = open(saida, "w", encoding="utf-8") if saida_eh_caminho else saida
+    try:
+        for resultado in corrigir_linhas(arquivo_entrada, tamanho_cache, estatisticas):
+            arquivo_saida.write(resultado)
+            arquivo_saida.write("\n")
+    finally:
+        if entrada_eh_caminho:
+            arquivo_entrada.close()
+        if saida_eh_caminho:
+            arquivo_saida.close()
+        else:
+            arquivo_saida.flush()
+
+    return estatisticas
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando.
+
+    Exemplos:
+        python corrige_emails_streaming.py emails.txt corrigidos.txt
+        cat emails.txt | python corrige_emails_streaming.py > corrigidos.txt
+    """
+    parser = argparse.ArgumentParser(description="Corrige e-mails embaralhados, um por linha, em streaming.")
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo de entrada ('-' para stdin)")
+    parser.add_argument("saida", nargs="?", default="-", help="Arquivo de saída ('-' para stdout)")
+    parser.add_argument("--cache", type=int, default=TAMANHO_CACHE_PADRAO,
+                        help="Número máximo de e-mails distintos no cache LRU")
+    parser.add_argument("--silencioso", action="store_true", help="Não mostra as métricas no stderr")
+    args = parser.parse_args(argumentos)
+
+    entrada = sys.stdin if args.entrada == "-" else args.entrada
+    saida = sys.stdout if args.saida == "-" else args.saida
+
+    if args.cache < 0:
+        parser.error("--cache deve ser maior ou igual a 0")
+
+    estatisticas = corrigir_arquivo(entrada, saida, args.cache)
+    if not args.silencioso:
+        print(f"{estatisticas.linhas} linhas em {estatisticas.segundos:.3f} s "
+              f"({estatisticas.linhas_por_segundo:.1f} linhas/s), "
+              f"acertos no cache: {100 * estatisticas.taxa_acerto_cache:.1f}%, "
+              f"ERRO: {100 * estatisticas.proporcao_erro:.1f}%", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,7 @@
+import hashlib
+import heapq
+import inspect
+from abc import ABC, abstractmethod
 from collections import deque
 
 # Função para calcular a distância mínima entre dois territórios no grafo usando BFS
@@ -9,7 +13,15 @@ def calcular_distancia(grafo, origem, destino):
     :param origem: Território de origem.
     :param destino: Território de destino.
     :return: Distância mínima entre os territórios ou infinito se não houver caminho.
+
+    Também aceita um `MapaTerritorios` no lugar do grafo. Se o mapa tiver uma
+    `distancias.MatrizDistancias` anexada, a distância é lida direto da matriz.
     """
+    if isinstance(grafo, MapaTerritorios):
+        if grafo.matriz_distancias is not None:
+            return grafo.matriz_distancias.distancia(origem, destino)
+        grafo = grafo.grafo
+
     fila = deque([origem])  # Fila para a busca em largura
     distancias = {origem: 0}  # Dicionário para armazenar as distâncias
     
@@ -64,15 +76,295 @@ def construir_grafo(conexoes_territorios):
     return grafo  # Retorna o grafo completo
 
 
+# Função para gerar uma chave estável para a topologia de um mapa
+def chave_topologia(vizinhos):
+    """
+    Gera uma chave que identifica a topologia de um mapa (a lista de pares de vizinhos).
+
+    Duas listas com os mesmos pares, na mesma ordem, geram a mesma chave em qualquer processo.
+
+    :param vizinhos: Lista de pares de territórios vizinhos.
+    :return: String hexadecimal com o hash da topologia.
+    """
+    resumo = hashlib.sha1()
+    for territorio_a, territorio_b in vizinhos:
+        resumo.update(f"{territorio_a}\t{territorio_b}\n".encode("utf-8"))
+    return resumo.hexdigest()
+
+
+# Classe que guarda a topologia do mapa com territórios identificados por números inteiros
+class MapaTerritorios:
+    """
+    Topologia fixa de um mapa: o grafo de vizinhança e sua versão indexada por inteiros.
+
+    Cada território recebe um ID (0, 1, 2, ...) na ordem em que aparece no grafo, e a
+    vizinhança é guardada como uma lista de listas de IDs. Percorrer inteiros em listas
+    é bem mais barato do que consultar dicionários por nome a cada passo da BFS.
+
+    A chave da topologia (`chave_topologia`) é calculada na primeira consulta de `chave` e
+    guardada no mapa, então passar o mapa no lugar da lista evita recalcular o hash.
+
+    :param vizinhos: Lista de pares de territórios vizinhos.
+                     Exemplo: [["Venezuela", "Brasil"], ["Brasil", "Argentina"]]
+    :param chave: Chave da topologia, se já for conhecida.
+    """
+
+    def __init__(self, vizinhos, chave=None):
+        # Cópia dos pares: a lista original pode ser alterada depois, e a chave não mudaria junto
+        self.vizinhos = tuple(tuple(par) for par in vizinhos)
+        self._chave = chave
+        self.grafo = construir_grafo(vizinhos)  # Grafo por nome, usado pelas funções de lista
+        self.nomes = list(self.grafo)  # ID -> nome do território
+        self.indices = {nome: i for i, nome in enumerate(self.nomes)}  # Nome -> ID
+
+        # Vizinhança por ID, na mesma ordem de `self.grafo`
+        self.adjacencia = [[self.indices[vizinho] for vizinho in self.grafo[nome]] for nome in self.nomes]
+
+        # Distâncias entre todos os pares, se pré-calculadas (veja `distancias.MatrizDistancias`)
+        self.matriz_distancias = None
+
+    @property
+    def chave(self):
+        """Chave da topologia (`chave_topologia` dos pares), calculada só na primeira consulta."""
+        if self._chave is None:
+            self._chave = chave_topologia(self.vizinhos)
+        return self._chave
+
+
+# Valor de `EstadoTabuleiro.dono_por_id` para territórios que não estão na lista de tropas.
+# Não é None porque None pode ser o dono de uma entrada, e esse dono conta como inimigo.
+SEM_DONO = object()
+
+
+# Classe que indexa o estado do tabuleiro para consultas em tempo constante
+class EstadoTabuleiro:
+    """
+    Estado do tabuleiro indexado: dono e tropas de cada território e territórios de cada jogador.
+
+    As funções deste módulo recebem as tropas como uma lista de tuplas
+    (território, tropas, dono), e cada consulta de dono percorre a lista inteira.
+    Esta classe monta os índices uma única vez, e as funções aceitam o estado no
+    lugar da lista de tropas.
+
+    Cada território deve aparecer uma única vez na lista de tropas; se aparecer mais
+    de uma vez, a última entrada prevalece.
+
+    :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios` já construído.
+    :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    """
+
+    def __init__(self, vizinhos, tropas):
+        self.mapa = vizinhos if isinstance(vizinhos, MapaTerritorios) else MapaTerritorios(vizinhos)
+        self.grafo = self.mapa.grafo
+
+        self.dono = {}  # Território -> cor do dono
+        self.qtd_tropas = {}  # Território -> quantidade de tropas
+        self.territorios_por_jogador = {}  # Cor -> conjunto de territórios
+        self.ordem = []  # Territórios na ordem em que aparecem na lista de tropas
+        self.dono_por_id = [SEM_DONO] * len(self.mapa.nomes)  # ID -> cor do dono (SEM_DONO se não houver)
+
+        for territorio, qtd, dono in tropas:
+            self.atualizar_territorio(territorio, dono, qtd)
+
+    def atualizar_territorio(self, territorio, dono, qtd):
+        """
+        Atualiza o dono e as tropas de um território, mantendo todos os índices consistentes.
+
+        :param territorio: Nome do território.
+        :param dono: Nova cor do dono.
+        :param qtd: Nova quantidade de tropas.
+        """
+        if territorio in self.dono:
+            self.territorios_por_jogador[self.dono[territorio]].discard(territorio)
+        else:
+            self.ordem.append(territorio)  # Território novo entra no fim da ordem
+
+        self.dono[territorio] = dono
+        self.qtd_tropas[territorio] = qtd
+        self.territorios_por_jogador.setdefault(dono, set()).add(territorio)
+
+        indice = self.mapa.indices.get(territorio)
+        if indice is not None:
+            self.dono_por_id[indice] = dono
+
+    def territorios_jogador(self, cor_jogador):
+        """
+        Retorna os territórios do jogador e suas tropas, na ordem da lista de tropas.
+
+        :param cor_jogador: Cor do jogador.
+        :return: Dicionário {território: tropas}, igual ao de `obter_territorios_jogador`.
+        """
+        territorios = self.territorios_por_jogador.get(cor_jogador, set())
+        return {territorio: self.qtd_tropas[territorio] for territorio in self.ordem if territorio in territorios}
+
+    def pertence_a(self, territorio, cor_jogador):
+        """Verifica se o território pertence ao jogador."""
+        return territorio in self.dono and self.dono[territorio] == cor_jogador
+
+    def eh_inimigo(self, territorio, cor_jogador):
+        """Verifica se o território tem dono e se esse dono não é o jogador."""
+        return territorio in self.dono and self.dono[territorio] != cor_jogador
+
+    def inimigos_por_id(self, cor_jogador):
+        """Retorna os IDs dos territórios do mapa que têm dono diferente do jogador."""
+        return [i for i, dono in enumerate(self.dono_por_id) if dono is not SEM_DONO and dono != cor_jogador]
+
+    def distancias_para_inimigos(self, cor_jogador):
+        """
+        Calcula, com uma BFS de múltiplas origens sobre os IDs, a distância de cada território até o inimigo mais próximo.
+
+        Se o mapa tiver uma matriz de distâncias anexada, usa o mínimo da matriz sobre os
+        inimigos em vez da BFS.
+
+        :param cor_jogador: Cor do jogador.
+        :return: Lista indexada por ID com as distâncias (infinito se não houver caminho).
+        """
+        if self.mapa.matriz_distancias is not None:
+            return self.mapa.matriz_distancias.distancias_para_inimigos(self.inimigos_por_id(cor_jogador))
+
+        infinito = float('inf')
+        adjacencia = self.mapa.adjacencia
+        distancias = [infinito] * len(adjacencia)
+
+        # Os territórios inimigos são as origens da busca
+        fila = deque(self.inimigos_por_id(cor_jogador))
+        for i in fila:
+            distancias[i] = 0
+
+        while fila:
+            atual = fila.popleft()
+            proxima_distancia = distancias[atual] + 1
+            for vizinho in adjacencia[atual]:
+                if distancias[vizinho] == infinito:
+                    distancias[vizinho] = proxima_distancia
+                    fila.append(vizinho)
+
+        return distancias
+
+    def custos_para_inimigos(self, cor_jogador):
+        """
+        Calcula, com um Dijkstra de múltiplas origens sobre os IDs, o custo de cada território até o inimigo mais barato.
+
+        Cada território inimigo é uma origem com custo igual às suas tropas, e entrar em
+        um território custa 1 passo mais as tropas dele, se for inimigo. Assim um inimigo
+        fraco a três passos pode ficar mais perto do que um inimigo forte ao lado.
+
+        :param cor_jogador: Cor do jogador.
+        :return: Lista indexada por ID com os custos (infinito se não houver caminho).
+        """
+        infinito = float('inf')
+        adjacencia = self.mapa.adjacencia
+        nomes = self.mapa.nomes
+        custos = [infinito] * len(adjacencia)
+
+        # Tropas inimigas por ID (0 para territórios do jogador ou sem dono)
+        tropas_inimigas = [self.qtd_tropas[nomes[i]] if dono is not SEM_DONO and dono != cor_jogador else 0
+                           for i, dono in enumerate(self.dono_por_id)]
+
+        heap = []
+        for i, dono in enumerate(self.dono_por_id):
+            if dono is not SEM_DONO and dono != cor_jogador:
+                custos[i] = tropas_inimigas[i]
+                heap.append((custos[i], i))
+        heapq.heapify(heap)
+
+        while heap:
+            custo, atual = heapq.heappop(heap)
+            if custo > custos[atual]:
+                continue  # Entrada antiga, o território já foi fechado com custo menor
+            for vizinho in adjacencia[atual]:
+                novo_custo = custo + 1 + tropas_inimigas[vizinho]
+                if novo_custo < custos[vizinho]:
+                    custos[vizinho] = novo_custo
+                    heapq.heappush(heap, (novo_custo, vizinho))
+
+        return custos
+
+
+# Classe base das pontuações de vizinhos usadas para escolher o destino das tropas
+class PontuacaoVizinhos(ABC):
+    """
+    Pontuação dos territórios candidatos a destino, calculada uma vez por turno.
+
+    Um mesmo território do jogador é vizinho de vários territórios de origem, então a sua
+    pontuação seria recalculada a cada origem. Esta classe guarda a chave de cada território
+    por ID na primeira consulta e a reaproveita no resto do turno. Crie um objeto novo a
+    cada turno (ou depois de alterar o estado).
+
+    Subclasses implementam `pontuar`, que retorna uma chave comparável: o destino escolhido
+    é o vizinho do jogador com a menor chave.
+
+    :param estado: `EstadoTabuleiro` do turno.
+    :param cor: Cor do jogador.
+    """
+
+    def __init__(self, estado, cor):
+        self.estado = estado
+        self.cor = cor
+        self._chaves = [None] * len(estado.mapa.nomes)  # ID -> chave já calculada
+
+    def chave(self, indice):
+        """Retorna a chave do território de ID `indice`, calculando-a só na primeira consulta."""
+        chave = self._chaves[indice]
+        if chave is None:
+            chave = self._chaves[indice] = self.pontuar(indice)
+        return chave
+
+    @abstractmethod
+    def pontuar(self, indice):
+        """
+        Calcula a chave do território de ID `indice` (quanto menor, melhor).
+
+        :param indice: ID do território no mapa.
+        :return: Chave comparável.
+        """
+
+
+# Pontuação padrão: distância em passos até o inimigo mais próximo
+class PontuacaoDistancia(PontuacaoVizinhos):
+    """
+    Pontua cada território pela distância em passos até o inimigo mais próximo e, no empate, pelo nome.
+
+    É a regra de `calcular_melhor_vizinho`. As distâncias vêm de uma única BFS de múltiplas
+    origens feita na criação do objeto.
+    """
+
+    def __init__(self, estado, cor):
+        super().__init__(estado, cor)
+        self.distancias = self._calcular_distancias()  # ID -> distância até o inimigo
+
+    def _calcular_distancias(self):
+        return self.estado.distancias_para_inimigos(self.cor)
+
+    def pontuar(self, indice):
+        return self.distancias[indice], self.estado.mapa.nomes[indice]
+
+
+# Pontuação que considera a força das tropas inimigas
+class PontuacaoForcaInimiga(PontuacaoDistancia):
+    """
+    Pontua cada território pelo custo até o inimigo mais barato, em um grafo com pesos pelas tropas inimigas.
+
+    Troca a BFS de `PontuacaoDistancia` pelo Dijkstra de `EstadoTabuleiro.custos_para_inimigos`,
+    que leva as tropas para fronteiras com inimigos mais fracos.
+    """
+
+    def _calcular_distancias(self):
+        return self.estado.custos_para_inimigos(self.cor)
+
+
 # Função para filtrar os territórios pertencentes a um jogador específico
 def obter_territorios_jogador(cor_jogador, tropas):
     """
     Filtra os territórios que pertencem a um jogador específico.
     
     :param cor_jogador: Cor do jogador.
-    :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    :param tropas: Lista de tuplas contendo (território, tropas, dono) ou um `EstadoTabuleiro`.
     :return: Dicionário com os territórios e suas tropas pertencentes ao jogador.
     """
+    if isinstance(tropas, EstadoTabuleiro):
+        return tropas.territorios_jogador(cor_jogador)
+
     return {territorio: tropas for territorio, tropas, dono in tropas if dono == cor_jogador}
 
 
@@ -88,6 +380,7 @@ def encontrar_vizinhos_inimigos(grafo, tropas, cor_jogador, territorio):
     :param tropas: Lista de tuplas contendo informações sobre os territórios.
                   Cada tupla tem o formato (nome_territorio, quantidade_tropas, cor_dono).
                   Exemplo: [("A", 10, "azul"), ("B", 5, "vermelho"), ("C", 8, "azul")]
+                  Também aceita um `EstadoTabuleiro`, que consulta o dono de cada vizinho em tempo constante.
     :param cor_jogador: Cor do jogador atual.
                         Exemplo: "azul"
     :param territorio: Nome do território atual.
@@ -95,6 +388,9 @@ def encontrar_vizinhos_inimigos(grafo, tropas, cor_jogador, territorio):
     :return: Lista de territórios vizinhos que são inimigos.
              Exemplo: ["B"]
     """
+    if isinstance(tropas, EstadoTabuleiro):
+        return [vizinho for vizinho in grafo.get(territorio, []) if tropas.eh_inimigo(vizinho, cor_jogador)]
+
     inimigos_vizinhos = []  # Lista para armazenar os vizinhos inimigos
 
     # Itera sobre os vizinhos do território atual
@@ -120,6 +416,7 @@ def calcular_distancia_minima_para_inimigos(territorio, tropas, cor_jogador, gra
     :param tropas: Lista de tuplas contendo informações sobre os territórios.
                   Cada tupla tem o formato (nome_territorio, quantidade_tropas, cor_dono).
                   Exemplo: [("A", 10, "azul"), ("B", 5, "vermelho"), ("C", 8, "azul")]
+                  Também aceita um `EstadoTabuleiro`.
     :param cor_jogador: Cor do jogador atual.
                         Exemplo: "azul"
     :param grafo: Dicionário que representa o grafo de vizinhança.
@@ -127,6 +424,16 @@ def calcular_distancia_minima_para_inimigos(territorio, tropas, cor_jogador, gra
     :return: Menor distância até um território inimigo.
              Retorna infinito (float('inf')) se não houver inimigos.
     """
+    if isinstance(tropas, EstadoTabuleiro) and tropas.mapa.matriz_distancias is not None:
+        indice = tropas.mapa.indices.get(territorio)
+        if indice is not None:
+            # Consulta as colunas dos inimigos na matriz pré-calculada
+            return tropas.mapa.matriz_distancias.distancia_minima(indice, tropas.inimigos_por_id(cor_jogador))
+
+    if isinstance(tropas, EstadoTabuleiro):
+        # Reaproveita a lista de (território, tropas, dono) a partir dos índices do estado
+        tropas = [(nome, tropas.qtd_tropas[nome], tropas.dono[nome]) for nome in tropas.ordem]
+
     menor_distancia = float('inf')  # Inicializa a menor distância como infinito
 
     # Itera sobre a lista de tropas para encontrar inimigos
@@ -143,16 +450,67 @@ def calcular_distancia_minima_para_inimigos(territorio, tropas, cor_jogador, gra
     return menor_distancia  # Retorna a menor distância encontrada
 
 
+# Função para calcular, de uma só vez, a distância de cada território até o inimigo mais próximo
+def calcular_distancias_para_inimigos(grafo, tropas, cor_jogador):
+    """
+    Calcula a distância de todos os territórios até o território inimigo mais próximo.
+
+    Em vez de executar uma BFS para cada par (território, inimigo), executa uma única
+    busca em largura com múltiplas origens: todos os territórios inimigos entram na fila
+    com distância 0 e a busca se expande a partir deles ao mesmo tempo. Como o grafo não
+    é direcionado, a distância encontrada para cada território é exatamente a mesma que
+    `calcular_distancia_minima_para_inimigos` retornaria.
+
+    :param grafo: Dicionário que representa o grafo de vizinhança.
+                  Exemplo: {"A": ["B", "C"], "B": ["A"], "C": ["A"]}
+    :param tropas: Lista de tuplas contendo informações sobre os territórios.
+                  Cada tupla tem o formato (nome_territorio, quantidade_tropas, cor_dono).
+                  Exemplo: [("A", 10, "azul"), ("B", 5, "vermelho"), ("C", 8, "azul")]
+                  Também aceita um `EstadoTabuleiro`, caso em que a BFS é feita sobre os IDs inteiros.
+    :param cor_jogador: Cor do jogador atual.
+                        Exemplo: "azul"
+    :return: Dicionário {território: distância até o inimigo mais próximo}.
+             Territórios sem caminho até um inimigo não aparecem no dicionário.
+             Exemplo: {"B": 0, "A": 1, "C": 2}
+    """
+    if isinstance(tropas, EstadoTabuleiro):
+        nomes = tropas.mapa.nomes
+        return {nomes[i]: distancia for i, distancia in enumerate(tropas.distancias_para_inimigos(cor_jogador))
+                if distancia != float('inf')}
+
+    distancias = {}  # Dicionário para armazenar as distâncias
+    fila = deque()  # Fila para a busca em largura
+
+    # Todos os territórios inimigos são origens da busca, com distância 0
+    for nome_territorio, _, cor_dono in tropas:
+        if cor_dono != cor_jogador and nome_territorio not in distancias:
+            distancias[nome_territorio] = 0
+            fila.append(nome_territorio)
+
+    while fila:
+        atual = fila.popleft()  # Pega o próximo território da fila
+
+        for vizinho in grafo.get(atual, []):  # Percorre os vizinhos
+            if vizinho not in distancias:  # Se o vizinho ainda não foi visitado
+                distancias[vizinho] = distancias[atual] + 1  # Atualiza a distância
+                fila.append(vizinho)  # Adiciona o vizinho à fila
+
+    return distancias  # Retorna a tabela de distâncias
+
+
 # Função para determinar o melhor vizinho para mover tropas
-def calcular_melhor_vizinho(territorio, vizinhos_do_territorio, tropas, cor_jogador, grafo):
+def calcular_melhor_vizinho(territorio, vizinhos_do_territorio, tropas, cor_jogador, grafo, distancias_inimigos=None):
     """
     Determina o melhor vizinho para mover tropas, considerando a distância até os inimigos e outras condições.
     
     :param territorio: Território atual.
     :param vizinhos_do_territorio: Lista de vizinhos do território.
-    :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    :param tropas: Lista de tuplas contendo (território, tropas, dono) ou um `EstadoTabuleiro`.
     :param cor_jogador: Cor do jogador.
     :param grafo: Grafo de vizinhança.
+    :param distancias_inimigos: Tabela opcional gerada por `calcular_distancias_para_inimigos`.
+                                Se informada, as distâncias são lidas dela em vez de
+                                recalculadas com uma BFS por inimigo.
     :return: Melhor vizinho para mover tropas ou None se não houver.
     """
     melhor_vizinho = None
@@ -160,16 +518,29 @@ def calcular_melhor_vizinho(territorio, vizinhos_do_territorio, tropas, cor_joga
     menor_tropas = float('inf')
     melhor_nome_alfabetico = None
     
+    estado_indexado = isinstance(tropas, EstadoTabuleiro)
+
     # Obtém o número de tropas no território atual
-    tropa_atual = next(tropa for t, tropa, dono in tropas if t == territorio and dono == cor_jogador)
+    if estado_indexado:
+        tropa_atual = tropas.qtd_tropas[territorio]
+    else:
+        tropa_atual = next(tropa for t, tropa, dono in tropas if t == territorio and dono == cor_jogador)
     
     for vizinho in vizinhos_do_territorio:
         # Verifica se o vizinho pertence ao jogador
-        if not any(nome_territorio == vizinho and cor_dono == cor_jogador for nome_territorio, _, cor_dono in tropas):
+        if estado_indexado:
+            pertence_ao_jogador = tropas.pertence_a(vizinho, cor_jogador)
+        else:
+            pertence_ao_jogador = any(nome_territorio == vizinho and cor_dono == cor_jogador
+                                      for nome_territorio, _, cor_dono in tropas)
+        if not pertence_ao_jogador:
             continue  # Ignora vizinhos que não pertencem ao jogador
         
-        # Calcula a distância mínima até os inimigos
-        distancia_minima_inimigos = calcular_distancia_minima_para_inimigos(vizinho, tropas, cor_jogador, grafo)
+        # Calcula a distância mínima até os inimigos (ou consulta a tabela do turno, se houver)
+        if distancias_inimigos is not None:
+            distancia_minima_inimigos = distancias_inimigos.get(vizinho, float('inf'))
+        else:
+            distancia_minima_inimigos = calcular_distancia_minima_para_inimigos(vizinho, tropas, cor_jogador, grafo)
         
         # Verifica se o vizinho atual é o melhor com base nas condições
         if (distancia_minima_inimigos < menor_distancia or
@@ -185,34 +556,104 @@ def calcular_melhor_vizinho(territorio, vizinhos_do_territorio, tropas, cor_joga
 
 
 # Função principal que organiza a movimentação das tropas
-def mover_tropas(cor, vizinhos, tropas):
+def mover_tropas(cor, vizinhos, tropas=None, pontuacao=None):
     """
     Organiza a movimentação das tropas do jogador.
     
     :param cor: Cor do jogador.
-    :param vizinhos: Lista de pares de territórios vizinhos.
+    :param vizinhos: Lista de pares de territórios vizinhos, um `MapaTerritorios` já construído
+                     ou um `EstadoTabuleiro` já construído (nesse caso, `tropas` não é informado).
     :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    :param pontuacao: Subclasse de `PontuacaoVizinhos` usada para escolher os destinos.
+                      None usa a distância em passos até o inimigo mais próximo.
     :return: Lista de movimentações sugeridas.
+    :raises TypeError: Se `pontuacao` não for uma subclasse concreta de `PontuacaoVizinhos`.
     """
+    # Erro de uso, e não de dados: é levantado em vez de virar uma lista vazia
+    if pontuacao is not None and not (isinstance(pontuacao, type) and issubclass(pontuacao, PontuacaoVizinhos)
+                                      and not inspect.isabstract(pontuacao)):
+        raise TypeError(f"pontuacao deve ser uma subclasse concreta de PontuacaoVizinhos, não {pontuacao!r}")
+
     try:
-        grafo = construir_grafo(vizinhos)  # Constrói o grafo de vizinhança
-        territorios_jogador = obter_territorios_jogador(cor, tropas)  # Filtra os territórios do jogador
-        movimentacoes = []
-
-        for territorio, tropa in territorios_jogador.items():
-            if tropa > 1:  # Só movimenta se houver mais de 1 tropa
-                vizinhos_do_territorio = grafo.get(territorio, [])
-                inimigos_vizinhos = encontrar_vizinhos_inimigos(grafo, tropas, cor, territorio)
-                
-                # Verifica se o território atual não tem inimigos vizinhos
-                if not inimigos_vizinhos:
-                    melhor_vizinho = calcular_melhor_vizinho(territorio, vizinhos_do_territorio, tropas, cor, grafo)
-                    
-                    # Se houver um melhor vizinho, sugere a movimentação
-                    if melhor_vizinho:
-                        movimentacoes.append((territorio, melhor_vizinho))
-
-        return movimentacoes
+        # A versão com listas apenas monta o estado indexado e segue pelo mesmo caminho
+        estado = vizinhos if isinstance(vizinhos, EstadoTabuleiro) else EstadoTabuleiro(vizinhos, tropas)
+        return _mover_tropas_indexado(cor, estado, pontuacao)
     except Exception as e:
         print(f"Erro ao mover tropas: {e}")
-        return []  # Retorna uma lista vazia em caso de erro
\ No newline at end of file
+        return []  # Retorna uma lista vazia em caso de erro
+
+
+# Função que calcula as movimentações sobre o estado indexado
+def _mover_tropas_indexado(cor, estado, pontuacao=None):
+    """
+    Calcula as movimentações do jogador percorrendo apenas IDs inteiros e listas.
+
+    Sem `pontuacao`, segue as mesmas regras de `calcular_melhor_vizinho`: entre os vizinhos
+    do jogador, escolhe o de menor distância até um inimigo e, em caso de empate, o de menor nome.
+
+    :param cor: Cor do jogador.
+    :param estado: `EstadoTabuleiro` com o mapa e as tropas.
+    :param pontuacao: Subclasse de `PontuacaoVizinhos` ou None.
+    :return: Lista de movimentações sugeridas.
+    """
+    indices = estado.mapa.indices
+    if pontuacao is None:
+        distancias_inimigos = estado.distancias_para_inimigos(cor)  # Uma única BFS por turno
+    else:
+        distancias_inimigos = pontuacao(estado, cor)  # Pontuações memorizadas durante o turno
+    movimentacoes = []
+
+    for territorio in estado.territorios_jogador(cor):
+        indice = indices.get(territorio)
+        if indice is None:  # Território fora do mapa não tem vizinhos para onde mover
+            continue
+
+        melhor_vizinho = escolher_destino(estado, cor, indice, distancias_inimigos)
+
+        # Se houver um melhor vizinho, sugere a movimentação
+        if melhor_vizinho:
+            movimentacoes.append((territorio, melhor_vizinho))
+
+    return movimentacoes
+
+
+# Função que escolhe o destino das tropas de um único território do jogador
+def escolher_destino(estado, cor, indice, distancias_inimigos):
+    """
+    Escolhe para onde mover as tropas do território de ID `indice`.
+
+    :param estado: `EstadoTabuleiro` com o mapa e as tropas.
+    :param cor: Cor do jogador (dono do território).
+    :param indice: ID do território no mapa.
+    :param distancias_inimigos: Lista indexada por ID com a distância até o inimigo mais próximo
+                                ou uma `PontuacaoVizinhos` do turno.
+    :return: Nome do melhor vizinho ou None se o território não deve mover tropas.
+    """
+    nomes = estado.mapa.nomes
+    if estado.qtd_tropas[nomes[indice]] <= 1:  # Só movimenta se houver mais de 1 tropa
+        return None
+
+    dono_por_id = estado.dono_por_id
+    pontuacao = distancias_inimigos if isinstance(distancias_inimigos, PontuacaoVizinhos) else None
+
+    # Percorre os vizinhos uma única vez, sem montar listas de candidatos
+    melhor = -1
+    melhor_chave = None
+    for v in estado.mapa.adjacencia[indice]:
+        dono = dono_por_id[v]
+        if dono != cor:
+            if dono is not SEM_DONO:
+                return None  # O território atual tem um inimigo vizinho
+            continue
+
+        if pontuacao is not None:
+            chave = pontuacao.chave(v)
+            if melhor < 0 or chave < melhor_chave:
+                melhor, melhor_chave = v, chave
+        else:
+            # Menor distância até os inimigos e, no empate, menor nome
+            distancia = distancias_inimigos[v]
+            if melhor < 0 or distancia < melhor_chave or (distancia == melhor_chave and nomes[v] < nomes[melhor]):
+                melhor, melhor_chave = v, distancia
+
+    return nomes[melhor] if melhor >= 0 else None
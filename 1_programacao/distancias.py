@@ -0,0 +1,239 @@
+import os
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional para o resto do pacote
+    np = None
+
+from desafio import MapaTerritorios
+
+# Diretório padrão dos arquivos de matrizes já calculadas
+DIRETORIO_CACHE_PADRAO = os.path.join(tempfile.gettempdir(), "case_turing_distancias")
+
+MAX_TERRITORIOS = 65535  # Acima disso as distâncias não cabem em uint16
+LINHAS_POR_BLOCO = 1024  # Linhas da matriz lidas de cada vez no mínimo sobre os inimigos
+
+# Versão do formato dos arquivos do cache (tipo e layout da matriz). Faz parte do nome do
+# arquivo: ao mudar o formato, incremente-a para que arquivos antigos não sejam reaproveitados.
+VERSAO_CACHE = 1
+
+
+# Função que calcula as distâncias entre todos os pares de territórios
+def _calcular_matriz(adjacencia):
+    """
+    Calcula a matriz de distâncias em passos entre todos os pares de territórios.
+
+    Executa as BFS de todas as origens ao mesmo tempo, nível a nível. O conjunto de origens
+    que já alcançaram cada território é guardado como um vetor de bits (uma linha de palavras
+    de 64 bits por território), e cada nível da busca é um OU dos bits da fronteira dos
+    vizinhos. Só as palavras que ganharam origens novas no nível são desempacotadas, então o
+    custo de preencher a matriz é proporcional ao número de pares, e não a n² por nível.
+
+    :param adjacencia: Lista de listas de IDs vizinhos (como em `MapaTerritorios.adjacencia`).
+    :return: Matriz (n, n) uint8 ou uint16; pares sem caminho recebem o maior valor do tipo.
+    """
+    n = len(adjacencia)
+    if n > MAX_TERRITORIOS:
+        raise ValueError(f"A matriz de distâncias aceita no máximo {MAX_TERRITORIOS} territórios")
+
+    # Com até 255 territórios a maior distância é 254, e o valor 255 fica para "sem caminho"
+    tipo = np.uint8 if n <= 255 else np.uint16
+    inalcancavel = np.iinfo(tipo).max
+    matriz = np.full((n, n), inalcancavel, dtype=tipo)
+    if n == 0:
+        return matriz
+
+    ids = np.arange(n)
+    matriz[ids, ids] = 0
+
+    # Arestas separadas pela posição na lista de vizinhos: em cada posição k, os territórios
+    # com mais de k vizinhos e o seu k-ésimo vizinho. Cada nível faz um OU por posição, e o
+    # trabalho total é o número de arestas, mesmo com graus muito desiguais.
+    arestas = []
+    for k in range(max(map(len, adjacencia))):
+        territorios = [t for t, vizinhos in enumerate(adjacencia) if len(vizinhos) > k]
+        arestas.append((np.array(territorios, dtype=np.intp),
+                        np.array([adjacencia[t][k] for t in territorios], dtype=np.intp)))
+
+    # Bit s da linha t: a origem s já alcançou o território t
+    alcance = np.zeros((n, (n + 63) // 64), dtype=np.uint64)
+    alcance[ids, ids >> 6] = np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64))
+    fronteira = alcance.copy()
+
+    distancia = 0
+    while arestas:
+        distancia += 1
+        novos = np.zeros_like(alcance)
+        for territorios, vizinhos in arestas:
+            novos[territorios] |= fronteira[vizinhos]
+        novos &= ~alcance
+
+        linhas, palavras = np.nonzero(novos)
+        if len(linhas) == 0:
+            break  # Nenhuma origem alcançou territórios novos: a busca terminou
+
+        # Desempacota só as palavras não nulas, retirando um bit ligado (uma origem nova) por
+        # vez de cada palavra. O bit menos significativo de w é w & -w, uma potência de 2
+        # representada exatamente em float64, então o expoente dado por frexp é a sua posição.
+        valores = novos[linhas, palavras]
+        colunas_base = palavras * 64
+        while len(valores):
+            menor_bit = valores & (~valores + np.uint64(1))
+            bit = np.frexp(menor_bit.astype(np.float64))[1] - 1
+            matriz[linhas, colunas_base + bit] = distancia
+
+            valores ^= menor_bit
+            restantes = valores != 0
+            valores, linhas, colunas_base = valores[restantes], linhas[restantes], colunas_base[restantes]
+
+        alcance |= novos
+        fronteira = novos
+
+    # Mapas grandes com diâmetro pequeno cabem em uint8
+    if tipo is np.uint16 and distancia <= 255:
+        matriz = np.where(matriz == inalcancavel, 255, matriz).astype(np.uint8)
+    return matriz
+
+
+# Classe com as distâncias pré-calculadas de uma topologia fixa
+class MatrizDistancias:
+    """
+    Distâncias em passos entre todos os pares de territórios de um mapa fixo.
+
+    Os mapas não mudam entre partidas, só os donos dos territórios. A matriz é calculada
+    uma única vez por topologia e gravada em disco, e os outros processos a abrem como
+    arquivo mapeado em memória (`np.load(..., mmap_mode="r")`), sem recalcular nada.
+
+    Criar o objeto também o anexa ao mapa (`mapa.matriz_distancias`). A partir daí, as
+    funções de `desafio` que recebem o `MapaTerritorios` ou um `EstadoTabuleiro` desse mapa
+    consultam a matriz em vez de fazer uma BFS: `calcular_distancia` vira uma consulta
+    direta e a distância até os inimigos vira um mínimo sobre as colunas dos inimigos.
+
+    Exemplo:
+        matriz = MatrizDistancias.carregar(vizinhos)
+        mover_tropas("azul", EstadoTabuleiro(matriz.mapa, tropas))
+
+    :param mapa: `MapaTerritorios` do mapa.
+    :param matriz: Matriz (n, n) de distâncias indexada pelos IDs do mapa.
+    """
+
+    def __init__(self, mapa, matriz):
+        if matriz.shape != (len(mapa.nomes), len(mapa.nomes)):
+            raise ValueError("A matriz de distâncias não corresponde ao mapa")
+        self.mapa = mapa
+        self.matriz = matriz
+        self.inalcancavel = np.iinfo(matriz.dtype).max  # Valor usado para pares sem caminho
+        mapa.matriz_distancias = self
+
+    @classmethod
+    def calcular(cls, vizinhos):
+        """
+        Calcula a matriz de um mapa, sem usar o cache em disco.
+
+        :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios`.
+        :return: `MatrizDistancias` do mapa.
+        """
+        if np is None:
+            raise ImportError("MatrizDistancias precisa do NumPy instalado")
+
+        mapa = vizinhos if isinstance(vizinhos, MapaTerritorios) else MapaTerritorios(vizinhos)
+        return cls(mapa, _calcular_matriz(mapa.adjacencia))
+
+    @classmethod
+    def carregar(cls, vizinhos, diretorio=DIRETORIO_CACHE_PADRAO):
+        """
+        Abre a matriz do mapa a partir do cache em disco, calculando e gravando se ainda não existir.
+
+        O arquivo é identificado pelo hash da topologia (`desafio.chave_topologia`) e pela
+        versão do formato (`VERSAO_CACHE`), então qualquer processo que receba a mesma lista
+        de vizinhos encontra o mesmo arquivo.
+
+        :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios`.
+        :param diretorio: Diretório do cache.
+        :return: `MatrizDistancias` do mapa, com a matriz mapeada do disco (somente leitura).
+        """
+        if np is None:
+            raise ImportError("MatrizDistancias precisa do NumPy instalado")
+
+        mapa = vizinhos if isinstance(vizinhos, MapaTerritorios) else MapaTerritorios(vizinhos)
+        n = len(mapa.nomes)
+        if n == 0:
+            return cls(mapa, _calcular_matriz(mapa.adjacencia))  # Arquivos vazios não podem ser mapeados
+
+        caminho = os.path.join(diretorio, f"{mapa.chave}_v{VERSAO_CACHE}.npy")
+        try:
+            matriz = np.load(caminho, mmap_mode="r")
+            if matriz.shape == (n, n):
+                return cls(mapa, matriz)
+        except (OSError, ValueError):
+            pass  # Arquivo ausente ou corrompido: recalcula
+
+        matriz = _calcular_matriz(mapa.adjacencia)
+
+        # Grava em um arquivo temporário e renomeia, para que outro processo nunca leia um arquivo pela metade
+        os.makedirs(diretorio, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(suffix=".npy", dir=diretorio)
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                np.save(arquivo, matriz)
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+        return cls(mapa, np.load(caminho, mmap_mode="r"))
+
+    def distancia(self, origem, destino):
+        """
+        Retorna a distância entre dois territórios, como `desafio.calcular_distancia`.
+
+        :param origem: Território de origem.
+        :param destino: Território de destino.
+        :return: Distância em passos ou infinito se não houver caminho.
+        """
+        indices = self.mapa.indices
+        if origem not in indices or destino not in indices:
+            return 0 if origem == destino else float('inf')
+
+        distancia = int(self.matriz[indices[origem], indices[destino]])
+        return float('inf') if distancia == self.inalcancavel else distancia
+
+    def distancia_minima(self, indice, inimigos):
+        """
+        Retorna a menor distância do território de ID `indice` até os IDs de `inimigos`.
+
+        :param indice: ID do território.
+        :param inimigos: Lista de IDs dos territórios inimigos.
+        :return: Distância em passos ou infinito se não houver caminho.
+        """
+        if not inimigos:
+            return float('inf')
+
+        distancia = int(self.matriz[indice, inimigos].min())
+        return float('inf') if distancia == self.inalcancavel else distancia
+
+    def distancias_para_inimigos(self, inimigos):
+        """
+        Retorna a distância de cada território até o inimigo mais próximo.
+
+        É o mínimo da matriz sobre as colunas dos inimigos. Como o grafo não é direcionado, a
+        matriz é simétrica, e o mínimo é feito sobre as linhas dos inimigos (contíguas no
+        arquivo), em blocos para não copiar a submatriz inteira. O resultado é igual ao da
+        BFS de `EstadoTabuleiro.distancias_para_inimigos`.
+
+        :param inimigos: Lista de IDs dos territórios inimigos.
+        :return: Lista indexada por ID com as distâncias (infinito se não houver caminho).
+        """
+        n = len(self.mapa.nomes)
+        if not inimigos:
+            return [float('inf')] * n
+
+        minimos = np.full(n, self.inalcancavel, dtype=self.matriz.dtype)
+        for inicio in range(0, len(inimigos), LINHAS_POR_BLOCO):
+            bloco = self.matriz[inimigos[inicio:inicio + LINHAS_POR_BLOCO]]
+            np.minimum(minimos, bloco.min(axis=0), out=minimos)
+
+        minimos = minimos.tolist()
+        inalcancavel = self.inalcancavel
+        return [float('inf') if distancia == inalcancavel else distancia for distancia in minimos]
@@ -0,0 +1,246 @@
+import collections
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from desafio import MapaTerritorios, chave_topologia, mover_tropas
+
+# Mapas já construídos neste processo, indexados pela chave da topologia, do menos para o mais
+# recente. Cada processo do pool tem o seu; acima de `MAX_MAPAS` os mais antigos são descartados
+# (e reconstruídos se a topologia voltar), para que processos de longa duração não cresçam sem limite.
+MAX_MAPAS = 256
+_MAPAS = collections.OrderedDict()
+
+# Topologias que o processo principal já enviou ao pool, em ordem de uso (as mais antigas são
+# esquecidas e, se voltarem a aparecer, são enviadas de novo)
+MAX_TOPOLOGIAS_ENVIADAS = 256
+
+
+# Classe com as métricas de uma avaliação em lote
+class EstatisticasLote:
+    """
+    Métricas de uma execução de `mover_tropas_em_lote`.
+
+    O objeto é preenchido à medida que os resultados são produzidos, então pode ser
+    consultado durante ou depois da iteração.
+    """
+
+    def __init__(self):
+        self.posicoes = 0  # Número de posições (jobs) avaliadas
+        self.topologias = 0  # Topologias enviadas ao pool (uma que foi esquecida e voltou conta de novo)
+        self.reenvios = 0  # Blocos reenviados porque o processo que os recebeu não conhecia a topologia
+        self.segundos = 0.0  # Tempo total desde o início da avaliação
+
+    @property
+    def posicoes_por_segundo(self):
+        """Vazão da avaliação, em posições por segundo."""
+        return self.posicoes / self.segundos if self.segundos > 0 else 0.0
+
+    def __repr__(self):
+        return (f"EstatisticasLote(posicoes={self.posicoes}, topologias={self.topologias}, reenvios={self.reenvios}, "
+                f"segundos={self.segundos:.3f}, posicoes_por_segundo={self.posicoes_por_segundo:.1f})")
+
+
+# Função executada em cada processo: avalia um bloco de jobs
+def avaliar_bloco(bloco, topologias):
+    """
+    Avalia um bloco de jobs reaproveitando os mapas já construídos neste processo.
+
+    É o ponto de entrada usado pelos processos de `mover_tropas_em_lote` e do
+    `servico.ServicoPlanejamento`. O cache de mapas do processo guarda no máximo
+    `MAX_MAPAS` topologias.
+
+    :param bloco: Lista de tuplas (cor, chave_da_topologia, tropas).
+    :param topologias: Dicionário {chave: vizinhos} com as topologias do bloco que este
+                       processo talvez ainda não conheça.
+    :return: Lista de movimentações, uma por job, na ordem do bloco, ou None se alguma
+             topologia do bloco não estiver em `topologias` nem no cache do processo.
+    """
+    # Separa os mapas do bloco antes de avaliar, para que o descarte dos mais antigos
+    # não remova um mapa que o próprio bloco ainda vai usar
+    mapas = {}
+    for _, chave, _ in bloco:
+        if chave in mapas:
+            continue
+        mapa = _MAPAS.pop(chave, None)
+        if mapa is None:
+            if chave not in topologias:
+                _MAPAS.update(mapas)  # Devolve ao cache os mapas já separados
+                return None  # O processo principal reenvia o bloco com todas as topologias
+            mapa = MapaTerritorios(topologias[chave], chave)
+        mapas[chave] = mapa
+
+    _MAPAS.update(mapas)  # Entram no fim, como os mais recentes
+    while len(_MAPAS) > MAX_MAPAS:
+        _MAPAS.popitem(last=False)
+
+    return [mover_tropas(cor, mapas[chave], tropas) for cor, chave, tropas in bloco]
+
+
+# Função que separa os jobs em blocos, trocando os vizinhos pela chave da topologia
+def _gerar_blocos(jobs, tamanho_bloco, estatisticas, topologias):
+    """
+    Agrupa os jobs em blocos de `tamanho_bloco` e identifica a topologia de cada job.
+
+    Uma lista de vizinhos é identificada pelo conteúdo, então uma lista alterada no lugar
+    entre dois jobs gera outra chave. Um `MapaTerritorios` ou uma chave de `topologias` já
+    trazem a chave e uma cópia imutável dos pares, sem hash nem cópia por job. Os vizinhos
+    só acompanham o bloco na primeira vez que a topologia aparece (enquanto ela estiver
+    entre as `MAX_TOPOLOGIAS_ENVIADAS` mais recentes); os blocos seguintes levam apenas a chave.
+
+    :return: Gerador de tuplas (bloco, topologias_novas, todas_as_topologias_do_bloco).
+    """
+    enviadas = collections.OrderedDict()  # Chave -> None, da menos para a mais recente
+    jobs = iter(jobs)
+
+    while True:
+        bloco = []
+        novas = {}
+        todas = {}
+        for cor, vizinhos, tropas in itertools.islice(jobs, tamanho_bloco):
+            if isinstance(vizinhos, str):
+                chave = vizinhos
+                if chave not in topologias:
+                    raise KeyError(f"Topologia desconhecida: {chave}")
+                pares = topologias[chave]
+            elif isinstance(vizinhos, MapaTerritorios):
+                chave, pares = vizinhos.chave, vizinhos.vizinhos
+            else:
+                chave, pares = chave_topologia(vizinhos), None
+
+            if chave in enviadas:
+                enviadas.move_to_end(chave)
+            else:
+                enviadas[chave] = None
+                if len(enviadas) > MAX_TOPOLOGIAS_ENVIADAS:
+                    enviadas.popitem(last=False)
+                novas[chave] = None  # Preenchida abaixo com os pares
+                estatisticas.topologias += 1
+            if chave not in todas:
+                # Cópia dos pares de uma lista: ela pode mudar antes de o bloco ser avaliado
+                todas[chave] = pares if pares is not None else tuple(tuple(par) for par in vizinhos)
+                if chave in novas:
+                    novas[chave] = todas[chave]
+            bloco.append((cor, chave, tropas))
+
+        if not bloco:
+            return
+        yield bloco, novas, todas
+
+
+# Função principal: avalia muitas posições de tabuleiro em paralelo
+def mover_tropas_em_lote(jobs, workers=None, tamanho_bloco=64, ordenado=True, estatisticas=None, topologias=None):
+    """
+    Avalia `mover_tropas` para muitas posições independentes, usando um pool de processos.
+
+    Os jobs são agrupados em blocos de `tamanho_bloco` e cada bloco é enviado a um processo.
+    Cada topologia de mapa é construída no máximo uma vez por processo (`MapaTerritorios`),
+    e jobs com a mesma lista de vizinhos reaproveitam esse mapa. Os vizinhos de uma
+    topologia só são enviados ao pool junto com o primeiro bloco que a usa; se outro
+    processo receber um bloco com uma topologia que ainda não conhece, o bloco volta e é
+    reenviado com os vizinhos.
+
+    Cada lista de vizinhos passa por `chave_topologia` no processo principal. Para não
+    repetir esse hash a cada job, passe o mesmo `MapaTerritorios` em todos os jobs de uma
+    topologia (a chave fica guardada no mapa) ou registre a topologia em `topologias` e
+    passe só a chave no job.
+
+    Os jobs são consumidos sob demanda: no máximo `2 * workers` blocos ficam pendentes ou
+    prontos à espera da sua vez ao mesmo tempo, então um iterável muito grande não é
+    carregado inteiro na memória.
+
+    Exemplo:
+        estatisticas = EstatisticasLote()
+        for movimentacoes in mover_tropas_em_lote(jobs, workers=4, estatisticas=estatisticas):
+            ...
+        print(estatisticas.posicoes_por_segundo)
+
+    :param jobs: Iterável de tuplas (cor, vizinhos, tropas), no formato de `mover_tropas`. No lugar
+                 dos vizinhos, o job pode trazer um `MapaTerritorios` ou a chave de uma topologia de `topologias`.
+    :param workers: Número de processos. None usa todos os núcleos; 0 ou 1 avalia no próprio processo.
+    :param tamanho_bloco: Número de jobs enviados a um processo de uma só vez.
+    :param ordenado: Se True, produz as movimentações na ordem dos jobs.
+                     Se False, produz tuplas (índice_do_job, movimentações) à medida que ficam prontas.
+    :param estatisticas: `EstatisticasLote` opcional, preenchido durante a avaliação.
+    :param topologias: Dicionário {chave: vizinhos ou `MapaTerritorios`} com as topologias que os
+                       jobs identificam só pela chave (`desafio.chave_topologia` dos vizinhos).
+    :return: Gerador com os resultados.
+    :raises KeyError: Se um job trouxer uma chave que não está em `topologias`.
+    """
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco deve ser pelo menos 1")
+
+    # Cópia imutável dos pares de cada topologia registrada, feita uma única vez
+    topologias = {chave: vizinhos.vizinhos if isinstance(vizinhos, MapaTerritorios)
+                  else tuple(tuple(par) for par in vizinhos)
+                  for chave, vizinhos in (topologias or {}).items()}
+
+    if estatisticas is None:
+        estatisticas = EstatisticasLote()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    blocos = _gerar_blocos(jobs, tamanho_bloco, estatisticas, topologias)
+
+    # Sem pool: avalia no próprio processo, com o mesmo cache de mapas
+    if workers <= 1:
+        indice = 0
+        for bloco, _, topologias in blocos:
+            for movimentacoes in avaliar_bloco(bloco, topologias):
+                estatisticas.posicoes += 1
+                estatisticas.segundos = time.perf_counter() - inicio
+                yield movimentacoes if ordenado else (indice, movimentacoes)
+                indice += 1
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes = {}  # Future -> (índice do primeiro job do bloco, bloco, todas as topologias do bloco)
+        prontos = {}  # Índice do primeiro job -> resultados (usado no modo ordenado)
+        proximo_envio = 0
+        proximo_a_produzir = 0
+        esgotado = False
+
+        while True:
+            # Mantém o pool ocupado sem consumir o iterável inteiro de uma vez. Os blocos prontos
+            # que esperam a vez (modo ordenado) também contam: se o primeiro bloco demorar, os
+            # seguintes não se acumulam sem limite
+            while not esgotado and len(pendentes) + len(prontos) < 2 * workers:
+                try:
+                    bloco, novas, todas = next(blocos)
+                except StopIteration:
+                    esgotado = True
+                    break
+                pendentes[pool.submit(avaliar_bloco, bloco, novas)] = (proximo_envio, bloco, todas)
+                proximo_envio += len(bloco)
+
+            if not pendentes:
+                break
+
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                primeiro, bloco, todas = pendentes.pop(futuro)
+                resultados = futuro.result()
+                if resultados is None:
+                    # O processo não conhecia alguma topologia: reenvia o bloco com todas elas
+                    estatisticas.reenvios += 1
+                    pendentes[pool.submit(avaliar_bloco, bloco, todas)] = (primeiro, bloco, todas)
+                    continue
+
+                if not ordenado:
+                    for deslocamento, movimentacoes in enumerate(resultados):
+                        estatisticas.posicoes += 1
+                        estatisticas.segundos = time.perf_counter() - inicio
+                        yield primeiro + deslocamento, movimentacoes
+                else:
+                    prontos[primeiro] = resultados
+
+            # No modo ordenado, só produz os blocos cuja vez já chegou
+            while proximo_a_produzir in prontos:
+                resultados = prontos.pop(proximo_a_produzir)
+                for movimentacoes in resultados:
+                    estatisticas.posicoes += 1
+                    estatisticas.segundos = time.perf_counter() - inicio
+                    yield movimentacoes
+                proximo_a_produzir += len(resultados)
@@ -0,0 +1,225 @@
+import bisect
+import heapq
+from collections import deque
+
+from desafio import SEM_DONO, EstadoTabuleiro, escolher_destino
+
+
+# Classe que mantém o plano de movimentação de um jogador entre turnos
+class PlanejadorTropas:
+    """
+    Planejador de movimentação de tropas que é atualizado de forma incremental a cada turno.
+
+    `mover_tropas` reconstrói o grafo e recalcula todas as distâncias a cada chamada, mesmo
+    quando só alguns territórios mudaram de dono ou de tropas. O planejador guarda o estado
+    do tabuleiro, a distância de cada território até o inimigo mais próximo e o destino
+    escolhido para cada território do jogador. A cada turno recebe apenas as alterações e
+    corrige somente a parte afetada do campo de distâncias e das escolhas de destino.
+
+    As movimentações retornadas são sempre iguais às de `mover_tropas` para o mesmo tabuleiro.
+
+    Exemplo:
+        planejador = PlanejadorTropas("azul", vizinhos, tropas)
+        planejador.movimentacoes()
+        planejador.aplicar_alteracoes([("Brasil", 3, "vermelho")])
+
+    :param cor: Cor do jogador.
+    :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios` já construído.
+    :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    """
+
+    def __init__(self, cor, vizinhos, tropas):
+        self.cor = cor
+        self.estado = EstadoTabuleiro(vizinhos, tropas)
+        self.mapa = self.estado.mapa
+
+        self.distancias = self.estado.distancias_para_inimigos(cor)  # ID -> distância até o inimigo mais próximo
+        self.posicao = {territorio: i for i, territorio in enumerate(self.estado.ordem)}  # Ordem de saída
+
+        # Movimentações mantidas já ordenadas, junto com a posição de cada origem, para que
+        # uma alteração seja inserida ou removida com busca binária em vez de reordenar tudo
+        self._posicoes = []
+        self._movimentacoes = []
+
+        for indice in range(len(self.mapa.nomes)):
+            self._atualizar_destino(indice)
+
+    def movimentacoes(self):
+        """
+        Retorna a lista de movimentações sugeridas para o estado atual.
+
+        :return: Lista de tuplas (origem, destino), na mesma ordem de `mover_tropas`.
+        """
+        return list(self._movimentacoes)
+
+    def aplicar_alteracoes(self, alteracoes):
+        """
+        Aplica as alterações de um turno e retorna as movimentações atualizadas.
+
+        O custo é proporcional ao tamanho da região afetada pelas alterações, e não ao
+        tamanho do mapa.
+
+        :param alteracoes: Lista de tuplas (território, tropas, dono), no mesmo formato da
+                           lista de tropas. Exemplo: [("Brasil", 3, "vermelho")]
+        :return: Lista de movimentações sugeridas, igual à de `mover_tropas`.
+        :raises TypeError: Se a quantidade de tropas de uma alteração não for um inteiro
+                           (por exemplo, com o dono e as tropas trocados de posição).
+        """
+        # Valida tudo antes de alterar o estado, para não deixar o planejador pela metade
+        for territorio, qtd, dono in alteracoes:
+            if not isinstance(qtd, int) or isinstance(qtd, bool):
+                raise TypeError(f"Alteração inválida para {territorio!r}: as tropas devem ser um inteiro, "
+                                f"no formato (território, tropas, dono)")
+
+        indices = self.mapa.indices
+        inimigo_antes = {}  # ID -> se o território era inimigo antes do turno
+        alterados = set()  # IDs cujo dono ou tropas mudaram
+
+        for territorio, qtd, dono in alteracoes:
+            if territorio not in self.posicao:
+                self.posicao[territorio] = len(self.posicao)  # Território novo vai para o fim da ordem
+
+            indice = indices.get(territorio)
+            if indice is not None and indice not in inimigo_antes:
+                inimigo_antes[indice] = self._eh_inimigo(indice)
+
+            self.estado.atualizar_territorio(territorio, dono, qtd)
+            if indice is not None:
+                alterados.add(indice)
+
+        # Separa os territórios que deixaram de ser inimigos dos que passaram a ser
+        origens_removidas = [i for i, era in inimigo_antes.items() if era and not self._eh_inimigo(i)]
+        origens_novas = [i for i, era in inimigo_antes.items() if not era and self._eh_inimigo(i)]
+
+        distancias_alteradas = self._remover_origens(origens_removidas)
+        distancias_alteradas |= self._adicionar_origens(origens_novas)
+
+        # O destino de um território depende dele mesmo e de seus vizinhos
+        afetados = set()
+        adjacencia = self.mapa.adjacencia
+        for indice in alterados | distancias_alteradas:
+            afetados.add(indice)
+            afetados.update(adjacencia[indice])
+
+        for indice in afetados:
+            self._atualizar_destino(indice)
+
+        return self.movimentacoes()
+
+    def _eh_inimigo(self, indice):
+        """Verifica se o território de ID `indice` pertence a outro jogador."""
+        dono = self.estado.dono_por_id[indice]
+        return dono is not SEM_DONO and dono != self.cor
+
+    def _atualizar_destino(self, indice):
+        """Recalcula o destino escolhido para o território de ID `indice`."""
+        territorio = self.mapa.nomes[indice]
+        if territorio not in self.posicao:
+            return  # Território sem dono nunca tem movimentação
+
+        destino = None
+        if self.estado.pertence_a(territorio, self.cor):
+            destino = escolher_destino(self.estado, self.cor, indice, self.distancias)
+
+        posicao = self.posicao[territorio]
+        k = bisect.bisect_left(self._posicoes, posicao)
+        existe = k < len(self._posicoes) and self._posicoes[k] == posicao
+
+        if destino and existe:
+            self._movimentacoes[k] = (territorio, destino)
+        elif destino:
+            self._posicoes.insert(k, posicao)
+            self._movimentacoes.insert(k, (territorio, destino))
+        elif existe:
+            del self._posicoes[k]
+            del self._movimentacoes[k]
+
+    def _remover_origens(self, origens):
+        """
+        Corrige o campo de distâncias depois que alguns territórios deixaram de ser inimigos.
+
+        Primeiro marca como inválidos os territórios cuja distância dependia apenas das
+        origens removidas (nenhum vizinho válido a uma distância menor). Depois recalcula
+        só esses territórios, partindo da fronteira com a região que continuou válida.
+
+        :param origens: IDs dos territórios que deixaram de ser inimigos.
+        :return: Conjunto de IDs cuja distância mudou.
+        """
+        if not origens:
+            return set()
+
+        infinito = float('inf')
+        adjacencia = self.mapa.adjacencia
+        distancias = self.distancias
+
+        # Fase 1: encontra os territórios que perderam o caminho mais curto até um inimigo.
+        # A fila é percorrida em ordem crescente de distância, então todo território
+        # invalidado reavalia os vizinhos que podiam depender dele.
+        invalidos = set(origens)
+        fila = deque(origens)
+        while fila:
+            atual = fila.popleft()
+            proxima_distancia = distancias[atual] + 1
+            for vizinho in adjacencia[atual]:
+                if vizinho in invalidos or distancias[vizinho] != proxima_distancia:
+                    continue
+
+                # Continua válido se ainda houver um vizinho válido uma distância antes
+                apoiado = any(distancias[x] == distancias[vizinho] - 1 and x not in invalidos
+                              for x in adjacencia[vizinho])
+                if not apoiado:
+                    invalidos.add(vizinho)
+                    fila.append(vizinho)
+
+        # Fase 2: recalcula os inválidos a partir dos vizinhos que continuaram válidos
+        antigas = {i: distancias[i] for i in invalidos}
+        heap = []
+        for indice in invalidos:
+            distancias[indice] = min((distancias[x] + 1 for x in adjacencia[indice] if x not in invalidos),
+                                     default=infinito)
+            if distancias[indice] != infinito:
+                heap.append((distancias[indice], indice))
+        heapq.heapify(heap)
+
+        while heap:
+            distancia, atual = heapq.heappop(heap)
+            if distancia > distancias[atual]:
+                continue  # Entrada desatualizada do heap
+            for vizinho in adjacencia[atual]:
+                if vizinho in invalidos and distancias[vizinho] > distancia + 1:
+                    distancias[vizinho] = distancia + 1
+                    heapq.heappush(heap, (distancia + 1, vizinho))
+
+        return {i for i, antiga in antigas.items() if distancias[i] != antiga}
+
+    def _adicionar_origens(self, origens):
+        """
+        Corrige o campo de distâncias depois que alguns territórios passaram a ser inimigos.
+
+        Faz uma BFS a partir das novas origens que só avança enquanto encontra distâncias
+        menores do que as já conhecidas.
+
+        :param origens: IDs dos territórios que passaram a ser inimigos.
+        :return: Conjunto de IDs cuja distância mudou.
+        """
+        adjacencia = self.mapa.adjacencia
+        distancias = self.distancias
+        alteradas = set()
+
+        fila = deque()
+        for indice in origens:
+            if distancias[indice] != 0:
+                distancias[indice] = 0
+                alteradas.add(indice)
+                fila.append(indice)
+
+        while fila:
+            atual = fila.popleft()
+            proxima_distancia = distancias[atual] + 1
+            for vizinho in adjacencia[atual]:
+                if distancias[vizinho] > proxima_distancia:
+                    distancias[vizinho] = proxima_distancia
+                    alteradas.add(vizinho)
+                    fila.append(vizinho)
+
+        return alteradas
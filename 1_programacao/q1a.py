@@ -1,3 +1,11 @@
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, o caminho vetorizado para buffers não fica disponível
+    np = None
+
+
 def deslocar_caractere(char: str, deslocamento: int, base: int) -> str:
     """
     Desloca um caractere dentro do intervalo do alfabeto (maiúsculo ou minúsculo),
@@ -19,6 +27,31 @@ def deslocar_caractere(char: str, deslocamento: int, base: int) -> str:
 def cifra(texto: str, deslocamento: int) -> str:
     """
     Aplica a Cifra de César a um texto, deslocando as letras do alfabeto pelo número especificado.
+
+    Usa tabelas de tradução pré-calculadas, que percorrem o texto em C em vez de um
+    caractere por vez em Python. Textos ASCII usam `str.translate` diretamente. Os demais
+    passam por UTF-8 e `bytes.translate`, que é bem mais rápido nesse caso: os bytes de um
+    caractere não ASCII em UTF-8 nunca são letras ASCII, então ficam intactos. O resultado é
+    o mesmo de `cifra_caractere_a_caractere`.
+    
+    Parâmetros:
+    texto (str): A mensagem a ser cifrada ou decifrada.
+    deslocamento (int): O número de posições que cada letra será deslocada.
+    
+    Retorna:
+    str: O texto transformado pela cifra.
+    """
+    if texto.isascii():
+        return texto.translate(tabela_traducao(deslocamento))
+
+    # "surrogatepass" preserva até surrogates isolados na ida e na volta
+    dados = texto.encode('utf-8', 'surrogatepass')
+    return dados.translate(tabela_bytes(deslocamento)).decode('utf-8', 'surrogatepass')
+
+
+def cifra_caractere_a_caractere(texto: str, deslocamento: int) -> str:
+    """
+    Implementação de referência da Cifra de César, um caractere por vez.
     
     Parâmetros:
     texto (str): A mensagem a ser cifrada ou decifrada.
@@ -42,4 +75,96 @@ def cifra(texto: str, deslocamento: int) -> str:
         
         resultado.append(novo_char)  # Adiciona o caractere modificado a lista
     
-    return ''.join(resultado)  # Retorna a lista como uma string
\ No newline at end of file
+    return ''.join(resultado)  # Retorna a lista como uma string
+
+
+@lru_cache(maxsize=26)
+def _tabelas_para(deslocamento: int) -> tuple:
+    """
+    Monta (uma única vez por deslocamento) as tabelas de tradução da cifra.
+
+    Parâmetros:
+    deslocamento (int): Deslocamento já reduzido ao intervalo [0, 25].
+
+    Retorna:
+    tuple: (tabela para str.translate, tabela de 256 bytes para bytes.translate).
+    """
+    traducao_bytes = bytearray(range(256))  # Identidade: bytes que não são letras ficam iguais
+    for base in (ord('A'), ord('a')):
+        for codigo in range(base, base + 26):
+            traducao_bytes[codigo] = ord(deslocar_caractere(chr(codigo), deslocamento, base))
+
+    # Para textos, só as 52 letras ASCII mudam; os demais caracteres (inclusive não ASCII) são mantidos
+    tabela_texto = {codigo: traducao_bytes[codigo] for codigo in range(128) if traducao_bytes[codigo] != codigo}
+    return tabela_texto, bytes(traducao_bytes)
+
+
+def tabela_traducao(deslocamento: int) -> dict:
+    """
+    Retorna a tabela de tradução para `str.translate`, em cache por deslocamento.
+
+    Parâmetros:
+    deslocamento (int): O número de posições que cada letra será deslocada (aceita negativos).
+
+    Retorna:
+    dict: Mapeamento {código do caractere: código do caractere cifrado}.
+    """
+    return _tabelas_para(deslocamento % 26)[0]
+
+
+def tabela_bytes(deslocamento: int) -> bytes:
+    """
+    Retorna a tabela de 256 entradas para `bytes.translate`, em cache por deslocamento.
+
+    Parâmetros:
+    deslocamento (int): O número de posições que cada letra será deslocada (aceita negativos).
+
+    Retorna:
+    bytes: Tabela em que a posição i tem o byte cifrado correspondente ao byte i.
+    """
+    return _tabelas_para(deslocamento % 26)[1]
+
+
+def cifra_bytes(dados: bytes, deslocamento: int) -> bytes:
+    """
+    Aplica a Cifra de César a um buffer de bytes com `bytes.translate`.
+
+    Apenas os bytes das letras ASCII mudam; qualquer outro byte (inclusive os que fazem
+    parte de caracteres UTF-8 com mais de um byte) é mantido, então decodificar o
+    resultado como UTF-8 dá o mesmo que `cifra` aplicada ao texto.
+
+    Parâmetros:
+    dados (bytes): O buffer a ser cifrado (bytes, bytearray ou memoryview).
+    deslocamento (int): O número de posições que cada letra será deslocada.
+
+    Retorna:
+    bytes: O buffer transformado pela cifra (bytearray se a entrada for bytearray).
+    """
+    if isinstance(dados, memoryview):
+        dados = dados.tobytes()  # memoryview não tem translate
+    return dados.translate(tabela_bytes(deslocamento))
+
+
+def cifra_numpy(dados, deslocamento: int, saida=None):
+    """
+    Aplica a Cifra de César a um array NumPy de uint8 com uma consulta vetorizada à tabela.
+
+    Parâmetros:
+    dados (numpy.ndarray ou bytes): Buffer de bytes (convertido para uint8 sem cópia quando possível).
+    deslocamento (int): O número de posições que cada letra será deslocada.
+    saida (numpy.ndarray): Array uint8 opcional, do mesmo tamanho, que recebe o resultado
+                           (pode ser o próprio `dados`, para cifrar no lugar).
+
+    Retorna:
+    numpy.ndarray: Array uint8 com o buffer transformado pela cifra.
+    """
+    if np is None:
+        raise ImportError("cifra_numpy precisa do NumPy instalado")
+
+    buffer = dados if isinstance(dados, np.ndarray) else np.frombuffer(dados, dtype=np.uint8)
+    if buffer.dtype != np.uint8:
+        raise TypeError("cifra_numpy espera um array de uint8")
+
+    tabela = np.frombuffer(tabela_bytes(deslocamento), dtype=np.uint8)
+    # Índices uint8 estão sempre entre 0 e 255, então mode="clip" não altera nada e evita a cópia extra de "raise"
+    return np.take(tabela, buffer, out=saida, mode="clip")
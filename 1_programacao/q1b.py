@@ -1,3 +1,13 @@
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, o modo colunar não fica disponível
+    np = None
+
+SUFIXO_VALIDO = "@usp.br"
+
+
 def inverter_string(palavra):
     """
     Inverte uma string manualmente, caractere por caractere.
@@ -65,20 +75,122 @@ def corrigir_email(email):
     email_corrigido = parte_esquerda_invertida + parte_direita_invertida
 
     # Verifica se o domínio está correto
-    if email_corrigido.endswith("@usp.br"):
+    if email_corrigido.endswith(SUFIXO_VALIDO):
         return email_corrigido
     else:
         return "ERRO"
 
 
-def corrige_emails(emails):
+def corrigir_email_rapido(email):
+    """
+    Mesma correção de `corrigir_email`, invertendo as metades com fatiamento.
+
+    `palavra[::-1]` é feito em C de uma só vez, em vez de concatenar um caractere por vez.
+
+    :param email: E-mail embaralhado.
+    :return: E-mail corrigido ou "ERRO" se o domínio estiver incorreto.
+    """
+    metade = len(email) // 2
+    email_corrigido = email[:metade][::-1] + email[metade:][::-1]
+    return email_corrigido if email_corrigido.endswith(SUFIXO_VALIDO) else "ERRO"
+
+
+def corrige_emails_colunar(emails):
+    """
+    Corrige um array inteiro de e-mails de uma só vez com NumPy.
+
+    Os e-mails viram uma matriz de caracteres (um e-mail por linha, em UTF-32 de largura
+    fixa). Para cada posição j da saída é calculada a posição de origem no e-mail
+    embaralhado, e todos os caracteres são copiados com uma única indexação. O sufixo
+    "@usp.br" também é verificado em bloco, comparando os últimos caracteres de cada linha.
+
+    O tipo de string do NumPy descarta caracteres nulos ("\x00") no fim e converteria
+    qualquer valor em texto. Por isso, elementos que não são `str` ou que terminam em "\x00"
+    passam por `corrigir_email_rapido`, um a um: o resultado (ou a exceção, para valores
+    como None) é o mesmo de `corrigir_email`.
+
+    :param emails: Lista ou array NumPy de e-mails embaralhados.
+    :return: Lista de e-mails corrigidos ou "ERRO", igual à de `corrige_emails`.
+    """
+    if np is None:
+        raise ImportError("corrige_emails_colunar precisa do NumPy instalado")
+
+    if isinstance(emails, np.ndarray) and emails.dtype.kind == "U":
+        return _corrigir_matriz(emails.ravel())
+
+    emails = list(emails)
+    especiais = {i: corrigir_email_rapido(email) for i, email in enumerate(emails)
+                 if not isinstance(email, str) or email.endswith("\x00")}
+    if not especiais:
+        return _corrigir_matriz(np.asarray(emails, dtype=str))
+
+    resultado = _corrigir_matriz(np.asarray(["" if i in especiais else email for i, email in enumerate(emails)],
+                                            dtype=str))
+    for i, corrigido in especiais.items():
+        resultado[i] = corrigido
+    return resultado
+
+
+def _corrigir_matriz(textos):
+    """
+    Parte vetorizada de `corrige_emails_colunar`, sobre um array de strings do NumPy.
+
+    :param textos: Array NumPy unidimensional de strings (dtype "U").
+    :return: Lista de e-mails corrigidos ou "ERRO".
+    """
+    if textos.size == 0:
+        return []
+
+    largura = textos.dtype.itemsize // 4  # Maior e-mail, em caracteres
+    caracteres = textos.view(np.uint32).reshape(len(textos), largura)
+    tamanhos = np.char.str_len(textos).astype(np.int32)[:, None]  # int32 reduz a memória das matrizes de índices
+    metades = tamanhos // 2
+
+    # Posição de origem de cada caractere: a metade esquerda e a direita, cada uma invertida
+    posicoes = np.arange(largura, dtype=np.int32)[None, :]
+    origem = np.where(posicoes < metades, metades - 1 - posicoes, tamanhos - 1 - posicoes + metades)
+    np.clip(origem, 0, largura - 1, out=origem)  # Posições além do fim do e-mail (preenchimento)
+    corrigidos = np.take_along_axis(caracteres, origem, axis=1)
+    corrigidos[posicoes >= tamanhos] = 0  # Mantém o preenchimento nulo depois do fim
+
+    # Verificação do sufixo em bloco: compara os últimos caracteres de cada e-mail corrigido
+    sufixo = np.frombuffer(SUFIXO_VALIDO.encode("utf-32-le"), dtype=np.uint32)
+    validos = tamanhos[:, 0] >= len(sufixo)
+    finais = np.clip(tamanhos - len(sufixo) + np.arange(len(sufixo), dtype=np.int32)[None, :], 0, largura - 1)
+    validos &= (np.take_along_axis(corrigidos, finais, axis=1) == sufixo).all(axis=1)
+
+    resultado = corrigidos.view(textos.dtype).ravel()
+    return np.where(validos, resultado, "ERRO").tolist()
+
+
+def _corrigir_bloco(emails, modo):
+    """Corrige um bloco de e-mails; executada em cada processo do pool."""
+    if modo == "numpy":
+        return corrige_emails_colunar(emails)
+    return [corrigir_email_rapido(email) for email in emails]
+
+
+def corrige_emails(emails, modo="python", workers=0, tamanho_bloco=100_000):
     """
     Corrige uma lista de e-mails embaralhados.
 
-    Para cada e-mail na lista, aplica a função `corrigir_email` e retorna uma lista
+    Para cada e-mail na lista, aplica a mesma correção de `corrigir_email` e retorna uma lista
     com os e-mails corrigidos ou "ERRO" para e-mails com domínio incorreto.
 
     :param emails: Lista de e-mails embaralhados.
+    :param modo: "python" (fatiamento, um e-mail por vez) ou "numpy" (`corrige_emails_colunar`).
+    :param workers: Número de processos. Com mais de 1, a lista é dividida em blocos de
+                    `tamanho_bloco` e cada bloco é corrigido em um processo do pool.
+    :param tamanho_bloco: Número de e-mails por bloco no modo com processos.
     :return: Lista de e-mails corrigidos ou "ERRO".
     """
-    return [corrigir_email(email) for email in emails]
\ No newline at end of file
+    if modo not in ("python", "numpy"):
+        raise ValueError(f"Modo desconhecido: {modo!r} (use 'python' ou 'numpy')")
+
+    if workers <= 1:
+        return _corrigir_bloco(emails, modo)
+
+    emails = list(emails)
+    blocos = [emails[i:i + tamanho_bloco] for i in range(0, len(emails), tamanho_bloco)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [email for bloco in pool.map(_corrigir_bloco, blocos, [modo] * len(blocos)) for email in bloco]
\ No newline at end of file
@@ -1,3 +1,16 @@
+import csv
+import json
+import operator
+import os
+import struct
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, apenas as listas de episódios são aceitas
+    np = None
+
 def organiza_listas(qtd_projetos, episodios, min_passos):
     """
     Organiza os episódios dos projetos, verificando ordem cronológica e filtrando por duração mínima.
@@ -20,6 +33,128 @@ def organiza_listas(qtd_projetos, episodios, min_passos):
     return ("sim" if pelo_menos_um_valido else "nao", resultado)
 
 
+def organiza_listas_colunar(qtd_projetos, episodios, min_passos):
+    """
+    Versão vetorizada de `organiza_listas` para episódios em formato colunar do NumPy.
+
+    A entrada colunar precisa ser pedida explicitamente: `organiza_listas` continua tratando
+    qualquer entrada (inclusive arrays e tuplas de arrays) como uma sequência de episódios.
+
+    Parâmetros:
+        qtd_projetos (int): Número total de projetos.
+        episodios: Array estruturado, array inteiro de forma (n, 3) ou tupla com três arrays
+            paralelos (id_projeto, indice, passos).
+        min_passos (int): Número mínimo de passos para considerar um projeto válido.
+
+    Retorno:
+        tuple: ("sim" ou "nao", lista com um array (k, 3) de episódios por projeto).
+    """
+    if np is None:
+        raise ImportError("organiza_listas_colunar requer o NumPy")
+
+    return _organiza_listas_colunar(qtd_projetos, *_extrair_colunas(episodios), min_passos)
+
+
+def _extrair_colunas(episodios):
+    """
+    Extrai as colunas (id_projeto, indice, passos) de episódios em formato colunar do NumPy.
+
+    Parâmetros:
+        episodios: Array estruturado, array de forma (n, 3) ou tupla com três arrays.
+
+    Retorno:
+        tuple: (id_projeto, indice, passos) como arrays int64.
+    """
+    if isinstance(episodios, np.ndarray):
+        if episodios.dtype.names:
+            # Array estruturado: usa os campos pelo nome, ou os três primeiros campos
+            nomes = episodios.dtype.names
+            if all(nome in nomes for nome in ("id_projeto", "indice", "passos")):
+                nomes = ("id_projeto", "indice", "passos")
+            colunas = [episodios[nome] for nome in nomes[:3]]
+        elif episodios.ndim == 2 and episodios.shape[1] == 3:
+            colunas = [episodios[:, 0], episodios[:, 1], episodios[:, 2]]
+        else:
+            raise ValueError("Array de episódios deve ser estruturado ou ter forma (n, 3)")
+    elif isinstance(episodios, tuple) and len(episodios) == 3 and all(isinstance(c, np.ndarray) for c in episodios):
+        colunas = list(episodios)
+    else:
+        raise TypeError("Episódios colunares devem ser um array do NumPy ou uma tupla com três arrays")
+
+    # Só tipos inteiros que cabem em int64: floats seriam truncados em silêncio na conversão
+    for coluna in colunas:
+        if not (np.issubdtype(coluna.dtype, np.integer) and np.can_cast(coluna.dtype, np.int64)):
+            raise TypeError(f"Colunas de episódios devem ter tipo inteiro (recebido {coluna.dtype})")
+
+    return tuple(np.asarray(coluna, dtype=np.int64) for coluna in colunas)
+
+
+def _organiza_listas_colunar(qtd_projetos, id_projeto, indice, passos, min_passos):
+    """
+    Versão vetorizada de `organiza_listas` para episódios em arrays NumPy paralelos.
+
+    Os episódios são ordenados por projeto com uma ordenação estável, que mantém a ordem
+    original dentro de cada projeto. A verificação cronológica vira um teste de
+    "não decrescente dentro do projeto" sobre diferenças consecutivas, e os totais de
+    passos saem de um único `bincount`.
+
+    Cada projeto do resultado é uma fatia (view, sem cópia) de um array int64 (n, 3) com os
+    episódios ordenados por projeto; `fatia.tolist()` dá a mesma lista de episódios de
+    `organiza_listas`. Projetos não válidos (ou todos, se a ordem cronológica for inválida)
+    recebem um array int64 vazio de forma (0, 3).
+
+    Parâmetros:
+        qtd_projetos (int): Número total de projetos.
+        id_projeto (numpy.ndarray): Projeto de cada episódio.
+        indice (numpy.ndarray): Índice cronológico de cada episódio.
+        passos (numpy.ndarray): Número de passos de cada episódio.
+        min_passos (int): Número mínimo de passos para considerar um projeto válido.
+
+    Retorno:
+        tuple: ("sim" ou "nao", lista com uma fatia de episódios por projeto).
+    """
+    if not len(id_projeto) == len(indice) == len(passos):
+        raise ValueError("As colunas id_projeto, indice e passos devem ter o mesmo tamanho")
+
+    ordem = np.argsort(id_projeto, kind="stable")
+    projeto_ordenado = id_projeto[ordem]
+    indice_ordenado = indice[ordem]
+
+    # Posição (na entrada) de cada episódio que volta no tempo dentro do seu projeto
+    mesmo_projeto = projeto_ordenado[1:] == projeto_ordenado[:-1]
+    volta_no_tempo = mesmo_projeto & (indice_ordenado[1:] < indice_ordenado[:-1])
+    primeira_violacao = ordem[1:][volta_no_tempo].min() if volta_no_tempo.any() else len(ordem)
+
+    # `organiza_listas` levanta KeyError no primeiro projeto inexistente, se ele vier antes de uma violação
+    fora_da_faixa = np.flatnonzero((id_projeto < 1) | (id_projeto > qtd_projetos))
+    if fora_da_faixa.size and fora_da_faixa[0] < primeira_violacao:
+        raise KeyError(int(id_projeto[fora_da_faixa[0]]))
+
+    if primeira_violacao < len(ordem):
+        vazio = np.empty((0, 3), dtype=np.int64)
+        return "nao", [vazio[:] for _ in range(qtd_projetos)]
+
+    # Totais por projeto com um único bincount. Os pesos viram float64, que só é exato
+    # até 2^53; acima disso, soma em int64 com np.add.at.
+    if np.abs(passos).sum() < 2 ** 53:
+        totais = np.bincount(id_projeto, weights=passos, minlength=qtd_projetos + 1).astype(np.int64)
+    else:
+        totais = np.zeros(qtd_projetos + 1, dtype=np.int64)
+        np.add.at(totais, id_projeto, passos)
+
+    # Fronteiras de cada projeto no array ordenado
+    contagens = np.bincount(id_projeto, minlength=qtd_projetos + 1)
+    fins = np.cumsum(contagens)
+    inicios = fins - contagens
+    ordenados = np.column_stack((projeto_ordenado, indice_ordenado, passos[ordem]))
+
+    validos = totais[1:] >= min_passos
+    resultado = [ordenados[inicios[p]:fins[p]] if validos[p - 1] else ordenados[:0]
+                 for p in range(1, qtd_projetos + 1)]
+
+    return ("sim" if validos.any() else "nao", resultado)
+
+
 def _inicializar_estruturas(qtd_projetos):
     """
     Inicializa as estruturas de dados necessárias.
@@ -83,4 +218,244 @@ def _filtrar_projetos(qtd_projetos, projetos, min_passos):
         else:
             resultado.append([])
     
-    return resultado, pelo_menos_um_valido
\ No newline at end of file
+    return resultado, pelo_menos_um_valido
+
+
+def organiza_listas_streaming(qtd_projetos, episodios, min_passos, formato=None):
+    """
+    Versão em streaming de `organiza_listas`, com memória limitada pelo número de projetos.
+
+    A primeira passada lê os episódios um a um e guarda apenas, para cada projeto, o total
+    de passos e o último índice visto (em arrays compactos de inteiros de 64 bits). Ela
+    para no primeiro episódio fora de ordem cronológica. A segunda passada emite apenas os
+    episódios dos projetos que atingiram `min_passos`.
+
+    Se `episodios` for um caminho de arquivo, a segunda passada relê o arquivo. Se for um
+    iterador, os episódios são gravados em um arquivo temporário durante a primeira passada
+    (3 inteiros de 64 bits por episódio) e relidos dele.
+
+    Os episódios são emitidos na ordem de entrada, e não agrupados por projeto: agrupar
+    exigiria guardar todos os episódios em memória. Dentro de cada projeto a ordem é a
+    mesma das listas de `organiza_listas`.
+
+    Parâmetros:
+        qtd_projetos (int): Número total de projetos.
+        episodios (iterable ou str): Episódios no formato [id_projeto, indice, passos], ou o
+            caminho de um arquivo CSV (três colunas, cabeçalho opcional) ou NDJSON (uma lista
+            [id_projeto, indice, passos] ou um objeto com essas chaves por linha).
+        min_passos (int): Número mínimo de passos para considerar um projeto válido.
+        formato (str): "csv" ou "ndjson". Se None, é deduzido da extensão do arquivo.
+
+    Retorno:
+        tuple: ("sim" ou "nao", gerador dos episódios dos projetos válidos).
+    """
+    if isinstance(episodios, (str, os.PathLike)):
+        formato = formato or _deduzir_formato(episodios)
+        reler = lambda: _ler_episodios_arquivo(episodios, formato)
+        leitor = reler()
+        try:
+            resposta, totais = _primeira_passada(qtd_projetos, leitor, min_passos)
+        finally:
+            leitor.close()  # Fecha o arquivo mesmo se a passada parar antes do fim
+    elif isinstance(episodios, (list, tuple)):
+        # Já estão em memória: basta percorrer a lista de novo
+        reler = lambda: iter(episodios)
+        resposta, totais = _primeira_passada(qtd_projetos, reler(), min_passos)
+    else:
+        # Iterador de uma única passada: grava os episódios em disco enquanto lê. O arquivo
+        # é fechado (e apagado) se a passada falhar ou parar, ou quando a releitura terminar.
+        arquivo_temporario = tempfile.TemporaryFile()
+        try:
+            resposta, totais = _primeira_passada(qtd_projetos, episodios, min_passos, arquivo_temporario)
+        except BaseException:
+            arquivo_temporario.close()
+            raise
+        if totais is None:
+            arquivo_temporario.close()
+        reler = lambda: _ler_episodios_temporario(arquivo_temporario)
+
+    if totais is None:
+        return "nao", iter(())
+
+    return resposta, _emitir_validos(reler(), totais, min_passos)
+
+
+def _deduzir_formato(caminho):
+    """
+    Deduz o formato de um arquivo de episódios a partir da extensão.
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo.
+
+    Retorno:
+        str: "csv" ou "ndjson".
+    """
+    extensao = os.path.splitext(os.fspath(caminho))[1].lower()
+    if extensao == ".csv":
+        return "csv"
+    if extensao in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Não foi possível deduzir o formato de {caminho!r}; informe formato='csv' ou 'ndjson'")
+
+
+def _ler_episodios_arquivo(caminho, formato):
+    """
+    Lê os episódios de um arquivo CSV ou NDJSON, um por vez.
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo.
+        formato (str): "csv" ou "ndjson".
+
+    Retorno:
+        generator: Episódios no formato [id_projeto, indice, passos].
+
+    Exceções:
+        ValueError: Linha do CSV com valores não inteiros (exceto a primeira, lida como cabeçalho).
+    """
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        if formato == "csv":
+            primeira = True
+            for numero, linha in enumerate(csv.reader(arquivo), start=1):
+                if not linha:
+                    continue
+                try:
+                    episodio = [int(valor) for valor in linha]
+                except ValueError:
+                    if primeira:
+                        primeira = False
+                        continue  # Cabeçalho
+                    raise ValueError(f"Linha {numero} de {caminho!r} inválida: {linha!r} "
+                                     f"(esperado id_projeto,indice,passos com inteiros)") from None
+                primeira = False
+                yield episodio  # O número de colunas é conferido por `_validar_episodio`
+        elif formato == "ndjson":
+            for linha in arquivo:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                registro = json.loads(linha)
+                if isinstance(registro, dict):
+                    registro = [registro["id_projeto"], registro["indice"], registro["passos"]]
+                yield list(registro)
+        else:
+            raise ValueError(f"Formato desconhecido: {formato!r} (use 'csv' ou 'ndjson')")
+
+
+def _ler_episodios_temporario(arquivo_temporario):
+    """
+    Relê os episódios gravados em disco pela primeira passada e fecha o arquivo no final.
+
+    Parâmetros:
+        arquivo_temporario (file): Arquivo binário com 3 inteiros de 64 bits por episódio.
+
+    Retorno:
+        generator: Episódios no formato [id_projeto, indice, passos].
+    """
+    registro = struct.Struct("<qqq")
+    with arquivo_temporario:  # Fecha também se quem consome o gerador parar antes do fim
+        arquivo_temporario.seek(0)
+        while True:
+            bloco = arquivo_temporario.read(registro.size * 4096)
+            if not bloco:
+                break
+            for episodio in registro.iter_unpack(bloco):
+                yield list(episodio)
+
+
+def _primeira_passada(qtd_projetos, episodios, min_passos, arquivo_temporario=None):
+    """
+    Verifica a ordem cronológica e soma os passos de cada projeto sem guardar os episódios.
+
+    Parâmetros:
+        qtd_projetos (int): Número total de projetos.
+        episodios (iterable): Episódios no formato [id_projeto, indice, passos].
+        min_passos (int): Número mínimo de passos para considerar um projeto válido.
+        arquivo_temporario (file): Se informado, cada episódio é gravado nele.
+
+    Retorno:
+        tuple: ("sim" ou "nao", totais), em que totais é None se a ordem cronológica for inválida.
+
+    Exceções:
+        TypeError / ValueError: Episódio que não tem três inteiros de 64 bits.
+        KeyError: Projeto fora de 1..qtd_projetos (o mesmo erro de `organiza_listas`).
+    """
+    totais = array("q", [0]) * (qtd_projetos + 1)  # Índice 0 sem uso (projetos começam em 1)
+    ultima_ordem = array("q", [0]) * (qtd_projetos + 1)
+    visto = bytearray(qtd_projetos + 1)  # 1 se o projeto já teve algum episódio
+
+    registro = struct.Struct("<qqq")
+    buffer = bytearray()
+
+    for posicao, episodio in enumerate(episodios):
+        projeto_id, indice, passos = _validar_episodio(posicao, episodio)
+
+        if not 1 <= projeto_id <= qtd_projetos:
+            raise KeyError(projeto_id)  # Mesmo erro de `organiza_listas` para projetos inexistentes
+
+        if visto[projeto_id] and indice < ultima_ordem[projeto_id]:
+            return "nao", None
+
+        visto[projeto_id] = 1
+        ultima_ordem[projeto_id] = indice
+        totais[projeto_id] += passos
+
+        if arquivo_temporario is not None:
+            buffer += registro.pack(projeto_id, indice, passos)
+            if len(buffer) >= 1 << 20:  # Grava em blocos de ~1 MB
+                arquivo_temporario.write(buffer)
+                buffer.clear()
+
+    if arquivo_temporario is not None:
+        arquivo_temporario.write(buffer)
+
+    pelo_menos_um_valido = any(totais[projeto_id] >= min_passos for projeto_id in range(1, qtd_projetos + 1))
+    return ("sim" if pelo_menos_um_valido else "nao"), totais
+
+
+def _validar_episodio(posicao, episodio):
+    """
+    Confere se um episódio tem três inteiros que cabem em 64 bits.
+
+    Os totais e o arquivo temporário guardam inteiros de 64 bits; sem esta verificação, um
+    valor inválido só apareceria como um erro pouco claro do `array` ou do `struct`.
+
+    Parâmetros:
+        posicao (int): Posição do episódio na entrada (usada na mensagem de erro).
+        episodio: Episódio no formato [id_projeto, indice, passos].
+
+    Retorno:
+        tuple: (id_projeto, indice, passos) como `int`.
+    """
+    try:
+        projeto_id, indice, passos = episodio
+        valores = (operator.index(projeto_id), operator.index(indice), operator.index(passos))
+    except (TypeError, ValueError) as erro:
+        raise type(erro)(f"Episódio {posicao} inválido: {episodio!r} "
+                         f"(esperado [id_projeto, indice, passos] com inteiros)") from None
+
+    if not all(-2 ** 63 <= valor < 2 ** 63 for valor in valores):
+        raise ValueError(f"Episódio {posicao} inválido: {episodio!r} (os valores devem caber em 64 bits)")
+    return valores
+
+
+def _emitir_validos(episodios, totais, min_passos):
+    """
+    Emite apenas os episódios dos projetos que atingiram o mínimo de passos.
+
+    Parâmetros:
+        episodios (iterable): Episódios no formato [id_projeto, indice, passos].
+        totais (array): Total de passos de cada projeto.
+        min_passos (int): Número mínimo de passos para considerar um projeto válido.
+
+    Retorno:
+        generator: Episódios dos projetos válidos, na ordem de entrada.
+    """
+    try:
+        for episodio in episodios:
+            if totais[episodio[0]] >= min_passos:
+                yield episodio
+    finally:
+        # Se quem consome parar antes do fim, fecha o leitor do arquivo (ou o temporário)
+        fechar = getattr(episodios, "close", None)
+        if fechar is not None:
+            fechar()
@@ -1,4 +1,299 @@
-def conta_correcoes(qtd_estados, transicoes, episodio, max_prof):
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, apenas o backend esparso fica disponível
+    np = None
+
+# Fração mínima de transições válidas (em relação a qtd_estados²) para o backend "auto" usar matrizes densas
+DENSIDADE_MINIMA_DENSO = 0.1
+
+
+class ContadorCaminhos:
+    """
+    Conta caminhos válidos entre dois estados, com até `max_prof` estados intermediários.
+
+    O número de caminhos de `origem` a `destino` com até `max_prof` intermediários é a soma,
+    para k de 1 a max_prof + 1, do número de passeios de comprimento k na matriz de
+    transições A, ou seja, a entrada (origem, destino) de A + A² + ... + A^(max_prof + 1).
+
+    A estrutura de transições é montada uma única vez e cada par (origem, destino) é
+    calculado uma única vez; lacunas repetidas reaproveitam o resultado em cache.
+
+    Backends:
+    - "denso": calcula a soma das potências de A com produtos de matrizes NumPy, por
+      duplicação (O(log max_prof) produtos). Usa int64 quando o maior valor possível
+      cabe nele e inteiros Python (dtype=object) caso contrário, então o resultado é
+      sempre exato.
+    - "esparso": programação dinâmica sobre a profundidade, propagando um vetor por
+      destino pelas listas de sucessores (O(max_prof × transições) por destino).
+    - "auto": "denso" se o NumPy estiver instalado e a matriz não for esparsa; senão "esparso".
+
+    Parâmetros:
+    - qtd_estados (int): Número total de estados (numerados de 1 a qtd_estados).
+    - transicoes (dict): Dicionário de transições permitidas {(de, para): 1}.
+    - max_prof (int): Número máximo de passos intermediários permitidos por lacuna.
+    - backend (str): "auto", "denso" ou "esparso".
+    """
+
+    def __init__(self, qtd_estados, transicoes, max_prof, backend="auto"):
+        self.qtd_estados = qtd_estados
+        self.transicoes = transicoes
+        self.max_prof = max(max_prof, 0)  # Profundidade negativa equivale a nenhuma inserção
+        self._estados = range(1, qtd_estados + 1)
+
+        # Listas de adjacência restritas aos estados que podem ser intermediários (1..qtd_estados)
+        self._saidas = {}  # estado -> sucessores válidos dentro da faixa
+        self._entradas = {}  # estado -> predecessores válidos dentro da faixa
+        arestas = 0
+        for (de_estado, para_estado), valor in transicoes.items():
+            if valor != 1:
+                continue
+            if para_estado in self._estados:
+                self._saidas.setdefault(de_estado, []).append(para_estado)
+            if de_estado in self._estados:
+                self._entradas.setdefault(para_estado, []).append(de_estado)
+            if de_estado in self._estados and para_estado in self._estados:
+                arestas += 1
+
+        if backend == "auto":
+            denso = np is not None and arestas >= DENSIDADE_MINIMA_DENSO * qtd_estados * qtd_estados
+            backend = "denso" if denso else "esparso"
+        if backend not in ("denso", "esparso"):
+            raise ValueError(f"Backend desconhecido: {backend!r} (use 'auto', 'denso' ou 'esparso')")
+        if backend == "denso" and np is None:
+            raise ImportError("O backend 'denso' precisa do NumPy instalado")
+        self.backend = backend
+
+        self._cache = {}  # (origem, destino) -> número de caminhos
+        self._acumulados = {}  # destino -> vetor acumulado da programação dinâmica (backend esparso)
+        self._soma_potencias = None  # A + A² + ... + A^(max_prof + 1) (backend denso)
+
+    def transicao_valida(self, de_estado, para_estado):
+        """Verifica se uma transição entre dois estados é permitida."""
+        return self.transicoes.get((de_estado, para_estado), 0) == 1
+
+    def contar(self, origem, destino):
+        """
+        Calcula quantos caminhos válidos existem entre dois estados, inserindo até
+        `max_prof` estados intermediários.
+
+        Parâmetros:
+        - origem: Estado de origem da lacuna.
+        - destino: Estado de destino da lacuna.
+
+        Retorna:
+        - int: Número de caminhos válidos (inteiro Python, sem limite de tamanho).
+        """
+        chave = (origem, destino)
+        if chave not in self._cache:
+            if self.max_prof == 0:
+                caminhos = int(self.transicao_valida(origem, destino))
+            elif self.backend == "denso" and origem in self._estados and destino in self._estados:
+                caminhos = int(self._matriz_soma_potencias()[origem - 1, destino - 1])
+            else:
+                # Estados fora de 1..qtd_estados não entram na matriz: usa a programação dinâmica
+                acumulado = self._acumulado_para(destino)
+                caminhos = int(self.transicao_valida(origem, destino))
+                caminhos += sum(acumulado[estado] for estado in self._saidas.get(origem, []))
+            self._cache[chave] = caminhos
+        return self._cache[chave]
+
+    def _acumulado_para(self, destino):
+        """
+        Programação dinâmica sobre a profundidade para um destino fixo.
+
+        Retorna um vetor em que a posição i é o número de caminhos de i até `destino`
+        com até max_prof - 1 intermediários, ou seja, a soma de (A^j · c)[i] para j de 0 a
+        max_prof - 1, em que c[i] = 1 se a transição i -> destino for válida.
+        """
+        if destino not in self._acumulados:
+            vetor = [0] * (self.qtd_estados + 1)  # Índice 0 não é usado (estados começam em 1)
+            for estado in self._entradas.get(destino, []):
+                vetor[estado] = 1
+            acumulado = list(vetor)
+
+            for _ in range(self.max_prof - 1):
+                # Um passo a mais: caminhos de i = soma dos caminhos de cada sucessor de i
+                vetor = [0] + [sum(vetor[s] for s in self._saidas.get(estado, [])) for estado in self._estados]
+                if not any(vetor):
+                    break  # Nenhum caminho mais longo existe (o grafo não tem ciclos alcançáveis)
+                for estado in self._estados:
+                    acumulado[estado] += vetor[estado]
+
+            self._acumulados[destino] = acumulado
+        return self._acumulados[destino]
+
+    def _matriz_soma_potencias(self):
+        """Calcula (uma única vez) a matriz A + A² + ... + A^(max_prof + 1) com NumPy."""
+        if self._soma_potencias is None:
+            n = self.qtd_estados
+            passos = self.max_prof + 1
+
+            # Nenhuma entrada de A^k passa de n^(k-1), então a soma é limitada por passos × n^max_prof
+            cabe_em_int64 = passos * max(n, 1) ** self.max_prof < 2 ** 62
+            matriz = np.zeros((n, n), dtype=np.int64 if cabe_em_int64 else object)
+            for de_estado, sucessores in self._saidas.items():
+                if de_estado in self._estados:
+                    for para_estado in sucessores:
+                        matriz[de_estado - 1, para_estado - 1] = 1
+
+            self._soma_potencias, _ = _soma_de_potencias(matriz, passos)
+        return self._soma_potencias
+
+
+def _soma_de_potencias(matriz, m):
+    """
+    Calcula (A + A² + ... + A^m, A^m) por duplicação, com O(log m) produtos de matrizes.
+
+    Parâmetros:
+    - matriz (numpy.ndarray): Matriz quadrada A.
+    - m (int): Maior potência da soma (m >= 1).
+
+    Retorna:
+    - tuple: (soma, potencia) com as matrizes A + ... + A^m e A^m.
+    """
+    if m == 1:
+        return matriz, matriz
+    if m % 2 == 0:
+        # S(2k) = S(k) + A^k · S(k)
+        soma, potencia = _soma_de_potencias(matriz, m // 2)
+        return soma + potencia @ soma, potencia @ potencia
+    # S(k + 1) = S(k) + A^(k + 1)
+    soma, potencia = _soma_de_potencias(matriz, m - 1)
+    potencia = potencia @ matriz
+    return soma + potencia, potencia
+
+
+class CorretorEpisodios:
+    """
+    Calcula o número de correções de muitos episódios com a mesma tabela de transições.
+
+    `conta_correcoes` remonta tudo a cada chamada. O corretor é montado uma única vez para
+    uma tabela de transições e já deixa calculado o número de caminhos para todo par de
+    estados (somando todas as profundidades até `max_prof`), então cada episódio custa
+    apenas a detecção das lacunas e consultas à tabela.
+
+    Com NumPy instalado, as lacunas são detectadas de forma vetorizada sobre o episódio
+    inteiro (uma consulta a uma matriz booleana de transições) e as contagens das lacunas
+    são lidas da tabela de uma só vez. Episódios com estados fora de 1..qtd_estados usam
+    o caminho em Python puro, com o mesmo resultado.
+
+    Exemplo:
+        corretor = CorretorEpisodios(qtd_estados, transicoes, max_prof)
+        for correcoes in corretor.corrigir_episodios(episodios):
+            ...
+
+    Parâmetros:
+    - qtd_estados (int): Número total de estados.
+    - transicoes (dict): Dicionário de transições permitidas.
+    - max_prof (int): Número máximo de passos intermediários permitidos por lacuna.
+    - backend (str): Backend do `ContadorCaminhos` ("auto", "denso" ou "esparso").
+    - precalcular (bool): Se True, calcula a tabela de todos os pares na construção;
+      se False, cada par é calculado na primeira vez em que aparece.
+    """
+
+    def __init__(self, qtd_estados, transicoes, max_prof, backend="auto", precalcular=True):
+        self.qtd_estados = qtd_estados
+        self.transicoes = transicoes
+        self.contador = ContadorCaminhos(qtd_estados, transicoes, max_prof, backend)
+
+        self._validas = None  # Matriz booleana (qtd_estados + 1)² de transições válidas (linha/coluna 0 sem uso)
+        self._tabela = None  # Matriz (qtd_estados + 1)² com o número de caminhos de cada par
+        if np is not None:
+            self._validas = np.zeros((qtd_estados + 1, qtd_estados + 1), dtype=bool)
+            for de_estado, sucessores in self.contador._saidas.items():
+                if de_estado in self.contador._estados:
+                    self._validas[de_estado, sucessores] = True
+
+        if precalcular:
+            self._precalcular()
+
+    def _precalcular(self):
+        """Calcula o número de caminhos de todos os pares de estados dentro de 1..qtd_estados."""
+        n = self.qtd_estados
+        if np is None:
+            # Sem NumPy, apenas preenche o cache do contador
+            for origem in range(1, n + 1):
+                for destino in range(1, n + 1):
+                    self.contador.contar(origem, destino)
+            return
+
+        if self.contador.backend == "denso" and self.contador.max_prof > 0:
+            soma_potencias = self.contador._matriz_soma_potencias()
+            self._tabela = np.zeros((n + 1, n + 1), dtype=soma_potencias.dtype)
+            self._tabela[1:, 1:] = soma_potencias
+        else:
+            self._tabela = np.zeros((n + 1, n + 1), dtype=object)
+            for origem in range(1, n + 1):
+                for destino in range(1, n + 1):
+                    self._tabela[origem, destino] = self.contador.contar(origem, destino)
+
+    def encontrar_lacunas(self, episodio):
+        """
+        Identifica todas as transições inválidas consecutivas no episódio.
+
+        Parâmetros:
+        - episodio (list ou numpy.ndarray): Estados registrados no episódio.
+
+        Retorna:
+        - tuple: (origens, destinos) das lacunas, como arrays NumPy quando a detecção
+          vetorizada é possível e como listas caso contrário.
+        """
+        if self._validas is not None:
+            estados = np.asarray(episodio)
+            if (estados.ndim == 1 and estados.size >= 2 and estados.dtype.kind in "iu"
+                    and estados.min() >= 1 and estados.max() <= self.qtd_estados):
+                origens, destinos = estados[:-1], estados[1:]
+                invalidas = ~self._validas[origens, destinos]
+                return origens[invalidas], destinos[invalidas]
+
+        origens, destinos = [], []
+        for i in range(len(episodio) - 1):
+            if not self.contador.transicao_valida(episodio[i], episodio[i + 1]):
+                origens.append(episodio[i])
+                destinos.append(episodio[i + 1])
+        return origens, destinos
+
+    def corrigir(self, episodio):
+        """
+        Calcula o número de correções possíveis para um episódio.
+
+        Parâmetros:
+        - episodio (list ou numpy.ndarray): Estados registrados no episódio.
+
+        Retorna:
+        - int: Mesmo resultado de `conta_correcoes` (-1 sem lacunas, 0 se alguma lacuna for irreparável).
+        """
+        origens, destinos = self.encontrar_lacunas(episodio)
+        if len(origens) == 0:
+            return -1
+
+        if self._tabela is not None and isinstance(origens, np.ndarray):
+            # Todas as contagens das lacunas de uma só vez; tolist() devolve inteiros Python exatos
+            caminhos = self._tabela[origens, destinos].tolist()
+        else:
+            caminhos = [self.contador.contar(origem, destino) for origem, destino in zip(origens, destinos)]
+
+        if 0 in caminhos:
+            return 0
+        return math.prod(caminhos)
+
+    def corrigir_episodios(self, episodios):
+        """
+        Calcula, sob demanda, o número de correções de cada episódio de um iterável.
+
+        Parâmetros:
+        - episodios (iterable): Episódios (listas ou arrays de estados).
+
+        Retorna:
+        - generator: O número de correções de cada episódio, na mesma ordem.
+        """
+        for episodio in episodios:
+            yield self.corrigir(episodio)
+
+
+def conta_correcoes(qtd_estados, transicoes, episodio, max_prof, backend="auto"):
     """
     Calcula o número de correções possíveis para um episódio com lacunas em transições inválidas.
     
@@ -7,6 +302,7 @@ def conta_correcoes(qtd_estados, transicoes, episodio, max_prof):
     - transicoes (dict): Dicionário de transições permitidas.
     - episodio (list): Lista de estados registrados no episódio.
     - max_prof (int): Número máximo de passos intermediários permitidos por lacuna.
+    - backend (str): Backend do `ContadorCaminhos` ("auto", "denso" ou "esparso").
     
     Retorna:
     - int: Número total de correções possíveis, -1 se não houver lacunas, 0 se alguma lacuna for irreparável.
@@ -37,24 +333,6 @@ def conta_correcoes(qtd_estados, transicoes, episodio, max_prof):
         # Retorna a lista de lacunas encontradas no episódio
         return lacunas
 
-    # Função recursiva: conta caminhos válidos entre dois estados com até max_prof passos extras
-    def contar_caminhos(origem, destino, passos_restantes):
-        """Calcula quantos caminhos válidos existem entre dois estados, 
-        inserindo até `passos_restantes` estados intermediários."""
-        # Caso base: se a transição direta é válida, conta como 1 caminho
-        caminhos = 0
-        if transicao_valida(origem, destino):
-            caminhos += 1
-        
-        # Se ainda há passos restantes, explora intermediários
-        if passos_restantes > 0:
-            for intermediario in range(1, qtd_estados + 1):
-                # Só continua se a transição para o intermediário for válida
-                if transicao_valida(origem, intermediario):
-                    # Chama recursivamente reduzindo os passos restantes
-                    caminhos += contar_caminhos(intermediario, destino, passos_restantes - 1)
-        return caminhos
-
     # Passo 1: Identificar lacunas no episódio
     lacunas = encontrar_lacunas()
     
@@ -62,11 +340,14 @@ def conta_correcoes(qtd_estados, transicoes, episodio, max_prof):
     if not lacunas:
         return -1
     
-    # Passo 2: Calcular correções para cada lacuna
+    # Passo 2: Calcular correções para cada lacuna.
+    # O contador monta as transições uma vez e guarda o resultado de cada par (origem, destino),
+    # então lacunas repetidas não são recalculadas.
+    contador = ContadorCaminhos(qtd_estados, transicoes, max_prof, backend)
     total_correcoes = 1
     for origem, destino in lacunas:
         # Calcula caminhos válidos para esta lacuna
-        caminhos = contar_caminhos(origem, destino, max_prof)
+        caminhos = contador.contar(origem, destino)
         
         # Se alguma lacuna não tem correção, retorna 0
         if caminhos == 0:
@@ -0,0 +1,517 @@
+import argparse
+import asyncio
+import collections
+import collections.abc
+import itertools
+import json
+import numbers
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from desafio import MapaTerritorios, chave_topologia
+from lote import avaliar_bloco
+
+JANELA_PADRAO = 0.002  # Segundos que o primeiro pedido de um lote espera por outros pedidos
+TAMANHO_MAXIMO_LOTE = 64  # Número máximo de pedidos avaliados de uma só vez
+MAX_TOPOLOGIAS = 256  # Topologias guardadas pelo serviço (as mais antigas são descartadas)
+MAX_LATENCIAS = 10_000  # Latências guardadas para o cálculo dos percentis
+
+
+# Classe com as métricas do serviço
+class EstatisticasServico:
+    """
+    Métricas de um `ServicoPlanejamento`, atualizadas a cada pedido.
+
+    As latências (da chegada do pedido até a resposta) são guardadas para os últimos
+    `MAX_LATENCIAS` pedidos, e os percentis são calculados sobre elas.
+    """
+
+    def __init__(self):
+        self.requisicoes = 0  # Pedidos respondidos
+        self.erros = 0  # Pedidos recusados (topologia desconhecida, tropas inválidas) ou que terminaram com exceção
+        self.lotes = 0  # Lotes enviados para avaliação
+        self.profundidade_fila = 0  # Pedidos aguardando avaliação neste momento
+        self.profundidade_maxima = 0  # Maior profundidade da fila já observada
+        self.latencias = collections.deque(maxlen=MAX_LATENCIAS)  # Segundos por pedido
+
+    def percentil(self, p):
+        """
+        Retorna o percentil `p` (0 a 100) das latências recentes, em segundos.
+
+        :param p: Percentil desejado. Exemplo: 99
+        :return: Latência em segundos ou 0.0 se ainda não houver pedidos.
+        """
+        if not self.latencias:
+            return 0.0
+        ordenadas = sorted(self.latencias)
+        posicao = min(len(ordenadas) - 1, int(round(p / 100 * (len(ordenadas) - 1))))
+        return ordenadas[posicao]
+
+    @property
+    def tamanho_medio_lote(self):
+        """Número médio de pedidos por lote."""
+        return self.requisicoes / self.lotes if self.lotes else 0.0
+
+    def resumo(self):
+        """Retorna as métricas em um dicionário pronto para JSON, com as latências em milissegundos."""
+        return {
+            "requisicoes": self.requisicoes,
+            "erros": self.erros,
+            "lotes": self.lotes,
+            "tamanho_medio_lote": self.tamanho_medio_lote,
+            "profundidade_fila": self.profundidade_fila,
+            "profundidade_maxima": self.profundidade_maxima,
+            "latencia_p50_ms": 1000 * self.percentil(50),
+            "latencia_p95_ms": 1000 * self.percentil(95),
+            "latencia_p99_ms": 1000 * self.percentil(99),
+        }
+
+    def __repr__(self):
+        return (f"EstatisticasServico(requisicoes={self.requisicoes}, lotes={self.lotes}, "
+                f"profundidade_fila={self.profundidade_fila}, p50={1000 * self.percentil(50):.2f} ms, "
+                f"p99={1000 * self.percentil(99):.2f} ms)")
+
+
+# Classe do serviço assíncrono de planejamento
+class ServicoPlanejamento:
+    """
+    Serviço assíncrono que atende pedidos de `mover_tropas` em micro-lotes.
+
+    Os pedidos entram em uma fila. O primeiro pedido de um lote espera até `janela`
+    segundos pelos seguintes (ou até o lote ter `tamanho_maximo_lote` pedidos), e o lote
+    inteiro é avaliado de uma vez por `lote.avaliar_bloco`, que reaproveita o
+    `MapaTerritorios` já construído para cada topologia. Com `workers` > 0 os lotes vão
+    para um pool de processos, cada um com o seu cache de mapas; com `workers` = 0 são
+    avaliados em uma thread do próprio processo, sem bloquear o laço de eventos.
+
+    No máximo `2 * max(workers, 1)` lotes ficam em avaliação ao mesmo tempo; os pedidos
+    seguintes esperam na fila, cuja profundidade aparece nas estatísticas.
+
+    Exemplo (no próprio processo):
+        async with ServicoPlanejamento(workers=2) as servico:
+            movimentacoes = await servico.mover_tropas("azul", vizinhos, tropas)
+
+    Exemplo (socket local):
+        python servico.py --porta 8765 --workers 2
+
+    :param workers: Número de processos do pool; 0 avalia em uma thread do próprio processo.
+    :param janela: Tempo máximo, em segundos, que um pedido espera para formar um lote.
+    :param tamanho_maximo_lote: Número máximo de pedidos por lote.
+    """
+
+    def __init__(self, workers=0, janela=JANELA_PADRAO, tamanho_maximo_lote=TAMANHO_MAXIMO_LOTE):
+        if tamanho_maximo_lote < 1:
+            raise ValueError("tamanho_maximo_lote deve ser pelo menos 1")
+
+        self.workers = workers
+        self.janela = janela
+        self.tamanho_maximo_lote = tamanho_maximo_lote
+        self.estatisticas = EstatisticasServico()
+
+        self._fila = None
+        self._executor = None
+        self._limite_lotes = None
+        self._coletor = None
+        self._em_avaliacao = set()  # Tarefas dos lotes em avaliação
+
+        # Topologias conhecidas: chave -> cópia imutável dos pares, da menos para a mais recente
+        self._topologias = collections.OrderedDict()
+
+    async def iniciar(self):
+        """Cria a fila, o executor e a tarefa que forma os lotes."""
+        if self._coletor is not None:
+            return
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._fila = asyncio.Queue()
+        self._limite_lotes = asyncio.Semaphore(2 * max(self.workers, 1))
+        self._coletor = asyncio.create_task(self._coletar_lotes())
+
+    async def encerrar(self):
+        """Espera os lotes em avaliação, cancela os pedidos ainda na fila e encerra o executor."""
+        if self._coletor is None:
+            return
+        self._coletor.cancel()
+        try:
+            await self._coletor
+        except asyncio.CancelledError:
+            pass
+        self._coletor = None
+
+        if self._em_avaliacao:
+            await asyncio.gather(*self._em_avaliacao, return_exceptions=True)
+        while not self._fila.empty():
+            *_, futuro, _ = self._fila.get_nowait()
+            if not futuro.done():
+                futuro.cancel()
+        self.estatisticas.profundidade_fila = 0
+
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.encerrar()
+
+    def registrar_topologia(self, vizinhos):
+        """
+        Registra uma topologia e retorna a sua chave.
+
+        Depois de registrada, a topologia pode ser pedida só pela chave (o que evita enviar
+        a lista de vizinhos inteira a cada pedido pelo socket).
+
+        Uma lista é identificada pelo conteúdo, então uma lista alterada no lugar depois do
+        primeiro pedido gera outra chave. Um `MapaTerritorios` já traz a chave calculada.
+
+        :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios`.
+        :return: Chave da topologia (`desafio.chave_topologia`).
+        """
+        if isinstance(vizinhos, MapaTerritorios):
+            chave, pares = vizinhos.chave, vizinhos.vizinhos
+        else:
+            chave, pares = chave_topologia(vizinhos), None
+
+        if chave in self._topologias:
+            self._topologias.move_to_end(chave)
+        else:
+            # Cópia dos pares: a lista de quem pediu pode mudar enquanto o pedido espera na fila
+            self._topologias[chave] = pares if pares is not None else tuple(tuple(par) for par in vizinhos)
+            if len(self._topologias) > MAX_TOPOLOGIAS:
+                self._topologias.popitem(last=False)
+        return chave
+
+    async def mover_tropas(self, cor, vizinhos=None, tropas=None, chave=None):
+        """
+        Pede as movimentações de um tabuleiro, como `desafio.mover_tropas`.
+
+        :param cor: Cor do jogador.
+        :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios`.
+        :param tropas: Lista de tuplas contendo (território, tropas, dono).
+        :param chave: Chave de uma topologia já registrada, no lugar de `vizinhos`.
+        :return: Lista de movimentações sugeridas.
+        :raises KeyError: Se a chave não for de uma topologia registrada.
+        :raises TypeError / ValueError: Se a cor ou as tropas não tiverem o formato de `desafio.mover_tropas`.
+        """
+        if self._coletor is None:
+            raise RuntimeError("O serviço não foi iniciado")
+
+        # `desafio.mover_tropas` trata os próprios erros e devolve [], então os pedidos
+        # inválidos são recusados (e contados) aqui, antes de entrar na fila
+        try:
+            if vizinhos is not None:
+                chave = self.registrar_topologia(vizinhos)
+            elif chave not in self._topologias:
+                raise KeyError(f"Topologia desconhecida: {chave}")
+            _validar_tropas(cor, tropas)
+        except Exception:
+            self.estatisticas.erros += 1
+            raise
+
+        # O pedido leva a própria topologia, que pode sair do cache enquanto espera na fila
+        futuro = asyncio.get_running_loop().create_future()
+        self._fila.put_nowait((cor, chave, self._topologias[chave], tropas, futuro, time.perf_counter()))
+        self._atualizar_profundidade()
+        return await futuro
+
+    def _atualizar_profundidade(self):
+        estatisticas = self.estatisticas
+        estatisticas.profundidade_fila = self._fila.qsize()
+        estatisticas.profundidade_maxima = max(estatisticas.profundidade_maxima, estatisticas.profundidade_fila)
+
+    async def _coletar_lotes(self):
+        """Tarefa permanente: forma os lotes a partir da fila e os envia para avaliação."""
+        laco = asyncio.get_running_loop()
+        while True:
+            await self._limite_lotes.acquire()  # Só forma um lote quando houver vaga para avaliá-lo
+            pedidos = []
+            try:
+                pedidos.append(await self._fila.get())
+                prazo = laco.time() + self.janela
+
+                while len(pedidos) < self.tamanho_maximo_lote:
+                    if not self._fila.empty():
+                        pedidos.append(self._fila.get_nowait())
+                        continue
+                    restante = prazo - laco.time()
+                    if restante <= 0:
+                        break
+                    try:
+                        pedidos.append(await asyncio.wait_for(self._fila.get(), restante))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException:
+                # Encerramento: os pedidos já retirados da fila não serão avaliados
+                for *_, futuro, _ in pedidos:
+                    if not futuro.done():
+                        futuro.cancel()
+                self._limite_lotes.release()
+                raise
+
+            self._atualizar_profundidade()
+            tarefa = asyncio.create_task(self._avaliar_lote(pedidos))
+            self._em_avaliacao.add(tarefa)
+            tarefa.add_done_callback(self._em_avaliacao.discard)
+
+    async def _avaliar_lote(self, pedidos):
+        """Avalia um lote no executor e entrega o resultado de cada pedido."""
+        try:
+            self.estatisticas.lotes += 1
+            try:
+                bloco = [(cor, chave, tropas) for cor, chave, _, tropas, _, _ in pedidos]
+                topologias = {chave: vizinhos for _, chave, vizinhos, _, _, _ in pedidos}
+                laco = asyncio.get_running_loop()
+                resultados = await laco.run_in_executor(self._executor, avaliar_bloco, bloco, topologias)
+            except Exception as e:
+                for *_, futuro, _ in pedidos:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                self.estatisticas.erros += len(pedidos)
+                return
+
+            fim = time.perf_counter()
+            for (*_, futuro, chegada), movimentacoes in zip(pedidos, resultados):
+                if not futuro.done():  # O pedido pode ter sido cancelado por quem esperava
+                    futuro.set_result(movimentacoes)
+                self.estatisticas.requisicoes += 1
+                self.estatisticas.latencias.append(fim - chegada)
+        finally:
+            self._limite_lotes.release()
+
+    async def servir(self, host="127.0.0.1", porta=8765):
+        """
+        Atende pedidos por um socket TCP local, até a tarefa ser cancelada.
+
+        Protocolo: uma mensagem JSON por linha, nos dois sentidos. Os pedidos de uma mesma
+        conexão são avaliados em paralelo, então as respostas podem chegar fora de ordem e
+        repetem o "id" do pedido.
+
+        Pedidos:
+            {"id": 1, "cor": "azul", "vizinhos": [["A", "B"]], "tropas": [["A", 3, "azul"]]}
+            {"id": 2, "cor": "azul", "chave": "<chave>", "tropas": [...]}
+            {"id": 3, "comando": "estatisticas"}
+        Respostas:
+            {"id": 1, "chave": "<chave>", "movimentacoes": [["A", "B"]]}
+            {"id": 3, "estatisticas": {...}}
+            {"id": 2, "erro": "mensagem"}
+
+        Uma chave que o serviço não conhece (ou já descartou do cache) gera uma resposta de
+        erro com "topologia_desconhecida": true, e o cliente deve repetir o pedido com os vizinhos.
+
+        :param host: Endereço local.
+        :param porta: Porta TCP.
+        """
+        await self.iniciar()
+        servidor = await asyncio.start_server(self._atender_conexao, host, porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def _atender_conexao(self, leitor, escritor):
+        pendentes = set()
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                tarefa = asyncio.create_task(self._responder(linha, escritor))
+                pendentes.add(tarefa)
+                tarefa.add_done_callback(pendentes.discard)
+            if pendentes:
+                await asyncio.gather(*pendentes, return_exceptions=True)
+        finally:
+            escritor.close()
+
+    async def _responder(self, linha, escritor):
+        resposta = {}
+        try:
+            pedido = json.loads(linha)
+            resposta["id"] = pedido.get("id")
+            if pedido.get("comando") == "estatisticas":
+                resposta["estatisticas"] = self.estatisticas.resumo()
+            else:
+                chave = self.registrar_topologia(pedido["vizinhos"]) if "vizinhos" in pedido else pedido.get("chave")
+                if chave is not None and chave not in self._topologias:
+                    resposta["topologia_desconhecida"] = True  # O cliente deve reenviar os vizinhos
+                movimentacoes = await self.mover_tropas(pedido["cor"], tropas=pedido["tropas"], chave=chave)
+                resposta["chave"] = chave
+                resposta["movimentacoes"] = movimentacoes
+        except Exception as e:
+            resposta["erro"] = f"{type(e).__name__}: {e}"
+
+        escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+        await escritor.drain()
+
+
+# Função que confere o formato de um pedido antes de ele entrar na fila do serviço
+def _validar_tropas(cor, tropas):
+    """
+    Verifica se a cor e as tropas têm o formato esperado por `desafio.mover_tropas`.
+
+    :param cor: Cor do jogador.
+    :param tropas: Lista de tuplas contendo (território, tropas, dono).
+    :raises TypeError / ValueError: Se algum valor não tiver o formato esperado.
+    """
+    if not isinstance(cor, collections.abc.Hashable):
+        raise TypeError(f"Cor inválida: {cor!r}")
+    if isinstance(tropas, (str, bytes)) or not isinstance(tropas, collections.abc.Iterable):
+        raise TypeError(f"Tropas devem ser uma lista de (território, tropas, dono), não {type(tropas).__name__}")
+
+    for posicao, entrada in enumerate(tropas):
+        if isinstance(entrada, (str, bytes)) or not isinstance(entrada, collections.abc.Sized) or len(entrada) != 3:
+            raise ValueError(f"Tropa {posicao} inválida: {entrada!r} (esperado (território, tropas, dono))")
+        territorio, qtd, dono = entrada
+        if not (isinstance(territorio, collections.abc.Hashable) and isinstance(dono, collections.abc.Hashable)):
+            raise TypeError(f"Tropa {posicao} inválida: {entrada!r} (território e dono devem ser valores simples)")
+        if isinstance(qtd, bool) or not isinstance(qtd, numbers.Real):
+            raise TypeError(f"Tropa {posicao} inválida: {entrada!r} (a quantidade de tropas deve ser um número)")
+
+
+# Cliente do protocolo de `ServicoPlanejamento.servir`
+class ClienteServico:
+    """
+    Cliente assíncrono do serviço de planejamento pelo socket local.
+
+    Cada topologia é enviada inteira só no primeiro pedido; os seguintes mandam apenas a
+    chave, calculada pelo conteúdo dos vizinhos (ou lida do `MapaTerritorios`). Vários
+    pedidos podem ser feitos ao mesmo tempo pela mesma conexão.
+
+    Exemplo:
+        async with ClienteServico("127.0.0.1", 8765) as cliente:
+            movimentacoes = await cliente.mover_tropas("azul", vizinhos, tropas)
+
+    :param host: Endereço do serviço.
+    :param porta: Porta TCP do serviço.
+    """
+
+    def __init__(self, host="127.0.0.1", porta=8765):
+        self.host = host
+        self.porta = porta
+        self._leitor = None
+        self._escritor = None
+        self._recebedor = None
+        self._aguardando = {}  # id do pedido -> future da resposta
+        self._ids = itertools.count()
+        self._enviadas = collections.OrderedDict()  # Chaves das topologias já enviadas -> None
+
+    async def conectar(self):
+        """Abre a conexão com o serviço."""
+        self._leitor, self._escritor = await asyncio.open_connection(self.host, self.porta)
+        self._recebedor = asyncio.create_task(self._receber())
+
+    async def fechar(self):
+        """Fecha a conexão; pedidos ainda sem resposta recebem ConnectionError."""
+        if self._escritor is None:
+            return
+        self._escritor.close()
+        await self._escritor.wait_closed()
+        self._recebedor.cancel()
+        try:
+            await self._recebedor
+        except asyncio.CancelledError:
+            pass
+        self._escritor = None
+        self._falhar_pendentes()
+
+    async def __aenter__(self):
+        await self.conectar()
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.fechar()
+
+    async def mover_tropas(self, cor, vizinhos, tropas):
+        """
+        Pede as movimentações de um tabuleiro ao serviço.
+
+        :param cor: Cor do jogador.
+        :param vizinhos: Lista de pares de territórios vizinhos ou um `MapaTerritorios`.
+        :param tropas: Lista de tuplas contendo (território, tropas, dono).
+        :return: Lista de movimentações, como tuplas (origem, destino).
+        """
+        if isinstance(vizinhos, MapaTerritorios):
+            chave, vizinhos = vizinhos.chave, vizinhos.vizinhos
+        else:
+            chave = chave_topologia(vizinhos)
+
+        resposta = None
+        if chave in self._enviadas:
+            self._enviadas.move_to_end(chave)
+            resposta = await self._enviar({"cor": cor, "chave": chave, "tropas": tropas})
+            if resposta.get("topologia_desconhecida"):
+                resposta = None  # O serviço descartou a topologia: envia de novo
+
+        if resposta is None:
+            resposta = await self._enviar({"cor": cor, "vizinhos": vizinhos, "tropas": tropas})
+            self._enviadas[resposta["chave"]] = None
+            if len(self._enviadas) > MAX_TOPOLOGIAS:
+                self._enviadas.popitem(last=False)
+        return [tuple(movimentacao) for movimentacao in resposta["movimentacoes"]]
+
+    async def estatisticas(self):
+        """Retorna o resumo das métricas do serviço."""
+        return (await self._enviar({"comando": "estatisticas"}))["estatisticas"]
+
+    async def _enviar(self, pedido):
+        pedido["id"] = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._aguardando[pedido["id"]] = futuro
+        self._escritor.write(json.dumps(pedido, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._escritor.drain()
+
+        resposta = await futuro
+        if "erro" in resposta and not resposta.get("topologia_desconhecida"):
+            raise RuntimeError(resposta["erro"])
+        return resposta
+
+    async def _receber(self):
+        try:
+            while True:
+                linha = await self._leitor.readline()
+                if not linha:
+                    break
+                resposta = json.loads(linha)
+                futuro = self._aguardando.pop(resposta.get("id"), None)
+                if futuro is not None and not futuro.done():
+                    futuro.set_result(resposta)
+        finally:
+            self._falhar_pendentes()
+
+    def _falhar_pendentes(self):
+        for futuro in self._aguardando.values():
+            if not futuro.done():
+                futuro.set_exception(ConnectionError("Conexão com o serviço encerrada"))
+        self._aguardando.clear()
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando: inicia o serviço em um socket local.
+
+    Exemplo:
+        python servico.py --porta 8765 --workers 4 --janela-ms 2
+    """
+    parser = argparse.ArgumentParser(description="Serviço assíncrono de planejamento de tropas.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço local")
+    parser.add_argument("--porta", type=int, default=8765, help="Porta TCP")
+    parser.add_argument("--workers", type=int, default=0, help="Processos do pool (0 avalia no próprio processo)")
+    parser.add_argument("--janela-ms", type=float, default=1000 * JANELA_PADRAO,
+                        help="Tempo máximo de espera para formar um lote, em milissegundos")
+    parser.add_argument("--lote", type=int, default=TAMANHO_MAXIMO_LOTE, help="Número máximo de pedidos por lote")
+    args = parser.parse_args(argumentos)
+
+    servico = ServicoPlanejamento(args.workers, args.janela_ms / 1000, args.lote)
+    print(f"Servindo em {args.host}:{args.porta}", file=sys.stderr)
+    try:
+        asyncio.run(servico.servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from desafio import MapaTerritorios, chave_topologia, mover_tropas
+from lote import mover_tropas_em_lote
+
+CORES = ("azul", "vermelho", "verde")
+
+
+# Função que gera um mapa aleatório pequeno e as tropas de uma posição nele
+def gerar_mapa(aleatorio, territorios):
+    nomes = [f"T{i:02d}" for i in range(territorios)]
+    vizinhos = [[nomes[i], nomes[aleatorio.randrange(i)]] for i in range(1, territorios)]
+    vizinhos += [[aleatorio.choice(nomes), aleatorio.choice(nomes)] for _ in range(territorios // 2)]
+    return nomes, vizinhos
+
+
+def gerar_tropas(aleatorio, nomes):
+    return [(nome, aleatorio.randint(1, 4), aleatorio.choice(CORES)) for nome in nomes if aleatorio.random() < 0.9]
+
+
+# Função que gera jobs de várias posições sobre poucas topologias, como em uma simulação
+def gerar_jobs(aleatorio, qtd_jobs, qtd_mapas=3):
+    mapas = [gerar_mapa(aleatorio, aleatorio.randint(3, 20)) for _ in range(qtd_mapas)]
+    jobs = []
+    for _ in range(qtd_jobs):
+        nomes, vizinhos = aleatorio.choice(mapas)
+        jobs.append((aleatorio.choice(CORES), vizinhos, gerar_tropas(aleatorio, nomes)))
+    return jobs
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("semente", range(3))
+def test_lote_igual_a_mover_tropas(semente, workers):
+    jobs = gerar_jobs(random.Random(semente), 60)
+    esperado = [mover_tropas(cor, vizinhos, tropas) for cor, vizinhos, tropas in jobs]
+
+    assert list(mover_tropas_em_lote(jobs, workers=workers, tamanho_bloco=7)) == esperado
+
+    fora_de_ordem = dict(mover_tropas_em_lote(jobs, workers=workers, tamanho_bloco=7, ordenado=False))
+    assert [fora_de_ordem[i] for i in range(len(jobs))] == esperado
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_lote_com_mapa_e_chave(workers):
+    jobs = gerar_jobs(random.Random(7), 40)
+    esperado = [mover_tropas(cor, vizinhos, tropas) for cor, vizinhos, tropas in jobs]
+
+    mapas = {}
+    com_mapa = [(cor, mapas.setdefault(id(vizinhos), MapaTerritorios(vizinhos)), tropas)
+                for cor, vizinhos, tropas in jobs]
+    assert list(mover_tropas_em_lote(com_mapa, workers=workers, tamanho_bloco=5)) == esperado
+
+    topologias = {chave_topologia(vizinhos): vizinhos for _, vizinhos, _ in jobs}
+    com_chave = [(cor, chave_topologia(vizinhos), tropas) for cor, vizinhos, tropas in jobs]
+    assert list(mover_tropas_em_lote(com_chave, workers=workers, tamanho_bloco=5, topologias=topologias)) == esperado
+
+
+def test_chave_desconhecida():
+    with pytest.raises(KeyError):
+        list(mover_tropas_em_lote([("azul", "nao-registrada", [])], workers=0))
+
+
+# Regressão: a mesma lista de vizinhos, alterada no lugar entre dois jobs, é outra topologia
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("semente", range(3))
+def test_lista_alterada_no_lugar(semente, workers):
+    aleatorio = random.Random(semente)
+    nomes, vizinhos = gerar_mapa(aleatorio, 12)
+    esperado = []
+
+    def jobs():
+        for _ in range(30):
+            cor, tropas = aleatorio.choice(CORES), gerar_tropas(aleatorio, nomes)
+            esperado.append(mover_tropas(cor, vizinhos, tropas))
+            yield cor, vizinhos, tropas
+            # Altera a lista depois que o job foi consumido, mas talvez antes de o bloco ser avaliado
+            if aleatorio.random() < 0.5:
+                vizinhos.append([aleatorio.choice(nomes), aleatorio.choice(nomes)])
+            else:
+                vizinhos[aleatorio.randrange(len(vizinhos))][1] = aleatorio.choice(nomes)
+
+    assert list(mover_tropas_em_lote(jobs(), workers=workers, tamanho_bloco=4)) == esperado
+
+
+def test_lote_consome_jobs_sob_demanda():
+    aleatorio = random.Random(0)
+    nomes, vizinhos = gerar_mapa(aleatorio, 10)
+    consumidos = 0
+
+    def jobs():
+        nonlocal consumidos
+        for _ in range(1000):
+            consumidos += 1
+            yield "azul", vizinhos, gerar_tropas(aleatorio, nomes)
+
+    resultados = mover_tropas_em_lote(jobs(), workers=2, tamanho_bloco=3)
+    next(resultados)
+    # No máximo 2 * workers blocos pendentes ou prontos, mais o bloco que está sendo montado
+    assert consumidos <= (2 * 2 + 1) * 3
+    resultados.close()
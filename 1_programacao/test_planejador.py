@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from desafio import (calcular_melhor_vizinho, construir_grafo, encontrar_vizinhos_inimigos, mover_tropas,
+                     obter_territorios_jogador)
+from planejador import PlanejadorTropas
+
+CORES = ("azul", "vermelho", "verde")
+
+
+# Versão original de `mover_tropas`, só com as funções de lista (sem estado indexado nem tabelas)
+def mover_tropas_referencia(cor, vizinhos, tropas):
+    grafo = construir_grafo(vizinhos)
+    movimentacoes = []
+    for territorio, tropa in obter_territorios_jogador(cor, tropas).items():
+        if tropa > 1 and not encontrar_vizinhos_inimigos(grafo, tropas, cor, territorio):
+            melhor_vizinho = calcular_melhor_vizinho(territorio, grafo.get(territorio, []), tropas, cor, grafo)
+            if melhor_vizinho:
+                movimentacoes.append((territorio, melhor_vizinho))
+    return movimentacoes
+
+
+# Função que gera um mapa aleatório pequeno, com territórios sem dono e um componente isolado
+def gerar_mapa(aleatorio, territorios):
+    nomes = [f"T{i:02d}" for i in range(territorios)]
+    vizinhos = [[nomes[i], nomes[aleatorio.randrange(i)]] for i in range(1, territorios - 2)]
+    vizinhos += [[aleatorio.choice(nomes[:-2]), aleatorio.choice(nomes[:-2])] for _ in range(territorios // 2)]
+    vizinhos.append([nomes[-2], nomes[-1]])  # Componente sem caminho até o resto do mapa
+
+    tropas = [(nome, aleatorio.randint(1, 4), aleatorio.choice(CORES))
+              for nome in nomes if aleatorio.random() < 0.9]
+    aleatorio.shuffle(tropas)
+    return nomes, vizinhos, tropas
+
+
+@pytest.mark.parametrize("semente", range(40))
+def test_planejador_igual_a_mover_tropas(semente):
+    aleatorio = random.Random(semente)
+    nomes, vizinhos, tropas = gerar_mapa(aleatorio, aleatorio.randint(4, 30))
+    cor = CORES[0]
+
+    planejador = PlanejadorTropas(cor, vizinhos, tropas)
+    assert planejador.movimentacoes() == mover_tropas_referencia(cor, vizinhos, tropas)
+
+    atual = {territorio: (territorio, qtd, dono) for territorio, qtd, dono in tropas}
+    for _ in range(15):
+        alteracoes = [(territorio, aleatorio.randint(1, 4), aleatorio.choice(CORES))
+                      for territorio in aleatorio.sample(nomes, aleatorio.randint(1, 4))]
+        for alteracao in alteracoes:
+            atual[alteracao[0]] = alteracao
+
+        esperado = mover_tropas_referencia(cor, vizinhos, list(atual.values()))
+        assert planejador.aplicar_alteracoes(alteracoes) == esperado
+        assert mover_tropas(cor, vizinhos, list(atual.values())) == esperado
+
+
+def test_alteracao_com_dono_e_tropas_trocados():
+    planejador = PlanejadorTropas("azul", [["A", "B"]], [("A", 3, "azul"), ("B", 1, "vermelho")])
+    with pytest.raises(TypeError):
+        planejador.aplicar_alteracoes([("B", "azul", 2)])
+    assert planejador.estado.dono["B"] == "vermelho"  # O estado não foi alterado
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_dono_none_conta_como_inimigo(semente):
+    aleatorio = random.Random(semente)
+    nomes, vizinhos, tropas = gerar_mapa(aleatorio, aleatorio.randint(4, 30))
+    tropas = [(territorio, qtd, None if aleatorio.random() < 0.2 else dono) for territorio, qtd, dono in tropas]
+
+    for cor in (CORES[0], None):
+        esperado = mover_tropas_referencia(cor, vizinhos, tropas)
+        assert mover_tropas(cor, vizinhos, tropas) == esperado
+        assert PlanejadorTropas(cor, vizinhos, tropas).movimentacoes() == esperado
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from cifra_streaming import cifrar_arquivo
+from q1a import cifra, cifra_bytes, cifra_caractere_a_caractere, cifra_numpy, np
+
+# Letras, pontuação, acentos, caracteres de vários bytes em UTF-8 e um surrogate isolado
+ALFABETO = "abcxyzABCXYZ 0189.,!?\n\téçÃÖßñ€中文😀\ud800"
+
+
+def gerar_texto(aleatorio, tamanho, alfabeto=ALFABETO):
+    return "".join(aleatorio.choice(alfabeto) for _ in range(tamanho))
+
+
+@pytest.mark.parametrize("semente", range(30))
+def test_cifra_igual_a_referencia(semente):
+    aleatorio = random.Random(semente)
+    deslocamento = aleatorio.randint(-60, 60)
+    ascii_ = gerar_texto(aleatorio, aleatorio.randint(0, 200), ALFABETO[:23])
+    texto = gerar_texto(aleatorio, aleatorio.randint(0, 200))
+
+    for entrada in (ascii_, texto):
+        esperado = cifra_caractere_a_caractere(entrada, deslocamento)
+        assert cifra(entrada, deslocamento) == esperado
+        dados = entrada.encode("utf-8", "surrogatepass")
+        assert cifra_bytes(dados, deslocamento).decode("utf-8", "surrogatepass") == esperado
+        assert cifra_bytes(memoryview(dados), deslocamento).decode("utf-8", "surrogatepass") == esperado
+        assert cifra(cifra(entrada, deslocamento), -deslocamento) == entrada
+
+
+@pytest.mark.skipif(np is None, reason="NumPy não instalado")
+@pytest.mark.parametrize("semente", range(10))
+def test_cifra_numpy_igual_a_referencia(semente):
+    aleatorio = random.Random(semente)
+    deslocamento = aleatorio.randint(-60, 60)
+    texto = gerar_texto(aleatorio, aleatorio.randint(0, 300))
+    dados = texto.encode("utf-8", "surrogatepass")
+    esperado = cifra_caractere_a_caractere(texto, deslocamento)
+
+    assert cifra_numpy(dados, deslocamento).tobytes().decode("utf-8", "surrogatepass") == esperado
+
+    buffer = np.frombuffer(dados, dtype=np.uint8).copy()
+    cifra_numpy(buffer, deslocamento, saida=buffer)  # No lugar
+    assert buffer.tobytes().decode("utf-8", "surrogatepass") == esperado
+
+
+@pytest.mark.parametrize("modo", [{}, {"usar_mmap": True}, {"workers": 2}, {"workers": 2, "usar_mmap": True}])
+def test_cifrar_arquivo_igual_a_referencia(tmp_path, modo):
+    aleatorio = random.Random(0)
+    texto = gerar_texto(aleatorio, 2000)
+    entrada, saida = tmp_path / "entrada.txt", tmp_path / "saida.txt"
+    entrada.write_bytes(texto.encode("utf-8", "surrogatepass"))
+
+    # Blocos pequenos cortam caracteres de vários bytes ao meio
+    estatisticas = cifrar_arquivo(entrada, saida, -7, tamanho_bloco=7, **modo)
+    assert estatisticas.bytes == entrada.stat().st_size
+    assert saida.read_bytes().decode("utf-8", "surrogatepass") == cifra_caractere_a_caractere(texto, -7)
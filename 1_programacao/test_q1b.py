@@ -0,0 +1,73 @@
+import io
+import random
+
+import pytest
+
+from corrige_emails_streaming import corrigir_arquivo, corrigir_linhas
+from q1b import SUFIXO_VALIDO, corrige_emails, corrige_emails_colunar, corrigir_email, corrigir_email_rapido, np
+
+CARACTERES = "abcxyz019._-éç中😀\x00"
+
+
+# Função que embaralha um e-mail como na entrada do problema (cada metade invertida)
+def embaralhar(email):
+    metade = len(email) // 2
+    return email[:metade][::-1] + email[metade:][::-1]
+
+
+# Função que gera e-mails embaralhados: válidos, com outro domínio, curtos e com "\x00" no fim
+def gerar_emails(aleatorio, quantidade):
+    emails = []
+    for _ in range(quantidade):
+        usuario = "".join(aleatorio.choice(CARACTERES) for _ in range(aleatorio.randint(0, 12)))
+        email = usuario + aleatorio.choice([SUFIXO_VALIDO, SUFIXO_VALIDO, "@usp.com", "@gmail.com", "", "\x00"])
+        emails.append(embaralhar(email) if aleatorio.random() < 0.8 else email)
+    return emails
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_correcao_igual_a_referencia(semente):
+    emails = gerar_emails(random.Random(semente), 200)
+    esperado = [corrigir_email(email) for email in emails]
+
+    assert [corrigir_email_rapido(email) for email in emails] == esperado
+    assert corrige_emails(emails) == esperado
+    assert list(corrigir_linhas(email + "\n" for email in emails)) == esperado
+    assert list(corrigir_linhas(emails, tamanho_cache=0)) == esperado
+
+
+@pytest.mark.skipif(np is None, reason="NumPy não instalado")
+@pytest.mark.parametrize("semente", range(20))
+def test_correcao_colunar_igual_a_referencia(semente):
+    emails = gerar_emails(random.Random(semente), 200)
+    esperado = [corrigir_email(email) for email in emails]
+
+    assert corrige_emails_colunar(emails) == esperado
+    assert corrige_emails(emails, modo="numpy") == esperado
+    sem_nulos = [email for email in emails if not email.endswith("\x00")]
+    assert corrige_emails_colunar(np.array(sem_nulos, dtype=str)) == [corrigir_email(email) for email in sem_nulos]
+
+
+def test_correcao_com_processos():
+    emails = gerar_emails(random.Random(0), 500)
+    esperado = [corrigir_email(email) for email in emails]
+    assert corrige_emails(emails, workers=2, tamanho_bloco=64) == esperado
+
+
+def test_corrigir_arquivo_igual_a_referencia():
+    emails = gerar_emails(random.Random(0), 300) * 2  # Repetidos, com um cache menor que a entrada
+    saida = io.StringIO()
+
+    estatisticas = corrigir_arquivo(io.StringIO("".join(email + "\n" for email in emails)), saida, tamanho_cache=50)
+    esperado = [corrigir_email(email) for email in emails]
+    assert saida.getvalue().splitlines() == esperado
+    assert estatisticas.linhas == len(emails)
+    assert estatisticas.erros == esperado.count("ERRO")
+
+
+def test_tamanho_cache_invalido(tmp_path):
+    saida = tmp_path / "saida.txt"
+    saida.write_text("conteúdo anterior")
+    with pytest.raises(ValueError):
+        corrigir_arquivo(io.StringIO("a\n"), saida, tamanho_cache=-1)
+    assert saida.read_text() == "conteúdo anterior"  # A saída não foi aberta
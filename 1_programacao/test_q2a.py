@@ -0,0 +1,67 @@
+import json
+import random
+
+import pytest
+
+from q2a import np, organiza_listas, organiza_listas_colunar, organiza_listas_streaming
+
+
+# Função que gera episódios em ordem cronológica por projeto, às vezes com um episódio fora de ordem
+def gerar_episodios(aleatorio):
+    qtd_projetos = aleatorio.randint(1, 6)
+    ultimo = [0] * (qtd_projetos + 1)
+    episodios = []
+    for _ in range(aleatorio.randint(0, 40)):
+        projeto_id = aleatorio.randint(1, qtd_projetos)
+        ultimo[projeto_id] += aleatorio.randint(0, 3)
+        indice = ultimo[projeto_id] - (5 if aleatorio.random() < 0.03 else 0)
+        episodios.append([projeto_id, indice, aleatorio.randint(0, 10)])
+    return qtd_projetos, episodios, aleatorio.randint(0, 40)
+
+
+# Resultado esperado do streaming: os episódios dos projetos válidos de `organiza_listas`, na ordem de entrada
+def episodios_validos(qtd_projetos, episodios, min_passos):
+    resposta, listas = organiza_listas(qtd_projetos, episodios, min_passos)
+    return resposta, [episodio for episodio in episodios if listas[episodio[0] - 1]]
+
+
+def coletar(resultado):
+    resposta, gerador = resultado
+    return resposta, [[int(valor) for valor in episodio] for episodio in gerador]
+
+
+@pytest.mark.skipif(np is None, reason="NumPy não instalado")
+@pytest.mark.parametrize("semente", range(40))
+def test_colunar_igual_a_organiza_listas(semente):
+    qtd_projetos, episodios, min_passos = gerar_episodios(random.Random(semente))
+    resposta, listas = organiza_listas(qtd_projetos, episodios, min_passos)
+
+    colunas = np.array(episodios, dtype=np.int64).reshape(-1, 3)
+    for entrada in (colunas, (colunas[:, 0].copy(), colunas[:, 1].copy(), colunas[:, 2].copy())):
+        resposta_colunar, fatias = organiza_listas_colunar(qtd_projetos, entrada, min_passos)
+        assert resposta_colunar == resposta
+        assert [fatia.tolist() for fatia in fatias] == listas
+
+
+@pytest.mark.parametrize("semente", range(40))
+def test_streaming_igual_a_organiza_listas(semente, tmp_path):
+    qtd_projetos, episodios, min_passos = gerar_episodios(random.Random(semente))
+    esperado = episodios_validos(qtd_projetos, episodios, min_passos)
+
+    assert coletar(organiza_listas_streaming(qtd_projetos, episodios, min_passos)) == esperado
+    assert coletar(organiza_listas_streaming(qtd_projetos, iter(episodios), min_passos)) == esperado
+
+    arquivo_csv = tmp_path / "episodios.csv"
+    arquivo_csv.write_text("id_projeto,indice,passos\n" + "".join(f"{p},{i},{s}\n" for p, i, s in episodios))
+    assert coletar(organiza_listas_streaming(qtd_projetos, arquivo_csv, min_passos)) == esperado
+
+    arquivo_ndjson = tmp_path / "episodios.ndjson"
+    arquivo_ndjson.write_text("".join(json.dumps(episodio) + "\n" for episodio in episodios))
+    assert coletar(organiza_listas_streaming(qtd_projetos, arquivo_ndjson, min_passos)) == esperado
+
+
+def test_streaming_csv_com_linha_invalida(tmp_path):
+    arquivo_csv = tmp_path / "episodios.csv"
+    arquivo_csv.write_text("1,1,5\n1,2,x\n1,3,5\n")
+    with pytest.raises(ValueError):
+        organiza_listas_streaming(1, arquivo_csv, 0)
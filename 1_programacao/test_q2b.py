@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from q2b import CorretorEpisodios, conta_correcoes, np
+
+
+# Versão original de `conta_correcoes`: busca recursiva por lacuna, sem cache nem matrizes
+def conta_correcoes_referencia(qtd_estados, transicoes, episodio, max_prof):
+    def transicao_valida(de_estado, para_estado):
+        return transicoes.get((de_estado, para_estado), 0) == 1
+
+    def contar_caminhos(origem, destino, passos_restantes):
+        caminhos = 1 if transicao_valida(origem, destino) else 0
+        if passos_restantes > 0:
+            for intermediario in range(1, qtd_estados + 1):
+                if transicao_valida(origem, intermediario):
+                    caminhos += contar_caminhos(intermediario, destino, passos_restantes - 1)
+        return caminhos
+
+    lacunas = [(episodio[i], episodio[i + 1]) for i in range(len(episodio) - 1)
+               if not transicao_valida(episodio[i], episodio[i + 1])]
+    if not lacunas:
+        return -1
+
+    total_correcoes = 1
+    for origem, destino in lacunas:
+        caminhos = contar_caminhos(origem, destino, max_prof)
+        if caminhos == 0:
+            return 0
+        total_correcoes *= caminhos
+    return total_correcoes
+
+
+# Função que gera uma tabela de transições (com valores diferentes de 1 e estados fora da faixa) e episódios
+def gerar_caso(aleatorio):
+    qtd_estados = aleatorio.randint(1, 6)
+    densidade = aleatorio.uniform(0.3, 1.0)
+    transicoes = {(de, para): 1 for de in range(1, qtd_estados + 1) for para in range(1, qtd_estados + 1)
+                  if aleatorio.random() < densidade}
+    transicoes[(1, qtd_estados + 1)] = 1  # Fora da faixa: nunca é intermediário
+    transicoes[(qtd_estados, 1)] = 0  # Valor diferente de 1 não é transição válida
+
+    episodios = [[aleatorio.randint(1, qtd_estados) for _ in range(aleatorio.randint(1, 6))] for _ in range(8)]
+    episodios.append([1, qtd_estados + 1, 1])  # Estado fora da faixa: caminho em Python puro
+    return qtd_estados, transicoes, episodios, aleatorio.randint(-1, 4)
+
+
+@pytest.mark.parametrize("semente", range(40))
+def test_conta_correcoes_igual_a_referencia(semente):
+    qtd_estados, transicoes, episodios, max_prof = gerar_caso(random.Random(semente))
+    esperado = [conta_correcoes_referencia(qtd_estados, transicoes, episodio, max_prof) for episodio in episodios]
+
+    backends = ["esparso"] + (["denso"] if np is not None else [])
+    for backend in backends:
+        assert [conta_correcoes(qtd_estados, transicoes, episodio, max_prof, backend)
+                for episodio in episodios] == esperado
+
+        for precalcular in (True, False):
+            corretor = CorretorEpisodios(qtd_estados, transicoes, max_prof, backend, precalcular)
+            assert list(corretor.corrigir_episodios(episodios)) == esperado
+            if np is not None:
+                assert [corretor.corrigir(np.array(episodio)) for episodio in episodios] == esperado
@@ -0,0 +1,99 @@
+import asyncio
+import random
+
+import pytest
+
+from desafio import MapaTerritorios, mover_tropas
+from servico import ClienteServico, ServicoPlanejamento
+
+CORES = ("azul", "vermelho", "verde")
+
+
+# Função que gera um mapa aleatório pequeno e as tropas de uma posição nele
+def gerar_mapa(aleatorio, territorios):
+    nomes = [f"T{i:02d}" for i in range(territorios)]
+    vizinhos = [[nomes[i], nomes[aleatorio.randrange(i)]] for i in range(1, territorios)]
+    vizinhos += [[aleatorio.choice(nomes), aleatorio.choice(nomes)] for _ in range(territorios // 2)]
+    return nomes, vizinhos
+
+
+def gerar_tropas(aleatorio, nomes):
+    return [(nome, aleatorio.randint(1, 4), aleatorio.choice(CORES)) for nome in nomes if aleatorio.random() < 0.9]
+
+
+# Função que altera a lista de vizinhos no lugar (acrescenta um par ou troca um território)
+def alterar_vizinhos(aleatorio, nomes, vizinhos):
+    if aleatorio.random() < 0.5:
+        vizinhos.append([aleatorio.choice(nomes), aleatorio.choice(nomes)])
+    else:
+        vizinhos[aleatorio.randrange(len(vizinhos))][1] = aleatorio.choice(nomes)
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_servico_igual_a_mover_tropas(semente):
+    aleatorio = random.Random(semente)
+    mapas = [gerar_mapa(aleatorio, aleatorio.randint(3, 20)) for _ in range(3)]
+    pedidos = []
+    for _ in range(40):
+        nomes, vizinhos = aleatorio.choice(mapas)
+        pedidos.append((aleatorio.choice(CORES), vizinhos, gerar_tropas(aleatorio, nomes)))
+
+    async def executar():
+        async with ServicoPlanejamento(workers=0, janela=0.001) as servico:
+            por_lista = await asyncio.gather(*(servico.mover_tropas(cor, vizinhos, tropas)
+                                               for cor, vizinhos, tropas in pedidos))
+            por_chave = await asyncio.gather(*(servico.mover_tropas(cor, tropas=tropas,
+                                                                    chave=servico.registrar_topologia(vizinhos))
+                                               for cor, vizinhos, tropas in pedidos))
+            por_mapa = [await servico.mover_tropas(cor, MapaTerritorios(vizinhos), tropas)
+                        for cor, vizinhos, tropas in pedidos[:10]]
+        return por_lista, por_chave, por_mapa
+
+    esperado = [mover_tropas(cor, vizinhos, tropas) for cor, vizinhos, tropas in pedidos]
+    por_lista, por_chave, por_mapa = asyncio.run(executar())
+    assert por_lista == esperado
+    assert por_chave == esperado
+    assert por_mapa == esperado[:10]
+
+
+# Regressão: a mesma lista de vizinhos, alterada no lugar entre dois pedidos, é outra topologia
+@pytest.mark.parametrize("semente", range(3))
+def test_lista_alterada_no_lugar(semente):
+    aleatorio = random.Random(semente)
+    nomes, vizinhos = gerar_mapa(aleatorio, 12)
+    esperado = []
+
+    async def executar():
+        async with ServicoPlanejamento(workers=0, janela=0.001) as servico:
+            tarefas = []
+            for _ in range(20):
+                cor, tropas = aleatorio.choice(CORES), gerar_tropas(aleatorio, nomes)
+                esperado.append(mover_tropas(cor, vizinhos, tropas))
+                tarefas.append(asyncio.create_task(servico.mover_tropas(cor, vizinhos, tropas)))
+                await asyncio.sleep(0)  # O pedido entra na fila antes de a lista mudar
+                alterar_vizinhos(aleatorio, nomes, vizinhos)
+            return await asyncio.gather(*tarefas)
+
+    assert asyncio.run(executar()) == esperado
+
+
+def test_cliente_pelo_socket():
+    aleatorio = random.Random(0)
+    nomes, vizinhos = gerar_mapa(aleatorio, 12)
+    esperado = []
+
+    async def executar():
+        async with ServicoPlanejamento(workers=0, janela=0.001) as servico:
+            servidor = await asyncio.start_server(servico._atender_conexao, "127.0.0.1", 0)
+            porta = servidor.sockets[0].getsockname()[1]
+            async with servidor, ClienteServico("127.0.0.1", porta) as cliente:
+                resultados = []
+                for _ in range(15):
+                    cor, tropas = aleatorio.choice(CORES), gerar_tropas(aleatorio, nomes)
+                    esperado.append(mover_tropas(cor, vizinhos, tropas))
+                    resultados.append(await cliente.mover_tropas(cor, vizinhos, tropas))
+                    if aleatorio.random() < 0.5:  # Repete a topologia em metade dos pedidos (só a chave vai)
+                        alterar_vizinhos(aleatorio, nomes, vizinhos)
+                return resultados
+
+    assert asyncio.run(executar()) == esperado
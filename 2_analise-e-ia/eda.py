@@ -0,0 +1,551 @@
+import argparse
+import html
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from preprocessamento import (COLUNA_ALVO, DIRETORIO_CACHE_PADRAO, TAMANHO_BLOCO_PADRAO,
+                              _arquivo_local, converter_idades, ler_blocos)
+
+MAX_AMOSTRA = 200_000  # Linhas guardadas para histogramas e quantis; com menos linhas tudo é exato
+COLUNAS_IGNORADAS = ("ID",)  # Colunas que não são lidas (identificadores não têm distribuição útil)
+MAX_FLIERS = 500  # Pontos fora dos bigodes desenhados por caixa
+
+# Colunas de texto que também são resumidas como números, com a função de conversão
+COLUNAS_CONVERTIDAS = {"AGE": converter_idades}
+
+
+# Classe com todas as estatísticas da análise exploratória, acumuladas bloco a bloco
+class ResumoEDA:
+    """
+    Estatísticas da EDA do notebook, calculadas em uma única passada pelos dados.
+
+    Cada bloco passa uma vez por `atualizar`, que acumula:
+    - de forma exata: número de linhas, dados faltantes, contagem de valores das colunas
+      categóricas (no total e por OUTCOME), contagem, média, desvio, mínimo e máximo das
+      colunas numéricas e as somas da matriz de correlação (Pearson, com os pares de valores
+      não nulos, como `DataFrame.corr`);
+    - uma amostra uniforme de até `max_amostra` linhas das colunas numéricas e do OUTCOME
+      (cada linha recebe uma chave aleatória e ficam as menores), usada nos histogramas e
+      nos quantis. Enquanto os dados couberem na amostra, esses valores também são exatos.
+
+    Os gráficos (`desenhar`) e o relatório (`gerar_relatorio`) só leem o resumo, então os
+    dados nunca são percorridos de novo.
+
+    :param alvo: Coluna do resultado (OUTCOME).
+    :param max_amostra: Tamanho máximo da amostra.
+    :param semente: Semente das chaves da amostra.
+    """
+
+    def __init__(self, alvo=COLUNA_ALVO, max_amostra=MAX_AMOSTRA, semente=0):
+        self.alvo = alvo
+        self.max_amostra = max_amostra
+        self.linhas = 0
+        self.numericas = None  # Definidas no primeiro bloco
+        self.categoricas = None
+        self.faltantes = None
+        self.contagens = {}  # Coluna -> Série com a contagem de cada valor
+        self.contagens_por_alvo = {}  # Coluna -> Série com a contagem de cada par (valor, alvo)
+        self.amostra = None
+        self._gerador = np.random.default_rng(semente)
+        self._chaves = None
+
+    def atualizar(self, bloco):
+        """
+        Acumula as estatísticas de um bloco de linhas.
+
+        :param bloco: DataFrame com as colunas do dataset bruto.
+        """
+        if self.numericas is None:
+            self._iniciar(bloco)
+
+        self.linhas += len(bloco)
+        self.faltantes = self.faltantes.add(bloco.isnull().sum(), fill_value=0).astype(np.int64)
+
+        for coluna in self.categoricas:
+            contagem = bloco[coluna].value_counts()
+            anterior = self.contagens.get(coluna, contagem.iloc[:0])
+            self.contagens[coluna] = anterior.add(contagem, fill_value=0).astype(np.int64)
+            if coluna != self.alvo and self.alvo in bloco.columns:
+                contagem = bloco.groupby([coluna, self.alvo], observed=True).size()
+                anterior = self.contagens_por_alvo.get(coluna, contagem.iloc[:0])
+                self.contagens_por_alvo[coluna] = anterior.add(contagem, fill_value=0).astype(np.int64)
+
+        numeros = self._numeros(bloco)
+        self._acumular_momentos(numeros)
+        self._acumular_amostra(numeros, bloco)
+
+    def _iniciar(self, bloco):
+        self.numericas = [coluna for coluna in bloco.columns
+                          if coluna != self.alvo and pd.api.types.is_numeric_dtype(bloco[coluna])]
+        self.numericas += [coluna for coluna in COLUNAS_CONVERTIDAS
+                           if coluna in bloco.columns and coluna not in self.numericas]
+        self.categoricas = [coluna for coluna in bloco.columns
+                            if coluna == self.alvo or not pd.api.types.is_numeric_dtype(bloco[coluna])]
+        self.faltantes = pd.Series(0, index=bloco.columns, dtype=np.int64)
+
+        # Os momentos são acumulados com os valores deslocados pela média do primeiro bloco,
+        # para que as somas de quadrados não percam precisão com valores grandes
+        self._deslocamento = pd.DataFrame(self._numeros(bloco)).mean().fillna(0).to_numpy()
+        p = len(self.numericas)
+        self._n = np.zeros((p, p))  # Pares de valores não nulos
+        self._soma = np.zeros((p, p))  # Soma de x[i] sobre os pares (i, j)
+        self._soma_quadrados = np.zeros((p, p))  # Soma de x[i]² sobre os pares (i, j)
+        self._soma_produtos = np.zeros((p, p))  # Soma de x[i]·x[j]
+        self._minimos = np.full(p, np.inf)
+        self._maximos = np.full(p, -np.inf)
+
+    def _numeros(self, bloco):
+        """Retorna as colunas numéricas do bloco em uma matriz float64 (NaN nos valores faltantes)."""
+        colunas = []
+        for coluna in self.numericas:
+            valores = bloco[coluna]
+            if coluna in COLUNAS_CONVERTIDAS and not pd.api.types.is_numeric_dtype(valores):
+                valores = COLUNAS_CONVERTIDAS[coluna](valores)
+            colunas.append(pd.to_numeric(valores, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+        return np.column_stack(colunas) if colunas else np.empty((len(bloco), 0))
+
+    def _acumular_momentos(self, numeros):
+        presentes = ~np.isnan(numeros)
+        valores = np.where(presentes, numeros - self._deslocamento, 0.0)
+        mascara = presentes.astype(np.float64)
+
+        self._n += mascara.T @ mascara
+        self._soma += valores.T @ mascara
+        self._soma_quadrados += (valores ** 2).T @ mascara
+        self._soma_produtos += valores.T @ valores
+        if len(numeros):
+            self._minimos = np.minimum(self._minimos, np.where(presentes, numeros, np.inf).min(axis=0))
+            self._maximos = np.maximum(self._maximos, np.where(presentes, numeros, -np.inf).max(axis=0))
+
+    def _acumular_amostra(self, numeros, bloco):
+        novas = pd.DataFrame(numeros, columns=self.numericas, index=bloco.index)
+        if self.alvo in bloco.columns:
+            novas[self.alvo] = bloco[self.alvo].astype(str).where(bloco[self.alvo].notna())
+        chaves = self._gerador.random(len(bloco))
+
+        if self.amostra is not None:
+            novas = pd.concat([self.amostra, novas])
+            chaves = np.concatenate([self._chaves, chaves])
+        if len(novas) > self.max_amostra:
+            manter = np.sort(np.argpartition(chaves, self.max_amostra)[:self.max_amostra])
+            novas, chaves = novas.iloc[manter], chaves[manter]
+        self.amostra, self._chaves = novas, chaves
+
+    @property
+    def amostrado(self):
+        """Indica se os histogramas e quantis vêm de uma amostra (e não de todas as linhas)."""
+        return self.amostra is not None and len(self.amostra) < self.linhas
+
+    def correlacao(self):
+        """
+        Retorna a matriz de correlação de Pearson das colunas numéricas (igual a `df.corr()`).
+
+        :return: DataFrame (colunas numéricas x colunas numéricas).
+        """
+        n = self._n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariancia = self._soma_produtos - self._soma * self._soma.T / n
+            variancia_i = self._soma_quadrados - self._soma ** 2 / n
+            variancia_j = variancia_i.T
+            correlacao = covariancia / np.sqrt(variancia_i * variancia_j)
+        correlacao = np.where(n > 1, np.clip(correlacao, -1, 1), np.nan)
+        return pd.DataFrame(correlacao, index=self.numericas, columns=self.numericas)
+
+    def descrever(self):
+        """
+        Retorna a descrição das colunas numéricas no formato de `df.describe()`.
+
+        Contagem, média, desvio, mínimo e máximo são exatos; os quartis vêm da amostra.
+
+        :return: DataFrame com as linhas count, mean, std, min, 25%, 50%, 75% e max.
+        """
+        contagem = np.diag(self._n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media_deslocada = np.diag(self._soma) / contagem
+            variancia = (np.diag(self._soma_quadrados) - contagem * media_deslocada ** 2) / (contagem - 1)
+        quartis = self.amostra[self.numericas].quantile([0.25, 0.5, 0.75]).to_numpy()
+
+        return pd.DataFrame(
+            [contagem, media_deslocada + self._deslocamento, np.sqrt(np.maximum(variancia, 0)),
+             np.where(contagem > 0, self._minimos, np.nan), *quartis, np.where(contagem > 0, self._maximos, np.nan)],
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], columns=self.numericas)
+
+    def histograma(self, coluna, bins=20):
+        """
+        Retorna o histograma de uma coluna numérica, entre o mínimo e o máximo exatos.
+
+        Com amostra, as contagens são escaladas para o total de valores não nulos da coluna.
+
+        :param coluna: Coluna numérica.
+        :param bins: Número de intervalos.
+        :return: Tupla (contagens, bordas).
+        """
+        indice = self.numericas.index(coluna)
+        valores = self.amostra[coluna].dropna().to_numpy()
+        minimo, maximo = self._minimos[indice], self._maximos[indice]
+        if not np.isfinite(minimo):
+            return np.zeros(bins), np.linspace(0, 1, bins + 1)
+        if minimo == maximo:
+            minimo, maximo = minimo - 0.5, maximo + 0.5  # Mesmo intervalo que o `np.histogram` usaria
+
+        contagens, bordas = np.histogram(valores, bins=bins, range=(minimo, maximo))
+        if len(valores):
+            contagens = contagens * (self._n[indice, indice] / len(valores))
+        return contagens, bordas
+
+    def estatisticas_caixa(self, coluna):
+        """
+        Retorna as estatísticas do boxplot de uma coluna numérica para cada valor de OUTCOME.
+
+        Os quartis e os bigodes (1,5 vez a distância interquartil) vêm da amostra, no
+        formato aceito por `Axes.bxp` do matplotlib.
+
+        :param coluna: Coluna numérica.
+        :return: Lista de dicionários (um por valor de OUTCOME).
+        """
+        caixas = []
+        for rotulo, valores in self.amostra.groupby(self.alvo, sort=True)[coluna]:
+            valores = np.sort(valores.dropna().to_numpy())
+            if len(valores) == 0:
+                continue
+            q1, mediana, q3 = np.percentile(valores, [25, 50, 75])
+            distancia = q3 - q1
+            dentro = valores[(valores >= q1 - 1.5 * distancia) & (valores <= q3 + 1.5 * distancia)]
+            fora = valores[(valores < q1 - 1.5 * distancia) | (valores > q3 + 1.5 * distancia)]
+            if len(fora) > MAX_FLIERS:
+                fora = fora[np.linspace(0, len(fora) - 1, MAX_FLIERS).astype(int)]
+            caixas.append({
+                "label": str(rotulo), "med": mediana, "q1": q1, "q3": q3,
+                "whislo": dentro.min() if len(dentro) else q1, "whishi": dentro.max() if len(dentro) else q3,
+                "fliers": fora,
+            })
+        return caixas
+
+    def tabela_por_alvo(self, coluna):
+        """
+        Retorna a contagem de cada valor de uma coluna categórica para cada valor de OUTCOME.
+
+        :param coluna: Coluna categórica.
+        :return: DataFrame (valores da coluna x valores de OUTCOME).
+        """
+        return self.contagens_por_alvo[coluna].unstack(fill_value=0)
+
+    def __repr__(self):
+        return (f"ResumoEDA(linhas={self.linhas}, numericas={len(self.numericas or [])}, "
+                f"categoricas={len(self.categoricas or [])}, amostra={0 if self.amostra is None else len(self.amostra)})")
+
+
+# Função que percorre a fonte uma única vez e calcula o resumo
+def resumir(fonte, alvo=COLUNA_ALVO, colunas_ignoradas=COLUNAS_IGNORADAS, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+            max_amostra=MAX_AMOSTRA, semente=0, diretorio_cache=DIRETORIO_CACHE_PADRAO):
+    """
+    Calcula o `ResumoEDA` de um DataFrame ou de um arquivo, em uma única passada.
+
+    Arquivos (CSV, Parquet ou URL) são lidos em blocos e só com as colunas usadas; um
+    DataFrame já carregado é percorrido em fatias de `tamanho_bloco` linhas.
+
+    Exemplo:
+        resumo = resumir(carregar_bruto())
+        desenhar(resumo, "correlacao")
+
+    :param fonte: DataFrame, caminho de um arquivo .csv/.parquet ou URL de um CSV.
+    :param alvo: Coluna do resultado (OUTCOME).
+    :param colunas_ignoradas: Colunas deixadas de fora do resumo.
+    :param tamanho_bloco: Número de linhas por bloco.
+    :param max_amostra: Tamanho máximo da amostra dos histogramas e quantis.
+    :param semente: Semente da amostra.
+    :param diretorio_cache: Diretório onde URLs são baixadas.
+    :return: `ResumoEDA`.
+    """
+    resumo = ResumoEDA(alvo, max_amostra, semente)
+
+    if isinstance(fonte, pd.DataFrame):
+        fonte = fonte.drop(columns=[coluna for coluna in colunas_ignoradas if coluna in fonte.columns])
+        for inicio in range(0, len(fonte), tamanho_bloco):
+            resumo.atualizar(fonte.iloc[inicio:inicio + tamanho_bloco])
+        if len(fonte) == 0:
+            resumo.atualizar(fonte)
+        return resumo
+
+    caminho = _arquivo_local(fonte, diretorio_cache)
+    if str(caminho).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        nomes = pq.ParquetFile(caminho).schema_arrow.names
+    else:
+        nomes = list(pd.read_csv(caminho, nrows=0).columns)
+    colunas = [nome for nome in nomes if nome not in colunas_ignoradas]
+
+    for bloco in ler_blocos(caminho, tamanho_bloco, _colunas_texto(caminho, colunas, tamanho_bloco), colunas):
+        resumo.atualizar(bloco)
+    return resumo
+
+
+# Função que decide quais colunas do CSV são lidas como texto
+def _colunas_texto(caminho, colunas, tamanho_bloco):
+    """
+    Colunas do CSV que o `pd.read_csv` leria como texto, inferidas pelas primeiras linhas.
+
+    Assim a separação entre colunas numéricas e categóricas é a mesma de um DataFrame
+    carregado com `carregar_bruto` (uma coluna codificada que tenha valores numéricos
+    continua numérica), e as colunas de texto não mudam de tipo de um bloco para outro.
+    No Parquet o tipo vem do próprio arquivo.
+
+    :param caminho: Caminho do arquivo.
+    :param colunas: Colunas lidas do arquivo.
+    :param tamanho_bloco: Número de linhas usadas na inferência.
+    :return: Lista com as colunas de texto.
+    """
+    if str(caminho).endswith(".parquet"):
+        return []
+    inicio = pd.read_csv(caminho, nrows=tamanho_bloco, usecols=colunas)
+    return [coluna for coluna in colunas if not pd.api.types.is_numeric_dtype(inicio[coluna])]
+
+
+# Funções que extraem do resumo só o que cada gráfico precisa (é isso que vai para os processos)
+def _dados_figura(resumo, nome, coluna=None):
+    amostra = f" (amostra de {len(resumo.amostra)} linhas)" if resumo.amostrado else ""
+    if nome == "histogramas":
+        return {"histogramas": {coluna: resumo.histograma(coluna) for coluna in resumo.numericas},
+                "titulo": "Distribuição das Features Numéricas" + amostra}
+    if nome == "categoricas":
+        return {"contagens": {coluna: resumo.contagens[coluna] for coluna in resumo.categoricas
+                              if coluna != resumo.alvo}}
+    if nome == "correlacao":
+        return {"correlacao": resumo.correlacao()}
+    if nome == "alvo":
+        return {"contagem": resumo.contagens[resumo.alvo], "alvo": resumo.alvo}
+    if nome == "caixa":
+        return {"caixas": resumo.estatisticas_caixa(coluna), "coluna": coluna, "alvo": resumo.alvo,
+                "amostra": amostra}
+    if nome == "por_alvo":
+        return {"tabela": resumo.tabela_por_alvo(coluna), "coluna": coluna, "alvo": resumo.alvo}
+    raise ValueError(f"Gráfico desconhecido: {nome}")
+
+
+# Função que desenha um gráfico a partir dos dados extraídos do resumo
+def _desenhar(nome, dados):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    if nome == "histogramas":
+        histogramas = dados["histogramas"]
+        colunas_grade = 3
+        linhas_grade = max(1, -(-len(histogramas) // colunas_grade))
+        figura, eixos = plt.subplots(linhas_grade, colunas_grade, figsize=(15, 10), squeeze=False)
+        for eixo, (coluna, (contagens, bordas)) in zip(eixos.flat, histogramas.items()):
+            eixo.stairs(contagens, bordas, fill=True)
+            eixo.set_title(coluna)
+        for eixo in eixos.flat[len(histogramas):]:
+            eixo.set_visible(False)
+        figura.suptitle(dados["titulo"])
+
+    elif nome == "categoricas":
+        contagens = dados["contagens"]
+        colunas_grade = 3
+        linhas_grade = max(1, -(-len(contagens) // colunas_grade))
+        figura, eixos = plt.subplots(linhas_grade, colunas_grade, figsize=(20, 5 * linhas_grade), squeeze=False)
+        for eixo, (coluna, contagem) in zip(eixos.flat, contagens.items()):
+            categorias = [str(valor) for valor in contagem.index]
+            sns.barplot(x=categorias, y=contagem.to_numpy(), hue=categorias, palette='Set3', legend=False, ax=eixo)
+            eixo.set_title(f'Distribuição de {coluna}', fontsize=12)
+            eixo.tick_params(axis='x', rotation=45, labelsize=10)
+            eixo.set_xlabel('Categorias', fontsize=10)
+            eixo.set_ylabel('Contagem', fontsize=10)
+        for eixo in eixos.flat[len(contagens):]:
+            eixo.set_visible(False)
+        figura.tight_layout()
+
+    elif nome == "correlacao":
+        figura, eixo = plt.subplots(figsize=(12, 8))
+        sns.heatmap(dados["correlacao"], annot=True, cmap='coolwarm', fmt='.2f', ax=eixo)
+        eixo.set_title('Matriz de Correlação (Apenas Colunas Numéricas)')
+
+    elif nome == "alvo":
+        figura, eixo = plt.subplots(figsize=(8, 6))
+        categorias = [str(valor) for valor in dados["contagem"].index]
+        sns.barplot(x=categorias, y=dados["contagem"].to_numpy(), hue=categorias, palette='Set2', legend=False,
+                    ax=eixo)
+        eixo.set_title('Distribuição do Outcome')
+        eixo.set_xlabel('Outcome')
+        eixo.set_ylabel('Contagem')
+
+    elif nome == "caixa":
+        figura, eixo = plt.subplots(figsize=(10, 6))
+        cores = sns.color_palette('Set2', len(dados["caixas"]))
+        caixas = eixo.bxp(dados["caixas"], patch_artist=True)
+        for caixa, cor in zip(caixas["boxes"], cores):
+            caixa.set_facecolor(cor)
+        eixo.set_title(f'Relação entre {dados["coluna"]} e Outcome{dados["amostra"]}')
+        eixo.set_xlabel('Outcome')
+        eixo.set_ylabel(dados["coluna"])
+
+    elif nome == "por_alvo":
+        figura, eixo = plt.subplots(figsize=(10, 6))
+        tabela = dados["tabela"].stack().rename("Contagem").reset_index()
+        tabela[dados["coluna"]] = tabela[dados["coluna"]].astype(str)
+        tabela[dados["alvo"]] = tabela[dados["alvo"]].astype(str)
+        sns.barplot(data=tabela, x=dados["coluna"], y="Contagem", hue=dados["alvo"], palette='Set2', ax=eixo)
+        eixo.set_title(f'Relação entre {dados["coluna"]} e Outcome')
+        eixo.set_ylabel('Contagem')
+
+    else:
+        raise ValueError(f"Gráfico desconhecido: {nome}")
+    return figura
+
+
+# Função usada pelo notebook para mostrar um gráfico do resumo
+def desenhar(resumo, nome, coluna=None):
+    """
+    Desenha um dos gráficos da EDA a partir do resumo, sem reler os dados.
+
+    Gráficos disponíveis:
+    - "histogramas": histogramas das colunas numéricas (`df.hist`);
+    - "categoricas": contagem de cada valor das colunas categóricas;
+    - "correlacao": matriz de correlação das colunas numéricas;
+    - "alvo": contagem de cada valor de OUTCOME;
+    - "caixa": boxplot da coluna numérica `coluna` para cada valor de OUTCOME;
+    - "por_alvo": contagem dos valores da coluna categórica `coluna` para cada valor de OUTCOME.
+
+    :param resumo: `ResumoEDA` calculado por `resumir`.
+    :param nome: Nome do gráfico.
+    :param coluna: Coluna dos gráficos "caixa" e "por_alvo".
+    :return: Figura do matplotlib.
+    """
+    return _desenhar(nome, _dados_figura(resumo, nome, coluna))
+
+
+# Função executada em cada processo: desenha um gráfico e grava o PNG
+def _renderizar(nome, dados, caminho):
+    import matplotlib
+    matplotlib.use("Agg")  # Sem janela: os processos só gravam arquivos
+    import matplotlib.pyplot as plt
+
+    figura = _desenhar(nome, dados)
+    figura.savefig(caminho, dpi=100, bbox_inches="tight")
+    plt.close(figura)
+    return caminho
+
+
+# Função principal: gera o relatório estático em HTML com os PNGs
+def gerar_relatorio(fonte, diretorio_saida, workers=None, **opcoes):
+    """
+    Gera o relatório da EDA: uma passada pelos dados e os gráficos desenhados em paralelo.
+
+    Cria em `diretorio_saida` um PNG por gráfico e um `index.html` com as tabelas (dados
+    faltantes, descrição das colunas numéricas e contagens das categóricas) e as figuras.
+    Com `workers` > 1, cada gráfico é desenhado em um processo do pool, que recebe só os
+    dados daquele gráfico (contagens, bordas, quartis), nunca as linhas.
+
+    Exemplo:
+        gerar_relatorio("seguros.csv", "relatorio", workers=4)
+
+    :param fonte: DataFrame, `ResumoEDA` já calculado, caminho de arquivo ou URL.
+    :param diretorio_saida: Diretório do relatório.
+    :param workers: Número de processos. None usa todos os núcleos.
+    :param opcoes: Opções repassadas para `resumir` (exemplo: max_amostra).
+    :return: Dicionário com o caminho do HTML, o resumo e os segundos gastos no resumo e nos gráficos.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    resumo = fonte if isinstance(fonte, ResumoEDA) else resumir(fonte, **opcoes)
+    segundos_resumo = time.perf_counter() - inicio
+
+    figuras = [("histogramas", None), ("categoricas", None), ("correlacao", None)]
+    if resumo.alvo in resumo.categoricas:  # Gráficos contra o OUTCOME, se a coluna existir
+        figuras.append(("alvo", None))
+        figuras += [("caixa", coluna) for coluna in resumo.numericas]
+        figuras += [("por_alvo", coluna) for coluna in resumo.categoricas if coluna != resumo.alvo]
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    tarefas = []
+    for nome, coluna in figuras:
+        arquivo = f"{nome}_{coluna}.png" if coluna else f"{nome}.png"
+        tarefas.append((nome, _dados_figura(resumo, nome, coluna), os.path.join(diretorio_saida, arquivo)))
+
+    inicio = time.perf_counter()
+    if workers <= 1:
+        for tarefa in tarefas:
+            _renderizar(*tarefa)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for futuro in [pool.submit(_renderizar, *tarefa) for tarefa in tarefas]:
+                futuro.result()
+    segundos_graficos = time.perf_counter() - inicio
+
+    caminho_html = os.path.join(diretorio_saida, "index.html")
+    with open(caminho_html, "w", encoding="utf-8") as arquivo:
+        arquivo.write(_html(resumo, [os.path.basename(caminho) for _, _, caminho in tarefas]))
+
+    return {"html": caminho_html, "resumo": resumo, "segundos_resumo": segundos_resumo,
+            "segundos_graficos": segundos_graficos}
+
+
+# Função que monta a página do relatório
+def _html(resumo, imagens):
+    partes = [
+        "<!DOCTYPE html>",
+        '<html lang="pt-BR"><head><meta charset="utf-8"><title>Análise Exploratória</title>',
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}"
+        "td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}img{max-width:100%}</style>",
+        "</head><body>",
+        "<h1>Análise Exploratória</h1>",
+        f"<p>{resumo.linhas} linhas.",
+    ]
+    if resumo.amostrado:
+        partes.append(f" Histogramas, quartis e boxplots calculados sobre uma amostra de {len(resumo.amostra)} linhas.")
+    partes.append("</p>")
+
+    partes.append("<h2>Dados Faltantes</h2>")
+    partes.append(resumo.faltantes.to_frame("faltantes").to_html())
+    partes.append("<h2>Colunas Numéricas</h2>")
+    partes.append(resumo.descrever().to_html(float_format=lambda valor: f"{valor:.4g}"))
+
+    partes.append("<h2>Gráficos</h2>")
+    for imagem in imagens:
+        partes.append(f'<p><img src="{html.escape(imagem)}" alt="{html.escape(imagem)}"></p>')
+
+    partes.append("<h2>Colunas Categóricas</h2>")
+    for coluna in resumo.categoricas:
+        partes.append(f"<h3>{html.escape(str(coluna))}</h3>")
+        partes.append(resumo.contagens[coluna].sort_values(ascending=False).to_frame("contagem").to_html())
+
+    partes.append("</body></html>")
+    return "\n".join(partes)
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando.
+
+    Exemplos:
+        python eda.py seguros.csv --saida relatorio
+        python eda.py seguros.parquet --saida relatorio --workers 4 --max-amostra 100000
+    """
+    from preprocessamento import URL_DADOS
+
+    parser = argparse.ArgumentParser(description="Relatório de análise exploratória do dataset de seguros.")
+    parser.add_argument("fonte", nargs="?", default=URL_DADOS, help="Arquivo .csv/.parquet ou URL do CSV")
+    parser.add_argument("--saida", default="relatorio", help="Diretório do relatório")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO, help="Linhas por bloco")
+    parser.add_argument("--max-amostra", type=int, default=MAX_AMOSTRA, help="Linhas da amostra")
+    args = parser.parse_args(argumentos)
+
+    resultado = gerar_relatorio(args.fonte, args.saida, workers=args.workers, tamanho_bloco=args.tamanho_bloco,
+                                max_amostra=args.max_amostra)
+    print(f"{resultado['resumo'].linhas} linhas resumidas em {resultado['segundos_resumo']:.2f} s, "
+          f"gráficos em {resultado['segundos_graficos']:.2f} s")
+    print(f"Relatório: {resultado['html']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from preprocessamento import (COLUNA_ALVO, COLUNAS_CODIFICADAS, TAMANHO_BLOCO_PADRAO, TEM_PYARROW,
+                              VERSAO_PREPROCESSAMENTO, hash_conteudo, ler_blocos, preprocessar_bloco)
+
+# Versão do formato do artefato: mudar esta constante impede carregar artefatos antigos
+VERSAO_ARTEFATO = 2
+
+BLOCOS_POR_WORKER = 2  # Blocos enviados ao pool por processo antes de esperar o primeiro resultado
+
+# Parâmetros da floresta treinada no notebook
+PARAMETROS_NOTEBOOK = {"random_state": 42, "n_estimators": 200, "max_depth": 10, "class_weight": "balanced"}
+
+# Artefato do processo: cada processo do pool carrega o modelo uma única vez, no inicializador
+_ARTEFATO = {}
+
+
+# Classe do modelo treinado junto com tudo que é preciso para usá-lo fora do notebook
+class ArtefatoModelo:
+    """
+    Modelo treinado, a ordem exata das colunas de X e as categorias das colunas codificadas.
+
+    Cada chamada de `salvar` cria uma nova versão no diretório (v0001, v0002, ...), com o
+    modelo em `modelo.joblib` e os metadados em `metadados.json`: colunas, colunas
+    codificadas com o tipo e os valores de cada uma no treino, classes, versões do
+    pré-processamento e das bibliotecas e o hash do arquivo do modelo, conferido ao carregar.
+
+    Exemplo:
+        bruto = carregar_bruto()
+        X, y = separar_features(preprocessar(bruto))
+        model.fit(X, y)
+        ArtefatoModelo(model, X, categorias=descrever_categorias(bruto)).salvar("modelos")
+        artefato = ArtefatoModelo.carregar("modelos")  # Última versão
+
+    :param modelo: Classificador já treinado.
+    :param X: DataFrame de features usado no treino (ou a lista das colunas, na ordem).
+    :param colunas_codificadas: Colunas brutas codificadas com one-hot.
+    :param metadados: Dicionário com informações extras (exemplo: métricas de avaliação).
+    :param categorias: Tipo e valores das colunas codificadas no treino
+                       (`preprocessamento.descrever_categorias` do DataFrame bruto).
+    """
+
+    def __init__(self, modelo, X, colunas_codificadas=COLUNAS_CODIFICADAS, metadados=None, categorias=None):
+        self.modelo = modelo
+        self.colunas = [str(coluna) for coluna in getattr(X, "columns", X)]
+        self.colunas_codificadas = list(colunas_codificadas)
+        self.metadados = dict(metadados or {})
+        self.categorias = categorias
+        self.versao = None  # Preenchida ao salvar ou carregar
+
+        nomes_treino = getattr(modelo, "feature_names_in_", None)
+        if nomes_treino is not None and list(nomes_treino) != self.colunas:
+            raise ValueError("As colunas não correspondem às usadas no treino do modelo")
+
+    def salvar(self, diretorio):
+        """
+        Grava o artefato como uma nova versão em `diretorio`.
+
+        :param diretorio: Diretório dos artefatos.
+        :return: Caminho do diretório da versão criada.
+        """
+        # Sem as categorias, a pontuação não consegue alinhar os tipos das colunas codificadas
+        faltando = [coluna for coluna in self.colunas_codificadas
+                    if any(nome.startswith(f"{coluna}_") for nome in self.colunas)
+                    and coluna not in (self.categorias or {})]
+        if faltando:
+            raise ValueError(f"Informe as categorias do treino (descrever_categorias) para: {faltando}")
+
+        os.makedirs(diretorio, exist_ok=True)
+
+        # Cria o diretório da versão com os arquivos completos e só então o renomeia, para que
+        # `carregar` nunca encontre uma versão pela metade
+        temporario = tempfile.mkdtemp(prefix=".tmp", dir=diretorio)
+        try:
+            caminho_modelo = os.path.join(temporario, "modelo.joblib")
+            joblib.dump(self.modelo, caminho_modelo)
+
+            metadados = {
+                "versao_artefato": VERSAO_ARTEFATO,
+                "versao_preprocessamento": VERSAO_PREPROCESSAMENTO,
+                "criado_em": datetime.now(timezone.utc).isoformat(),
+                "colunas": self.colunas,
+                "colunas_codificadas": self.colunas_codificadas,
+                "categorias": self.categorias,
+                "classes": [str(classe) for classe in getattr(self.modelo, "classes_", [])],
+                "parametros": {nome: repr(valor) for nome, valor in self.modelo.get_params().items()},
+                "bibliotecas": {"scikit-learn": sklearn.__version__, "pandas": pd.__version__,
+                                "numpy": np.__version__},
+                "sha1_modelo": hash_conteudo(caminho_modelo),
+                "extras": self.metadados,
+            }
+            with open(os.path.join(temporario, "metadados.json"), "w", encoding="utf-8") as arquivo:
+                json.dump(metadados, arquivo, indent=2, ensure_ascii=False, default=str)
+
+            # Se outro processo criar a mesma versão ao mesmo tempo, tenta a seguinte
+            while True:
+                versao = _ultima_versao(diretorio) + 1
+                destino = os.path.join(diretorio, f"v{versao:04d}")
+                try:
+                    os.rename(temporario, destino)
+                    break
+                except OSError:
+                    if not os.path.exists(destino):
+                        raise
+        except BaseException:
+            shutil.rmtree(temporario, ignore_errors=True)
+            raise
+
+        self.versao = versao
+        return destino
+
+    @classmethod
+    def carregar(cls, diretorio, versao=None):
+        """
+        Carrega uma versão do artefato.
+
+        :param diretorio: Diretório dos artefatos (ou o diretório de uma versão).
+        :param versao: Número da versão; None carrega a última.
+        :return: `ArtefatoModelo`, com o tempo de carregamento em `segundos_carregamento`.
+        """
+        inicio = time.perf_counter()
+        caminho = _diretorio_versao(diretorio, versao)
+        with open(os.path.join(caminho, "metadados.json"), encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+
+        if metadados["versao_artefato"] != VERSAO_ARTEFATO:
+            raise ValueError(f"Formato de artefato {metadados['versao_artefato']} não suportado "
+                             f"(esperado: {VERSAO_ARTEFATO})")
+        if metadados["versao_preprocessamento"] != VERSAO_PREPROCESSAMENTO:
+            raise ValueError("O artefato foi criado com outra versão do pré-processamento")
+
+        caminho_modelo = os.path.join(caminho, "modelo.joblib")
+        if hash_conteudo(caminho_modelo) != metadados["sha1_modelo"]:
+            raise ValueError(f"O arquivo do modelo em {caminho} está corrompido")
+
+        artefato = cls(joblib.load(caminho_modelo), metadados["colunas"], metadados["colunas_codificadas"],
+                       metadados.get("extras"), metadados["categorias"])
+        artefato.versao = int(os.path.basename(os.path.normpath(caminho))[1:])
+        artefato.segundos_carregamento = time.perf_counter() - inicio
+        return artefato
+
+    def codificar(self, bloco):
+        """
+        Aplica a codificação do treino a um bloco de linhas brutas.
+
+        As colunas codificadas são convertidas ao tipo do treino antes do one-hot; valores
+        que não existiam no treino geram um aviso e ficam com as dummies zeradas.
+
+        :param bloco: DataFrame com as colunas do CSV original.
+        :return: DataFrame com as colunas do treino, na mesma ordem.
+        """
+        return preprocessar_bloco(bloco, self.colunas, self.colunas_codificadas, self.categorias)
+
+    def prever(self, bloco):
+        """
+        Prevê o OUTCOME de um bloco de linhas brutas.
+
+        A previsão é a classe de maior probabilidade, a mesma de `modelo.predict`, calculada
+        a partir de um único `predict_proba`.
+
+        :param bloco: DataFrame com as colunas do CSV original.
+        :return: DataFrame com ID (se existir), OUTCOME previsto e a probabilidade de cada classe.
+        """
+        probabilidades = self.modelo.predict_proba(self.codificar(bloco))
+        classes = self.modelo.classes_
+
+        resultado = {}
+        if "ID" in bloco.columns:
+            resultado["ID"] = bloco["ID"].to_numpy()
+        resultado[COLUNA_ALVO] = classes[np.argmax(probabilidades, axis=1)]
+        for indice, classe in enumerate(classes):
+            resultado[f"PROBABILIDADE_{classe}"] = probabilidades[:, indice].astype(np.float32)
+        return pd.DataFrame(resultado, index=bloco.index)
+
+    def __repr__(self):
+        return (f"ArtefatoModelo(versao={self.versao}, modelo={type(self.modelo).__name__}, "
+                f"colunas={len(self.colunas)})")
+
+
+# Função que retorna o maior número de versão já gravado em um diretório
+def _ultima_versao(diretorio):
+    versoes = [int(nome[1:]) for nome in os.listdir(diretorio)
+               if nome.startswith("v") and nome[1:].isdigit()
+               and os.path.exists(os.path.join(diretorio, nome, "metadados.json"))]
+    return max(versoes, default=0)
+
+
+# Função que localiza o diretório de uma versão do artefato
+def _diretorio_versao(diretorio, versao):
+    if os.path.exists(os.path.join(diretorio, "metadados.json")):
+        return diretorio  # Já é o diretório de uma versão
+    if versao is None:
+        versao = _ultima_versao(diretorio)
+        if versao == 0:
+            raise FileNotFoundError(f"Nenhum artefato em {diretorio}")
+    caminho = os.path.join(diretorio, f"v{versao:04d}")
+    if not os.path.exists(os.path.join(caminho, "metadados.json")):
+        raise FileNotFoundError(f"Versão {versao} não encontrada em {diretorio}")
+    return caminho
+
+
+# Classe que grava os resultados à medida que os blocos ficam prontos
+class _Escritor:
+    def __init__(self, saida):
+        self.saida = saida
+        self.parquet = str(saida).endswith(".parquet")
+        if self.parquet and not TEM_PYARROW:
+            raise ImportError("Gravar arquivos Parquet precisa do pyarrow instalado")
+        self.arquivo = None
+
+    def gravar(self, resultado):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabela = pa.Table.from_pandas(resultado, preserve_index=False)
+            if self.arquivo is None:
+                self.arquivo = pq.ParquetWriter(self.saida, tabela.schema)
+            self.arquivo.write_table(tabela)
+        else:
+            primeiro = self.arquivo is None
+            if primeiro:
+                self.arquivo = open(self.saida, "w", encoding="utf-8", newline="")
+            resultado.to_csv(self.arquivo, header=primeiro, index=False)
+
+    def fechar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+
+
+# Funções executadas em cada processo do pool
+def _inicializar_processo(diretorio, versao):
+    artefato = ArtefatoModelo.carregar(diretorio, versao)
+    artefato.modelo.set_params(n_jobs=1)  # Os núcleos já são divididos entre os processos
+    _ARTEFATO["artefato"] = artefato
+
+
+def _prever_bloco(bloco):
+    return _ARTEFATO["artefato"].prever(bloco)
+
+
+# Função principal: pontuação em lote de um arquivo
+def pontuar_arquivo(modelo, entrada, saida, versao=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO, workers=None):
+    """
+    Prevê o OUTCOME de todas as linhas de um arquivo, bloco a bloco, gravando os resultados aos poucos.
+
+    O arquivo nunca é carregado inteiro: cada bloco é lido, codificado com as colunas do
+    artefato, previsto e gravado. Com `workers` > 1, os blocos são previstos em um pool de
+    processos (cada um carrega o artefato uma vez), com no máximo `BLOCOS_POR_WORKER`
+    blocos por processo em andamento, e são gravados na ordem de leitura. Com `workers` <= 1,
+    os blocos são previstos no próprio processo, usando todos os núcleos (n_jobs=-1).
+
+    Exemplo:
+        pontuar_arquivo("modelos", "apolices.csv", "previsoes.parquet", workers=4)
+
+    :param modelo: Diretório dos artefatos (ou de uma versão).
+    :param entrada: Arquivo .csv ou .parquet com as colunas do CSV original.
+    :param saida: Arquivo .csv ou .parquet de saída (ID, OUTCOME e probabilidades).
+    :param versao: Versão do artefato; None usa a última.
+    :param tamanho_bloco: Número de linhas por bloco.
+    :param workers: Número de processos. None usa todos os núcleos.
+    :return: Dicionário com linhas, blocos, segundos de carregamento do modelo, segundos
+             totais e linhas por segundo.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    artefato = ArtefatoModelo.carregar(modelo, versao)
+    segundos_carregamento = artefato.segundos_carregamento
+
+    linhas = 0
+    blocos = 0
+    escritor = _Escritor(saida)
+    try:
+        if workers <= 1:
+            artefato.modelo.set_params(n_jobs=-1)
+            for bloco in ler_blocos(entrada, tamanho_bloco, artefato.colunas_codificadas):
+                resultado = artefato.prever(bloco)
+                escritor.gravar(resultado)
+                linhas += len(resultado)
+                blocos += 1
+        else:
+            caminho = _diretorio_versao(modelo, artefato.versao)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_processo,
+                                     initargs=(caminho, None)) as pool:
+                # Fila limitada de blocos em andamento, na ordem de leitura
+                em_andamento = []
+                for bloco in ler_blocos(entrada, tamanho_bloco, artefato.colunas_codificadas):
+                    em_andamento.append(pool.submit(_prever_bloco, bloco))
+                    if len(em_andamento) >= workers * BLOCOS_POR_WORKER:
+                        resultado = em_andamento.pop(0).result()
+                        escritor.gravar(resultado)
+                        linhas += len(resultado)
+                        blocos += 1
+                for futuro in em_andamento:
+                    resultado = futuro.result()
+                    escritor.gravar(resultado)
+                    linhas += len(resultado)
+                    blocos += 1
+    finally:
+        escritor.fechar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "linhas": linhas,
+        "blocos": blocos,
+        "versao_modelo": artefato.versao,
+        "segundos_carregamento": segundos_carregamento,
+        "segundos_total": segundos,
+        "linhas_por_segundo": linhas / segundos if segundos > 0 else 0.0,
+    }
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando.
+
+    Exemplos:
+        python inferencia.py treinar dados.csv --modelos modelos
+        python inferencia.py pontuar apolices.csv previsoes.csv --modelos modelos --workers 4
+    """
+    parser = argparse.ArgumentParser(description="Artefatos do modelo de OUTCOME e pontuação em lote.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    treinar = subparsers.add_parser("treinar", help="Treina a floresta do notebook e salva uma nova versão")
+    treinar.add_argument("fonte", nargs="?", help="Caminho ou URL do CSV (padrão: dataset do notebook)")
+    treinar.add_argument("--modelos", default="modelos", help="Diretório dos artefatos")
+
+    pontuar = subparsers.add_parser("pontuar", help="Prevê o OUTCOME de um arquivo CSV ou Parquet")
+    pontuar.add_argument("entrada", help="Arquivo .csv ou .parquet")
+    pontuar.add_argument("saida", help="Arquivo .csv ou .parquet de saída")
+    pontuar.add_argument("--modelos", default="modelos", help="Diretório dos artefatos")
+    pontuar.add_argument("--versao", type=int, help="Versão do artefato (padrão: a última)")
+    pontuar.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO, help="Linhas por bloco")
+    pontuar.add_argument("--workers", type=int, help="Número de processos (padrão: todos os núcleos)")
+
+    args = parser.parse_args(argumentos)
+
+    if args.comando == "treinar":
+        from sklearn.ensemble import RandomForestClassifier
+
+        from preprocessamento import URL_DADOS, carregar_bruto, carregar_dados, descrever_categorias, separar_features
+
+        X, y = separar_features(carregar_dados(args.fonte or URL_DADOS))
+        categorias = descrever_categorias(carregar_bruto(args.fonte or URL_DADOS))
+        inicio = time.perf_counter()
+        modelo = RandomForestClassifier(**PARAMETROS_NOTEBOOK, n_jobs=-1).fit(X, y)
+        segundos = time.perf_counter() - inicio
+
+        caminho = ArtefatoModelo(modelo, X, metadados={"linhas_treino": len(X), "segundos_treino": segundos},
+                                 categorias=categorias).salvar(args.modelos)
+        print(f"Modelo treinado em {segundos:.2f} s e salvo em {caminho}")
+        return 0
+
+    estatisticas = pontuar_arquivo(args.modelos, args.entrada, args.saida, versao=args.versao,
+                                   tamanho_bloco=args.tamanho_bloco, workers=args.workers)
+    print(f"Modelo v{estatisticas['versao_modelo']} carregado em {estatisticas['segundos_carregamento']:.3f} s")
+    print(f"{estatisticas['linhas']} linhas em {estatisticas['blocos']} blocos, "
+          f"{estatisticas['segundos_total']:.2f} s ({estatisticas['linhas_por_segundo']:.0f} linhas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
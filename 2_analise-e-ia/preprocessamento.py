@@ -0,0 +1,474 @@
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import urllib.request
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Dataset de "insurance claims" usado no notebook analise_e_modelos.ipynb
+URL_DADOS = 'https://drive.google.com/uc?export=download&id=1wgUnkmZ1H0ew-uBpQCJUKxrYOQCqyy2q'
+
+# Colunas categóricas codificadas com one-hot (as mesmas de `columns_to_encode` no notebook)
+COLUNAS_CODIFICADAS = [
+    'GENDER', 'RACE', 'DRIVING_EXPERIENCE', 'EDUCATION', 'INCOME',
+    'VEHICLE_OWNERSHIP', 'VEHICLE_YEAR', 'VEHICLE_TYPE', 'MARRIED',
+    'CHILDREN', 'LOCALITY'
+]
+
+COLUNA_ALVO = 'OUTCOME'
+COLUNAS_FORA_DAS_FEATURES = ['OUTCOME', 'ID']
+
+# Contagens por motorista, gravadas sempre como int16 (um tipo fixo, que não depende dos valores
+# de cada arquivo); se algum valor não couber, a coluna usa o menor tipo inteiro que o comporta
+COLUNAS_CONTAGEM = ['SPEEDING_VIOLATIONS', 'DUIS', 'PAST_ACCIDENTS']
+
+# Diretório padrão do cache (arquivos baixados e DataFrames já processados)
+DIRETORIO_CACHE_PADRAO = os.path.join(tempfile.gettempdir(), "case_turing_dados")
+
+# Versão do pré-processamento: mudar esta constante invalida os caches gravados antes
+VERSAO_PREPROCESSAMENTO = 2
+
+# Parquet precisa do pyarrow; sem ele o cache é gravado com pickle
+TEM_PYARROW = importlib.util.find_spec("pyarrow") is not None
+FORMATO_CACHE = "parquet" if TEM_PYARROW else "pickle"
+
+TAMANHO_BLOCO_PADRAO = 100_000  # Linhas por bloco na leitura de arquivos grandes
+
+
+# Função para converter uma faixa de idade em número
+def converter_idade(idade):
+    """
+    Converte uma faixa de idade em número (exemplo: '65+' -> 65, '26-39' -> 32.5).
+
+    :param idade: Valor da coluna AGE (texto, número ou nulo).
+    :return: Idade numérica ou None se o valor for nulo.
+    """
+    if pd.isna(idade):  # Verificar se o valor é nulo
+        return None
+    if isinstance(idade, str):  # Verificar se o valor é uma string
+        if idade == '65+':
+            return 65
+        elif '-' in idade:
+            inicio, fim = idade.split('-')
+            return (int(inicio) + int(fim)) / 2
+        else:
+            return int(idade)
+    return idade  # Se não for string, já é numérico
+
+
+# Função para converter a coluna AGE inteira
+def converter_idades(coluna):
+    """
+    Converte a coluna AGE em float32, chamando `converter_idade` uma vez por valor distinto.
+
+    A coluna tem poucas faixas distintas, então converter as categorias e depois mapear os
+    códigos é bem mais barato do que aplicar a função linha a linha.
+
+    :param coluna: Série com as faixas de idade.
+    :return: Série float32 (NaN para valores nulos).
+    """
+    categorias = coluna.astype("category")
+    valores = np.array([converter_idade(c) for c in categorias.cat.categories], dtype=np.float32)
+    codigos = categorias.cat.codes.to_numpy()
+    convertida = np.where(codigos >= 0, valores[codigos] if len(valores) else np.nan, np.nan).astype(np.float32)
+    return pd.Series(convertida, index=coluna.index, name=coluna.name)
+
+
+# Função para compactar uma coluna inteira
+def compactar_inteiros(coluna):
+    """
+    Troca o tipo de uma coluna inteira por um tipo menor, sem alterar os valores.
+
+    As colunas de `COLUNAS_CONTAGEM` viram int16; as demais usam o menor tipo inteiro que
+    comporta os valores (int8/int16/int32).
+
+    :param coluna: Série de tipo inteiro.
+    :return: Série com o tipo compacto.
+    """
+    if coluna.name in COLUNAS_CONTAGEM:
+        limites = np.iinfo(np.int16)
+        if coluna.empty or (limites.min <= coluna.min() and coluna.max() <= limites.max):
+            return coluna.astype(np.int16)
+    return pd.to_numeric(coluna, downcast="integer")
+
+
+# Função para reduzir os tipos de um DataFrame bruto
+def compactar_bruto(df):
+    """
+    Troca os tipos do DataFrame bruto por tipos compactos sem alterar os valores.
+
+    Colunas de texto viram `category` e colunas inteiras passam por `compactar_inteiros`
+    (contagens em int16, as demais no menor tipo inteiro).
+
+    :param df: DataFrame lido do CSV.
+    :return: Novo DataFrame com os tipos compactos.
+    """
+    colunas = {}
+    for nome, coluna in df.items():
+        if pd.api.types.is_integer_dtype(coluna):
+            colunas[nome] = compactar_inteiros(coluna)
+        elif pd.api.types.is_object_dtype(coluna) or pd.api.types.is_string_dtype(coluna):
+            colunas[nome] = coluna.astype("category")
+        else:
+            colunas[nome] = coluna
+    return pd.DataFrame(colunas, index=df.index)
+
+
+# Função que aplica o pré-processamento do notebook
+def preprocessar(df, colunas=COLUNAS_CODIFICADAS):
+    """
+    Aplica o pré-processamento do notebook: one-hot das colunas categóricas e AGE numérica.
+
+    É o mesmo `pd.get_dummies(df, columns=columns_to_encode, drop_first=True)` seguido de
+    `convert_age`, com tipos compactos: dummies uint8; AGE e as colunas reais em float32;
+    contagens de `COLUNAS_CONTAGEM` em int16 e os demais inteiros no menor tipo que os
+    comporta; colunas de texto que sobrarem como `category`, inclusive OUTCOME, que no CSV
+    é texto ("approved"/"denied"). Os modelos de árvore do scikit-learn convertem as
+    features para float32, então as previsões não mudam.
+
+    :param df: DataFrame bruto (lido do CSV ou de `carregar_bruto`).
+    :param colunas: Colunas a codificar; as que não existirem no DataFrame são ignoradas.
+    :return: DataFrame pré-processado.
+    """
+    colunas = [coluna for coluna in colunas if coluna in df.columns]  # Filtra colunas existentes
+
+    df = pd.get_dummies(df, columns=colunas, drop_first=True, dtype=np.uint8)
+    if 'AGE' in df.columns:
+        df['AGE'] = converter_idades(df['AGE'])
+
+    for nome in df.columns:
+        coluna = df[nome]
+        if pd.api.types.is_float_dtype(coluna) and coluna.dtype != np.float32:
+            df[nome] = coluna.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(coluna) and coluna.dtype != np.uint8:
+            df[nome] = compactar_inteiros(coluna)
+        elif pd.api.types.is_object_dtype(coluna) or pd.api.types.is_string_dtype(coluna):
+            df[nome] = coluna.astype("category")
+    return df
+
+
+# Função que registra o tipo e as categorias de cada coluna codificada nos dados de treino
+def descrever_categorias(df, colunas=COLUNAS_CODIFICADAS):
+    """
+    Descreve as colunas codificadas do DataFrame bruto de treino: tipo e valores distintos.
+
+    Os nomes das dummies dependem do tipo da coluna (1.0 gera "_1.0"; o texto "1" gera "_1"),
+    então `preprocessar_bloco` usa esta descrição para converter cada bloco ao tipo do treino.
+
+    :param df: DataFrame bruto usado no treino (lido do CSV ou de `carregar_bruto`).
+    :param colunas: Colunas codificadas com one-hot.
+    :return: Dicionário {coluna: {"tipo": nome do tipo, "valores": lista ordenada}}, pronto para JSON.
+    """
+    descricao = {}
+    for coluna in colunas:
+        if coluna not in df.columns:
+            continue
+        serie = df[coluna]
+        tipo = serie.cat.categories.dtype if isinstance(serie.dtype, pd.CategoricalDtype) else serie.dtype
+        valores = pd.unique(serie.dropna())
+        if _eh_numerico(str(tipo)):
+            valores = sorted(np.asarray(valores).tolist())
+        else:
+            valores = sorted(str(valor) for valor in valores)
+        descricao[coluna] = {"tipo": str(tipo), "valores": valores}
+    return descricao
+
+
+# Função que verifica se o nome de um tipo é numérico (inteiro ou real)
+def _eh_numerico(tipo):
+    try:
+        return np.dtype(tipo).kind in "iuf"
+    except TypeError:
+        return False  # Tipos do pandas como "category" ou "str"
+
+
+# Função que converte uma coluna de um bloco para o tipo que ela tinha no treino
+def _converter_como_treino(serie, descricao):
+    """
+    Converte a coluna ao tipo do treino e troca por nulo os valores que não existiam no treino.
+
+    :param serie: Coluna do bloco (normalmente texto, como lida por `ler_blocos`).
+    :param descricao: Entrada de `descrever_categorias` para a coluna.
+    :return: Tupla (coluna convertida, valores não vistos no treino).
+    """
+    if _eh_numerico(descricao["tipo"]):
+        convertida = pd.to_numeric(serie, errors="coerce")
+    else:
+        convertida = serie.where(serie.isna(), serie.astype(str))
+
+    desconhecidos = serie.notna() & ~convertida.isin(descricao["valores"])
+    novos = pd.unique(serie[desconhecidos])
+    convertida = convertida.where(~desconhecidos)  # As dummies dessas linhas ficam zeradas
+
+    if _eh_numerico(descricao["tipo"]):
+        tipo = np.dtype(descricao["tipo"])
+        convertida = convertida.astype("Int64" if tipo.kind in "iu" else tipo)  # Inteiros com nulos
+    return convertida, novos
+
+
+# Função que aplica o pré-processamento a um bloco de linhas, com as colunas de um modelo já treinado
+def preprocessar_bloco(df, colunas_features, colunas=COLUNAS_CODIFICADAS, categorias=None):
+    """
+    Codifica um bloco de linhas para que as colunas sejam exatamente `colunas_features`.
+
+    `preprocessar` usa `drop_first=True`, que descarta a primeira categoria em ordem
+    (ordem alfabética para texto, crescente para números) entre as que aparecem nos dados.
+    Em um bloco pequeno ela pode ser outra (ou faltar), então aqui todas as categorias
+    viram colunas e o resultado é reindexado pelas colunas do treino: a categoria
+    descartada no treino e as categorias desconhecidas ficam com todas as colunas da
+    variável zeradas, como no treino.
+
+    Com `categorias` (de `descrever_categorias`), cada coluna codificada é antes convertida
+    ao tipo do treino, e valores que não existiam no treino geram um aviso.
+
+    :param df: Bloco de linhas brutas (as colunas codificadas devem ser texto).
+    :param colunas_features: Colunas de X no treino, na mesma ordem.
+    :param colunas: Colunas a codificar com one-hot.
+    :param categorias: Tipo e valores de cada coluna codificada no treino, ou None.
+    :return: DataFrame com as colunas `colunas_features`.
+    """
+    colunas = [coluna for coluna in colunas if coluna in df.columns]  # Filtra colunas existentes
+
+    if categorias:
+        df = df.copy(deep=False)
+        for coluna in colunas:
+            if coluna in categorias:
+                df[coluna], novos = _converter_como_treino(df[coluna], categorias[coluna])
+                if len(novos):
+                    warnings.warn(f"{coluna}: {len(novos)} valor(es) que não existiam no treino "
+                                  f"(exemplo: {novos[0]!r}); as dummies dessas linhas ficam zeradas", stacklevel=2)
+
+    # Colunas que não são dummies precisam estar no bloco; as dummies ausentes são zeros
+    prefixos = tuple(f"{coluna}_" for coluna in colunas)
+    faltando = [nome for nome in colunas_features if nome not in df.columns and not nome.startswith(prefixos)]
+    if faltando:
+        raise ValueError(f"Colunas ausentes nos dados: {faltando}")
+
+    df = pd.get_dummies(df, columns=colunas, drop_first=False, dtype=np.uint8)
+    if 'AGE' in df.columns:
+        df['AGE'] = converter_idades(df['AGE'])
+    return df.reindex(columns=list(colunas_features), fill_value=0)
+
+
+# Função que lê um arquivo CSV ou Parquet em blocos
+def ler_blocos(entrada, tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunas_texto=COLUNAS_CODIFICADAS, colunas=None):
+    """
+    Lê um arquivo em blocos de até `tamanho_bloco` linhas, sem carregar o arquivo inteiro.
+
+    No CSV, as colunas codificadas são lidas como texto: o tipo inferido pelo pandas pode
+    mudar de um bloco para outro, e os nomes das dummies dependem dele.
+
+    :param entrada: Caminho de um arquivo .csv ou .parquet.
+    :param tamanho_bloco: Número de linhas por bloco.
+    :param colunas_texto: Colunas lidas como texto no CSV.
+    :param colunas: Colunas lidas do arquivo; None lê todas.
+    :return: Gerador de DataFrames, com o índice contando as linhas desde o início do arquivo.
+    """
+    if str(entrada).endswith(".parquet"):
+        if not TEM_PYARROW:
+            raise ImportError("Ler arquivos Parquet precisa do pyarrow instalado")
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(entrada)
+        inicio = 0
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas):
+            bloco = lote.to_pandas()
+            bloco.index = pd.RangeIndex(inicio, inicio + len(bloco))
+            inicio += len(bloco)
+            yield bloco
+    else:
+        yield from pd.read_csv(entrada, chunksize=tamanho_bloco, usecols=colunas,
+                               dtype={coluna: str for coluna in colunas_texto})
+
+
+# Função para separar as features do alvo
+def separar_features(df):
+    """
+    Separa o DataFrame pré-processado em features (X) e alvo (y), como no notebook.
+
+    :param df: DataFrame pré-processado.
+    :return: Tupla (X, y), com X sem as colunas OUTCOME e ID.
+    """
+    X = df.drop(columns=[coluna for coluna in COLUNAS_FORA_DAS_FEATURES if coluna in df.columns])
+    y = df[COLUNA_ALVO]
+    return X, y
+
+
+# Função para obter o arquivo local de uma fonte (baixando URLs para o cache)
+def _arquivo_local(fonte, diretorio_cache):
+    """
+    Retorna o caminho local da fonte. URLs são baixadas uma única vez para o cache.
+
+    :param fonte: Caminho de um arquivo CSV ou URL http(s).
+    :param diretorio_cache: Diretório do cache.
+    :return: Caminho do arquivo local.
+    """
+    fonte = os.fspath(fonte)
+    if not fonte.startswith(("http://", "https://")):
+        return fonte
+
+    destino = os.path.join(diretorio_cache, "brutos", hashlib.sha1(fonte.encode("utf-8")).hexdigest() + ".csv")
+    if not os.path.exists(destino):
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(suffix=".csv", dir=os.path.dirname(destino))
+        os.close(descritor)
+        try:
+            urllib.request.urlretrieve(fonte, temporario)
+            os.replace(temporario, destino)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+    return destino
+
+
+# Função para calcular o hash do conteúdo de um arquivo
+def hash_conteudo(caminho):
+    """
+    Calcula o SHA-1 do conteúdo de um arquivo, lendo-o em blocos de 1 MB.
+
+    :param caminho: Caminho do arquivo.
+    :return: String hexadecimal com o hash.
+    """
+    resumo = hashlib.sha1()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+# Função para calcular o hash do conteúdo de um arquivo, lembrando o resultado entre execuções
+def _hash_arquivo(caminho, diretorio_cache):
+    """
+    Calcula o SHA-1 do conteúdo do arquivo (`hash_conteudo`).
+
+    O resultado fica guardado em um índice no cache junto com o tamanho e a data de
+    modificação do arquivo; enquanto eles não mudarem, o arquivo não é lido de novo.
+
+    :param caminho: Caminho do arquivo.
+    :param diretorio_cache: Diretório do cache.
+    :return: String hexadecimal com o hash.
+    """
+    caminho = os.path.abspath(caminho)
+    informacoes = os.stat(caminho)
+    assinatura = [informacoes.st_size, informacoes.st_mtime_ns]
+
+    caminho_indice = os.path.join(diretorio_cache, "hashes.json")
+    try:
+        with open(caminho_indice, encoding="utf-8") as arquivo:
+            indice = json.load(arquivo)
+    except (OSError, ValueError):
+        indice = {}
+
+    registro = indice.get(caminho)
+    if registro is not None and registro[:2] == assinatura:
+        return registro[2]
+
+    resumo = hash_conteudo(caminho)
+    indice[caminho] = assinatura + [resumo]
+    gravar_atomico(caminho_indice, lambda arquivo: arquivo.write(json.dumps(indice).encode("utf-8")))
+    return resumo
+
+
+# Função para gravar um arquivo sem que outro processo leia uma versão pela metade
+def gravar_atomico(caminho, escrever):
+    """
+    Grava em um arquivo temporário no mesmo diretório e o renomeia para `caminho`.
+
+    O diretório é criado se ainda não existir.
+
+    :param caminho: Caminho final.
+    :param escrever: Função que recebe o arquivo binário aberto e grava o conteúdo.
+    """
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho))
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            escrever(arquivo)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+# Função que lê um DataFrame do cache ou o calcula e grava
+def _carregar_com_cache(nome, configuracao, calcular, diretorio_cache):
+    """
+    Retorna o DataFrame guardado no cache para `configuracao` ou o calcula e grava.
+
+    :param nome: Prefixo do arquivo (exemplo: "bruto").
+    :param configuracao: Dicionário serializável em JSON que identifica o resultado.
+    :param calcular: Função sem argumentos que produz o DataFrame.
+    :param diretorio_cache: Diretório do cache.
+    :return: DataFrame.
+    """
+    chave = hashlib.sha1(json.dumps(configuracao, sort_keys=True).encode("utf-8")).hexdigest()
+    extensao = "parquet" if FORMATO_CACHE == "parquet" else "pkl"
+    caminho = os.path.join(diretorio_cache, f"{nome}_{chave}.{extensao}")
+
+    if os.path.exists(caminho):
+        try:
+            if FORMATO_CACHE == "parquet":
+                return pd.read_parquet(caminho, memory_map=True)
+            return pd.read_pickle(caminho)
+        except Exception:
+            pass  # Arquivo corrompido: recalcula
+
+    df = calcular()
+    os.makedirs(diretorio_cache, exist_ok=True)
+    if FORMATO_CACHE == "parquet":
+        gravar_atomico(caminho, lambda arquivo: df.to_parquet(arquivo, index=False))
+    else:
+        gravar_atomico(caminho, lambda arquivo: df.to_pickle(arquivo))
+    return df
+
+
+# Função para carregar o dataset bruto, com tipos compactos
+def carregar_bruto(fonte=URL_DADOS, diretorio_cache=DIRETORIO_CACHE_PADRAO):
+    """
+    Carrega o dataset bruto (como o `pd.read_csv` do notebook), usando o cache em disco.
+
+    Na primeira chamada o CSV é lido (e baixado, se for uma URL) e gravado no cache em
+    formato colunar, com os tipos de `compactar_bruto`. As chamadas seguintes só leem o
+    arquivo do cache. O cache é identificado pelo hash do conteúdo do CSV, então editar o
+    arquivo gera um cache novo.
+
+    :param fonte: Caminho ou URL do CSV.
+    :param diretorio_cache: Diretório do cache.
+    :return: DataFrame bruto, com colunas de texto como `category`.
+    """
+    caminho = _arquivo_local(fonte, diretorio_cache)
+    configuracao = {"fonte": _hash_arquivo(caminho, diretorio_cache), "versao": VERSAO_PREPROCESSAMENTO}
+    return _carregar_com_cache("bruto", configuracao, lambda: compactar_bruto(pd.read_csv(caminho)), diretorio_cache)
+
+
+# Função para carregar o dataset já pré-processado
+def carregar_dados(fonte=URL_DADOS, colunas=COLUNAS_CODIFICADAS, diretorio_cache=DIRETORIO_CACHE_PADRAO):
+    """
+    Carrega o dataset pré-processado por `preprocessar`, usando o cache em disco.
+
+    O cache é identificado pelo hash do CSV, pelas colunas codificadas e pela versão do
+    pré-processamento.
+
+    Exemplo:
+        df = carregar_dados()
+        X, y = separar_features(df)
+
+    :param fonte: Caminho ou URL do CSV.
+    :param colunas: Colunas a codificar com one-hot.
+    :param diretorio_cache: Diretório do cache.
+    :return: DataFrame pré-processado.
+    """
+    caminho = _arquivo_local(fonte, diretorio_cache)
+    configuracao = {
+        "fonte": _hash_arquivo(caminho, diretorio_cache),
+        "colunas": list(colunas),
+        "versao": VERSAO_PREPROCESSAMENTO,
+    }
+    return _carregar_com_cache("preprocessado", configuracao,
+                               lambda: preprocessar(carregar_bruto(caminho, diretorio_cache), colunas),
+                               diretorio_cache)
@@ -0,0 +1,504 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold
+from sklearn.utils.class_weight import compute_class_weight
+
+from preprocessamento import gravar_atomico
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Espaço de busca padrão. Os valores de n_estimators de uma mesma configuração são
+# avaliados em uma única floresta que cresce com warm_start, do menor para o maior.
+ESPACO_PADRAO = {
+    "n_estimators": [50, 100, 200, 400],
+    "max_depth": [None, 10, 20],
+    "min_samples_leaf": [1, 5],
+    "max_features": ["sqrt", 0.5],
+    "class_weight": ["balanced", None],
+}
+
+# Parâmetros fixos, os mesmos do notebook
+PARAMETROS_FIXOS = {"random_state": 42}
+
+DIRETORIO_CACHE_PADRAO = os.path.join(tempfile.gettempdir(), "case_turing_treinamento")
+
+# Versão dos registros do cache: mudar esta constante invalida os resultados gravados antes
+VERSAO_CACHE = 3
+
+INTERVALO_MEMORIA = 0.01  # Segundos entre duas leituras da memória residente durante o `fit`
+
+# Dados do processo: cada processo do pool recebe X e y uma única vez, no inicializador
+_DADOS = {}
+
+
+# Função para gerar uma chave estável para os dados de treino
+def chave_dados(X, y):
+    """
+    Gera uma chave que identifica o conteúdo de X e y (valores, colunas e tipos).
+
+    :param X: DataFrame de features.
+    :param y: Série (ou array) com o alvo.
+    :return: String hexadecimal com o hash.
+    """
+    resumo = hashlib.sha1()
+    resumo.update(json.dumps([list(map(str, X.columns)), list(map(str, X.dtypes))]).encode("utf-8"))
+    resumo.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    resumo.update(pd.util.hash_pandas_object(pd.Series(np.asarray(y)), index=False).to_numpy().tobytes())
+    return resumo.hexdigest()
+
+
+# Função para gerar as configurações da busca, agrupadas por tudo menos n_estimators
+def gerar_grupos(espaco=ESPACO_PADRAO, amostras=None, semente=0):
+    """
+    Gera as configurações da busca em grade ou aleatória.
+
+    Cada grupo reúne as configurações que só diferem em n_estimators, porque todas são
+    avaliadas pela mesma floresta crescendo com warm_start.
+
+    :param espaco: Dicionário {parâmetro: lista de valores}; deve conter "n_estimators".
+    :param amostras: Número de grupos sorteados (busca aleatória); None usa a grade inteira.
+    :param semente: Semente do sorteio da busca aleatória.
+    :return: Lista de tuplas (parametros_sem_n_estimators, lista_ordenada_de_n_estimators).
+    """
+    quantidades = sorted(set(espaco["n_estimators"]))
+    nomes = sorted(nome for nome in espaco if nome != "n_estimators")
+    grupos = [dict(zip(nomes, valores)) for valores in itertools.product(*(espaco[nome] for nome in nomes))]
+
+    if amostras is not None and amostras < len(grupos):
+        grupos = random.Random(semente).sample(grupos, amostras)
+    return [(grupo, quantidades) for grupo in grupos]
+
+
+# Função executada uma vez em cada processo do pool
+def _inicializar_processo(X, y):
+    _DADOS["X"] = X
+    _DADOS["y"] = y
+
+
+# Função que lê a memória residente (RSS) do processo
+def _memoria_residente():
+    """
+    Retorna a memória residente atual do processo, em bytes.
+
+    No Linux lê /proc/self/statm. Nos outros sistemas usa o pico do processo
+    (`ru_maxrss`), que só cresce; sem o módulo `resource`, retorna 0.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico if sys.platform == "darwin" else pico * 1024  # KB no Linux, bytes no macOS
+
+
+# Classe que acompanha o pico de memória residente enquanto um bloco executa
+class _PicoMemoria:
+    """
+    Amostra a memória residente do processo em uma thread enquanto o bloco `with` executa.
+
+    A thread só dorme e lê um número a cada `intervalo` segundos, então não pesa no tempo
+    medido dentro do bloco; ela é iniciada e encerrada fora desse tempo.
+    """
+
+    def __init__(self, intervalo=INTERVALO_MEMORIA):
+        self.intervalo = intervalo
+        self.pico = 0  # Maior RSS observada, em bytes
+        self._parar = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.pico = _memoria_residente()
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self._parar.set()
+        self._thread.join()
+        self.pico = max(self.pico, _memoria_residente())
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, _memoria_residente())
+
+
+# Função executada em cada processo: treina um fold de uma configuração, aumentando a floresta
+def _avaliar_fold(parametros, quantidades, treino, teste, n_jobs, caminho_modelo=None, info_modelo=None):
+    """
+    Treina uma floresta em um fold, crescendo de `quantidades[0]` até `quantidades[-1]` árvores.
+
+    Com warm_start, cada `fit` só acrescenta as árvores que faltam. Como a semente de cada
+    árvore nova vem da mesma sequência de `random_state`, a floresta com n árvores é igual
+    à que seria treinada do zero com n_estimators=n. Se `info_modelo` indicar que a floresta
+    em `caminho_modelo` tem até `quantidades[0]` árvores, o treino continua a partir dela
+    (uma floresta maior nem é carregada). A floresta final é gravada no mesmo caminho, com
+    as suas informações ao lado (`_gravar_modelo`), só se não for menor que a que já estava lá.
+
+    Só o `fit` é cronometrado. Durante cada `fit`, `_PicoMemoria` acompanha a memória
+    residente do processo; o pico informado é o acréscimo sobre a memória do início do fold,
+    antes de montar ou carregar a floresta (memória que um fold anterior liberou e que o
+    processo reaproveita não entra no acréscimo). A memória das árvores da floresta (os arrays de
+    nós e valores, alocados em C) é medida depois de cada `fit`, fora do tempo.
+
+    `class_weight="balanced"` é trocado pelos pesos calculados sobre o treino do fold, que é
+    o mesmo em todos os `fit`; o resultado é igual e o scikit-learn aceita o warm_start.
+
+    :param info_modelo: Informações da floresta em cache (`_modelo_em_cache`) ou None.
+    :return: Lista de dicionários, um por quantidade de árvores, com o tempo acumulado de
+             treino, o pico de memória, a memória da floresta e a matriz de confusão do fold.
+    """
+    X, y = _DADOS["X"], _DADOS["y"]
+    X_treino, y_treino = X.iloc[treino], y[treino]
+    X_teste, y_teste = X.iloc[teste], y[teste]
+    classes = np.unique(y)
+
+    parametros = dict(parametros)
+    if parametros.get("class_weight") == "balanced":
+        classes_treino = np.unique(y_treino)
+        pesos = compute_class_weight("balanced", classes=classes_treino, y=y_treino)
+        parametros["class_weight"] = dict(zip(classes_treino, pesos))
+
+    memoria_inicial = _memoria_residente()
+    modelo = None
+    tempo_total = 0.0
+    pico = 0
+    arvores_em_cache = info_modelo["n_estimators"] if info_modelo is not None else 0
+    if 0 < arvores_em_cache <= quantidades[0]:
+        try:
+            modelo = joblib.load(caminho_modelo)
+        except Exception:
+            modelo = None  # Arquivo corrompido ou ausente: treina do zero
+        if modelo is not None and modelo.n_estimators == arvores_em_cache:
+            modelo.set_params(n_jobs=n_jobs)
+            tempo_total = info_modelo["segundos_treino"]
+            pico = info_modelo["pico_memoria_bytes"]
+        else:
+            modelo = None  # A floresta não confere com as informações: treina do zero
+    if modelo is None:
+        modelo = RandomForestClassifier(**PARAMETROS_FIXOS, **parametros, warm_start=True, n_jobs=n_jobs)
+    resultados = []
+
+    for quantidade in quantidades:
+        modelo.set_params(n_estimators=quantidade)
+        with _PicoMemoria() as medidor:
+            inicio = time.perf_counter()
+            modelo.fit(X_treino, y_treino)
+            tempo_total += time.perf_counter() - inicio
+        pico = max(pico, medidor.pico - memoria_inicial)
+
+        previsto = modelo.predict(X_teste)
+        resultados.append({
+            "n_estimators": quantidade,
+            "segundos_treino": tempo_total,
+            "pico_memoria_bytes": pico,
+            "memoria_modelo_bytes": _memoria_floresta(modelo),
+            "matriz_confusao": confusion_matrix(y_teste, previsto, labels=classes).tolist(),
+        })
+
+    if caminho_modelo is not None and modelo.n_estimators >= arvores_em_cache:
+        _gravar_modelo(caminho_modelo, modelo, resultados[-1])
+    return resultados
+
+
+# Função que grava a floresta de um fold e, ao lado dela, as informações lidas por `_modelo_em_cache`
+def _gravar_modelo(caminho_modelo, modelo, registro):
+    """
+    Grava a floresta em `caminho_modelo` e um JSON pequeno em `caminho_modelo + ".json"`.
+
+    O JSON guarda o número de árvores, o tempo acumulado de treino e o pico de memória,
+    para que o processo principal decida se a floresta serve sem desserializá-la. Ele é
+    gravado depois da floresta, então nunca descreve uma floresta que ainda não está no disco.
+
+    :param caminho_modelo: Caminho do arquivo .joblib.
+    :param modelo: Floresta treinada.
+    :param registro: Registro do fold para a quantidade de árvores da floresta.
+    """
+    info = {chave: registro[chave] for chave in ("n_estimators", "segundos_treino", "pico_memoria_bytes")}
+    gravar_atomico(caminho_modelo, lambda arquivo: joblib.dump(modelo, arquivo))
+    gravar_atomico(caminho_modelo + ".json", lambda arquivo: arquivo.write(json.dumps(info).encode("utf-8")))
+
+
+# Função para medir a memória ocupada pelas árvores de uma floresta
+def _memoria_floresta(modelo):
+    """
+    Soma os bytes dos arrays de nós e de valores de todas as árvores da floresta.
+
+    Esses arrays são alocados pelo código em C do scikit-learn, fora do alcance do
+    `tracemalloc`, e são a maior parte da memória de uma floresta treinada.
+
+    :param modelo: RandomForestClassifier treinada.
+    :return: Número de bytes.
+    """
+    total = 0
+    for arvore in modelo.estimators_:
+        estado = arvore.tree_.__getstate__()
+        total += estado["nodes"].nbytes + estado["values"].nbytes
+    return total
+
+
+# Função para montar o classification_report a partir da soma das matrizes de confusão
+def _relatorio(matriz, classes):
+    """
+    Gera o `classification_report` (em dicionário) equivalente às previsões fora da amostra de todos os folds.
+
+    :param matriz: Matriz de confusão somada sobre os folds.
+    :param classes: Rótulos das classes, na ordem da matriz.
+    :return: Dicionário do `classification_report`.
+    """
+    matriz = np.asarray(matriz)
+    reais = np.repeat(np.repeat(np.arange(len(classes)), len(classes)), matriz.ravel())
+    previstos = np.repeat(np.tile(np.arange(len(classes)), len(classes)), matriz.ravel())
+    return classification_report(reais, previstos, labels=np.arange(len(classes)),
+                                 target_names=[str(c) for c in classes], output_dict=True, zero_division=0)
+
+
+# Classe com o resultado de uma configuração
+class ResultadoConfiguracao:
+    """
+    Métricas de validação cruzada de uma configuração da floresta.
+
+    :param parametros: Parâmetros da floresta (inclui n_estimators).
+    :param folds: Lista com o resultado de cada fold (saída de `_avaliar_fold`).
+    :param classes: Rótulos das classes.
+    """
+
+    def __init__(self, parametros, folds, classes):
+        self.parametros = parametros
+        self.folds = folds
+
+        acuracias = [np.trace(np.asarray(fold["matriz_confusao"])) / np.sum(fold["matriz_confusao"]) for fold in folds]
+        self.acuracia = float(np.mean(acuracias))  # Média da acurácia dos folds
+        self.desvio_acuracia = float(np.std(acuracias))
+        self.segundos_treino = float(np.mean([fold["segundos_treino"] for fold in folds]))  # Por fold
+        self.pico_memoria_bytes = max(fold["pico_memoria_bytes"] for fold in folds)  # Maior pico dos folds
+        self.memoria_modelo_bytes = max(fold["memoria_modelo_bytes"] for fold in folds)  # Maior floresta dos folds
+        self.relatorio = _relatorio(np.sum([fold["matriz_confusao"] for fold in folds], axis=0), classes)
+
+    def como_dicionario(self):
+        """Retorna o resultado em um dicionário pronto para JSON."""
+        return {
+            "parametros": self.parametros,
+            "acuracia": self.acuracia,
+            "desvio_acuracia": self.desvio_acuracia,
+            "segundos_treino": self.segundos_treino,
+            "pico_memoria_bytes": self.pico_memoria_bytes,
+            "memoria_modelo_bytes": self.memoria_modelo_bytes,
+            "relatorio": self.relatorio,
+        }
+
+    def __repr__(self):
+        return (f"ResultadoConfiguracao(parametros={self.parametros}, acuracia={self.acuracia:.4f}, "
+                f"segundos_treino={self.segundos_treino:.2f}, pico_memoria_mb={self.pico_memoria_bytes / 1e6:.1f}, "
+                f"memoria_modelo_mb={self.memoria_modelo_bytes / 1e6:.1f})")
+
+
+# Função principal: busca de hiperparâmetros com validação cruzada
+def buscar_hiperparametros(X, y, espaco=ESPACO_PADRAO, amostras=None, folds=5, workers=None,
+                           diretorio_cache=DIRETORIO_CACHE_PADRAO, semente=0):
+    """
+    Busca em grade (ou aleatória) sobre os parâmetros da RandomForestClassifier do notebook.
+
+    Cada par (configuração, fold) é uma tarefa independente:
+    - com `workers` > 1, as tarefas são distribuídas em um pool de processos (cada floresta
+      usa n_jobs=1, e X e y são enviados uma única vez para cada processo);
+    - com `workers` <= 1, as tarefas rodam no próprio processo e cada floresta usa todos os
+      núcleos com n_jobs=-1.
+
+    O resultado de cada fold fica gravado no cache, identificado pelos dados, pelos folds e
+    pelos parâmetros, junto com a maior floresta treinada em cada fold. Repetir uma busca
+    não treina nada, e acrescentar valores maiores de n_estimators só treina as árvores
+    que faltam, a partir da floresta guardada.
+
+    Exemplo:
+        X, y = separar_features(carregar_dados())
+        resultados = buscar_hiperparametros(X, y, amostras=10)
+        print(resultados[0])
+
+    :param X: DataFrame de features.
+    :param y: Alvo.
+    :param espaco: Dicionário {parâmetro: lista de valores}; deve conter "n_estimators".
+    :param amostras: Número de configurações (sem contar n_estimators) sorteadas; None usa a grade.
+    :param folds: Número de folds da validação cruzada estratificada.
+    :param workers: Número de processos. None usa todos os núcleos.
+    :param diretorio_cache: Diretório do cache dos folds (None desliga o cache).
+    :param semente: Semente do sorteio das configurações e da divisão dos folds.
+    :return: Lista de `ResultadoConfiguracao`, da maior para a menor acurácia.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    y = np.asarray(y)
+    classes = np.unique(y)
+    divisoes = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=semente).split(X, y))
+    base_chave = {"dados": chave_dados(X, y), "folds": folds, "semente": semente, "fixos": PARAMETROS_FIXOS,
+                  "versao": VERSAO_CACHE}
+
+    # Resultados por (grupo, fold, n_estimators), lidos do cache quando possível
+    grupos = gerar_grupos(espaco, amostras, semente)
+    avaliados = {}
+    pendentes = []  # Tuplas (índice_grupo, índice_fold, quantidades que faltam, caminho do modelo, info do modelo)
+    for indice_grupo, (parametros, quantidades) in enumerate(grupos):
+        for indice_fold in range(folds):
+            faltando = []
+            for quantidade in quantidades:
+                registro = _ler_cache(diretorio_cache, base_chave, parametros, indice_fold, quantidade)
+                if registro is None:
+                    faltando.append(quantidade)
+                else:
+                    avaliados[indice_grupo, indice_fold, quantidade] = registro
+            if faltando:
+                caminho_modelo, info_modelo = _modelo_em_cache(diretorio_cache, base_chave, parametros, indice_fold)
+                pendentes.append((indice_grupo, indice_fold, faltando, caminho_modelo, info_modelo))
+
+    def registrar(indice_grupo, indice_fold, resultados):
+        for registro in resultados:
+            avaliados[indice_grupo, indice_fold, registro["n_estimators"]] = registro
+            _gravar_cache(diretorio_cache, base_chave, grupos[indice_grupo][0], indice_fold, registro)
+
+    if workers <= 1:
+        _inicializar_processo(X, y)
+        try:
+            for indice_grupo, indice_fold, faltando, caminho_modelo, info_modelo in pendentes:
+                treino, teste = divisoes[indice_fold]
+                registrar(indice_grupo, indice_fold,
+                          _avaliar_fold(grupos[indice_grupo][0], faltando, treino, teste, -1,
+                                        caminho_modelo, info_modelo))
+        finally:
+            _DADOS.clear()
+    elif pendentes:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_processo, initargs=(X, y)) as pool:
+            tarefas = {}
+            for indice_grupo, indice_fold, faltando, caminho_modelo, info_modelo in pendentes:
+                treino, teste = divisoes[indice_fold]
+                futuro = pool.submit(_avaliar_fold, grupos[indice_grupo][0], faltando, treino, teste, 1,
+                                     caminho_modelo, info_modelo)
+                tarefas[futuro] = (indice_grupo, indice_fold)
+            for futuro in as_completed(tarefas):
+                registrar(*tarefas[futuro], futuro.result())
+
+    resultados = []
+    for indice_grupo, (parametros, quantidades) in enumerate(grupos):
+        for quantidade in quantidades:
+            resultados_folds = [avaliados[indice_grupo, indice_fold, quantidade] for indice_fold in range(folds)]
+            resultados.append(ResultadoConfiguracao({**parametros, "n_estimators": quantidade},
+                                                    resultados_folds, classes))
+
+    resultados.sort(key=lambda resultado: -resultado.acuracia)
+    return resultados
+
+
+# Função para montar o caminho do arquivo de cache de um fold
+def _caminho_cache(diretorio_cache, base_chave, parametros, indice_fold, quantidade, extensao=".json"):
+    chave = json.dumps({**base_chave, "parametros": parametros, "fold": indice_fold, "n_estimators": quantidade},
+                       sort_keys=True, default=str)
+    return os.path.join(diretorio_cache, hashlib.sha1(chave.encode("utf-8")).hexdigest() + extensao)
+
+
+# Função que localiza a floresta guardada de um fold e lê as informações gravadas ao lado dela
+def _modelo_em_cache(diretorio_cache, base_chave, parametros, indice_fold):
+    """
+    Retorna o caminho da floresta do fold (n_estimators fica fora da chave) e as informações dela.
+
+    As informações vêm do JSON gravado por `_gravar_modelo`, então a floresta não é
+    desserializada aqui (só o processo que continuar o treino a carrega).
+
+    :return: Tupla (caminho, info), em que info é um dicionário com "n_estimators",
+             "segundos_treino" e "pico_memoria_bytes", ou None se não houver floresta
+             guardada; (None, None) se o cache estiver desligado.
+    """
+    if diretorio_cache is None:
+        return None, None
+    caminho = _caminho_cache(diretorio_cache, base_chave, parametros, indice_fold, None, ".joblib")
+
+    try:
+        with open(caminho + ".json", encoding="utf-8") as arquivo:
+            info = json.load(arquivo)
+        return caminho, {chave: info[chave] for chave in ("n_estimators", "segundos_treino", "pico_memoria_bytes")}
+    except (OSError, ValueError, KeyError, TypeError):
+        return caminho, None  # Sem floresta (ou informações ilegíveis): o fold treina do zero
+
+
+def _ler_cache(diretorio_cache, base_chave, parametros, indice_fold, quantidade):
+    if diretorio_cache is None:
+        return None
+    try:
+        with open(_caminho_cache(diretorio_cache, base_chave, parametros, indice_fold, quantidade),
+                  encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_cache(diretorio_cache, base_chave, parametros, indice_fold, registro):
+    if diretorio_cache is None:
+        return
+    caminho = _caminho_cache(diretorio_cache, base_chave, parametros, indice_fold, registro["n_estimators"])
+    gravar_atomico(caminho, lambda arquivo: arquivo.write(json.dumps(registro).encode("utf-8")))
+
+
+def main(argumentos=None):
+    """
+    Ponto de entrada de linha de comando.
+
+    Exemplos:
+        python treinamento.py dados.csv --amostras 10 --workers 4
+        python treinamento.py dados.csv --saida resultados.json
+    """
+    from preprocessamento import URL_DADOS, carregar_dados, separar_features
+
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros da RandomForestClassifier.")
+    parser.add_argument("fonte", nargs="?", default=URL_DADOS, help="Caminho ou URL do CSV")
+    parser.add_argument("--amostras", type=int, help="Configurações sorteadas (padrão: grade inteira)")
+    parser.add_argument("--folds", type=int, default=5, help="Número de folds")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do sorteio e dos folds")
+    parser.add_argument("--saida", help="Arquivo JSON com todos os resultados")
+    args = parser.parse_args(argumentos)
+
+    X, y = separar_features(carregar_dados(args.fonte))
+    resultados = buscar_hiperparametros(X, y, amostras=args.amostras, folds=args.folds,
+                                        workers=args.workers, semente=args.semente)
+
+    print(f"{'acurácia':>9} {'desvio':>7} {'treino (s)':>11} {'pico (MB)':>10} {'floresta (MB)':>14}  parâmetros")
+    for resultado in resultados:
+        print(f"{resultado.acuracia:>9.4f} {resultado.desvio_acuracia:>7.4f} {resultado.segundos_treino:>11.2f} "
+              f"{resultado.pico_memoria_bytes / 1e6:>10.1f} {resultado.memoria_modelo_bytes / 1e6:>14.1f}  "
+              f"{resultado.parametros}")
+
+    print("\nRelatório de Classificação da melhor configuração:")
+    relatorio = resultados[0].relatorio
+    for classe, metricas in relatorio.items():
+        if isinstance(metricas, dict):
+            print(f"{classe:>14} " + " ".join(f"{nome}={valor:.2f}" for nome, valor in metricas.items()))
+        else:
+            print(f"{classe:>14} {metricas:.4f}")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump([resultado.como_dicionario() for resultado in resultados], arquivo, indent=2, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())